@@ -1,18 +1,37 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
 from dotenv import load_dotenv
 import os
-import yfinance as yf
-import requests
 import bleach
 import logging
+import base64
+import io
+import json
+import math
+import time
 from bleach.css_sanitizer import CSSSanitizer
 from dcf.dcf_default import dcf_valuation_advanced
+from dcf.sensitivity import sensitivity_grid, axis_values
+from dcf.monte_carlo import run_simulation
+from dcf.reverse_dcf import implied_rate, implied_rates_batch
+from dcf.revaluation import revalue
+from dcf.scenarios import evaluate_scenarios
+from bulk import formats as bulk_formats
+from bulk import records as bulk_records
+from search import reports as report_search
 from sec import filers as sec_filers
 from sec import funds as sec_funds
+from sec import tickers as sec_tickers
 from sec.sec_client import SecClientError, get_fund_snapshot
+from sec.company_facts import get_company_facts, dcf_prefill
+from quotes.quote_cache import QuoteCache
+from quotes import fx_rates
+from quotes.refresher import QuoteRefresher
+from quotes.quote_client import iter_quotes
+from quotes.alerts import evaluate_targets
 
 # Load environment variables from .env file
 load_dotenv()
@@ -36,14 +55,52 @@ HARDCODED_PASSWORD = os.environ.get('ADMIN_PASSWORD', 'stockanalysis2026')
 # OpenExchange API Key for currency conversion
 OPENEXCHANGE_API_KEY = os.environ.get('OPENEXCHANGE_API_KEY', '')
 
+# The FX rate table is fetched at most once per interval and shared via a JSON file
+FX_REFRESH_SECONDS = int(os.environ.get('FX_REFRESH_SECONDS', 3600))
+FX_RATES_PATH = os.environ.get('FX_RATES_PATH', os.path.join(app.instance_path, 'fx_rates.json'))
+
 # SEC requires a User-Agent identifying the requester (name + email) on every
 # request to its APIs, or it returns 403. Not a secret, but kept out of the repo
 # so the email isn't published on GitHub.
 SEC_USER_AGENT = os.environ.get('SEC_USER_AGENT', '')
 
+# Parsed SEC company facts (DCF pre-fill) are cached here, one small JSON file per CIK
+SEC_FACTS_CACHE_DIR = os.environ.get('SEC_FACTS_CACHE_DIR', os.path.join(app.instance_path, 'sec_facts'))
+
 # Optional: raises OpenFIGI's ticker-lookup rate limit. Works fine without one.
 OPENFIGI_API_KEY = os.environ.get('OPENFIGI_API_KEY', '')
 
+# Worker processes for very large Monte Carlo DCF runs (1 keeps them in-process)
+DCF_SIMULATION_PROCESSES = int(os.environ.get('DCF_SIMULATION_PROCESSES', 1))
+
+# Quote cache: quotes younger than the TTL are served without a network call;
+# older ones (up to the stale limit) are served at once and refreshed in the background.
+QUOTE_CACHE_TTL_SECONDS = int(os.environ.get('QUOTE_CACHE_TTL_SECONDS', 300))
+QUOTE_CACHE_MAX_STALE_SECONDS = int(os.environ.get('QUOTE_CACHE_MAX_STALE_SECONDS', 3600))
+QUOTE_CACHE_MAX_ENTRIES = int(os.environ.get('QUOTE_CACHE_MAX_ENTRIES', 1000))
+# Tickers Yahoo reports as unknown are remembered this long; failed lookups aren't cached
+QUOTE_CACHE_NEGATIVE_TTL_SECONDS = int(os.environ.get('QUOTE_CACHE_NEGATIVE_TTL_SECONDS', 60))
+
+quote_cache = QuoteCache(
+    ttl=QUOTE_CACHE_TTL_SECONDS,
+    max_stale=QUOTE_CACHE_MAX_STALE_SECONDS,
+    max_entries=QUOTE_CACHE_MAX_ENTRIES,
+    negative_ttl=QUOTE_CACHE_NEGATIVE_TTL_SECONDS
+)
+
+# Background refresher that writes quote snapshots, so pages never wait on Yahoo
+QUOTE_REFRESHER_ENABLED = os.environ.get('QUOTE_REFRESHER_ENABLED', '1') == '1'
+QUOTE_REFRESH_INTERVAL_SECONDS = int(os.environ.get('QUOTE_REFRESH_INTERVAL_SECONDS', 300))
+QUOTE_REFRESH_BATCH_SIZE = int(os.environ.get('QUOTE_REFRESH_BATCH_SIZE', 25))
+# A ticker that couldn't be priced is skipped for this long before it's tried again
+QUOTE_REFRESH_FAILURE_BACKOFF_SECONDS = int(os.environ.get('QUOTE_REFRESH_FAILURE_BACKOFF_SECONDS', 1800))
+
+fx_rate_table = fx_rates.RateTable(
+    api_key=OPENEXCHANGE_API_KEY,
+    cache_path=FX_RATES_PATH,
+    refresh_interval=FX_REFRESH_SECONDS
+)
+
 # Initialize database
 db = SQLAlchemy(app)
 
@@ -69,6 +126,10 @@ def load_user(user_id):
 # Session management - 15 minute timeout
 @app.before_request
 def before_request():
+    # The quote refresher runs only in processes that serve requests, not in
+    # `flask` CLI commands or scripts that merely import the app
+    if QUOTE_REFRESHER_ENABLED:
+        quote_refresher.start()
     if current_user.is_authenticated:
         session.permanent = True
         app.permanent_session_lifetime = timedelta(minutes=15)
@@ -94,6 +155,17 @@ def sanitize_html(html_content):
     )
     return cleaned_html
 
+# Length of the plain-text preview stored with each report
+EXCERPT_LENGTH = 200
+
+def report_excerpt(notes_html):
+    """Plain-text preview of sanitized report notes, cut at a word boundary.
+    Stored in Report.excerpt so report lists never have to load the notes."""
+    text = report_search.plain_text(notes_html)
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    return text[:EXCERPT_LENGTH].rsplit(' ', 1)[0].rstrip(' .,;:') + '…'
+
 # Number formatting helper for templates
 @app.template_filter('smart_number')
 def smart_number(value, max_decimals=4):
@@ -116,62 +188,8 @@ def smart_number(value, max_decimals=4):
 
 # Currency conversion helper function
 def convert_to_eur(amount, currency_symbol):
-    """Convert amount from given currency symbol to EUR"""
-    if not OPENEXCHANGE_API_KEY:
-        return None
-    
-    # Mapping from currency symbols to currency codes
-    currency_map = {
-        '$': 'USD',
-        '€': 'EUR',
-        '£': 'GBP',
-        '¥': 'JPY',
-        '₹': 'INR',
-        'C$': 'CAD',
-        'A$': 'AUD',
-        'CHF': 'CHF',
-        'CNY': 'CNY',
-        'SEK': 'SEK',
-        'NZD': 'NZD',
-        'MXN': 'MXN',
-        'SGD': 'SGD',
-        'HKD': 'HKD',
-        'NOK': 'NOK',
-        'KRW': 'KRW',
-        'TRY': 'TRY',
-        'RUB': 'RUB',
-        'BRL': 'BRL',
-        'ZAR': 'ZAR',
-        'SAR': 'SAR'
-    }
-    
-    currency_code = currency_map.get(currency_symbol, 'USD')
-    
-    # If already in EUR, return the amount
-    if currency_code == 'EUR':
-        return amount
-    
-    try:
-        # Get exchange rates from OpenExchange API
-        url = f"https://openexchangerates.org/api/latest.json?app_id={OPENEXCHANGE_API_KEY}"
-        response = requests.get(url, timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            rates = data.get('rates', {})
-            
-            # OpenExchange uses USD as base, so we need to convert:
-            # 1. From currency_code to USD
-            # 2. From USD to EUR
-            if currency_code in rates and 'EUR' in rates:
-                usd_amount = amount / rates[currency_code]
-                eur_amount = usd_amount * rates['EUR']
-                return round(eur_amount, 2)
-        
-        return None
-    except Exception as e:
-        print(f"Error converting currency: {e}")
-        return None
+    """Convert amount from given currency symbol to EUR using the cached rate table"""
+    return fx_rates.convert_to_eur(amount, currency_symbol, fx_rate_table.get())
 
 # Database Models
 class DCFAnalysis(db.Model):
@@ -187,10 +205,46 @@ class DCFAnalysis(db.Model):
     intrinsic_value = db.Column(db.Float, nullable=False)
     currency = db.Column(db.String(10), default='$')
     date_created = db.Column(db.DateTime, default=datetime.utcnow)
+    # Price when the analysis was saved, for the valuation history chart
+    market_price = db.Column(db.Float)
+
+    # Per-ticker lookups and history are filtered by ticker and ordered by date
+    __table_args__ = (
+        db.Index('ix_dcf_analysis_ticker_date_created', 'ticker', 'date_created'),
+        db.Index('ix_dcf_analysis_date_created_id', 'date_created', 'id'),
+    )
 
     def __repr__(self):
         return f'<DCFAnalysis {self.ticker}>'
 
+class DCFScenarioSet(db.Model):
+    """Several DCF scenarios for one ticker (e.g. bear/base/bull) saved as one unit.
+    Each scenario is an ordinary DCFAnalysis row, linked here through DCFScenario."""
+    id = db.Column(db.Integer, primary_key=True)
+    ticker = db.Column(db.String(10), nullable=False)
+    currency = db.Column(db.String(10), default='$')
+    weighted_value = db.Column(db.Float, nullable=False)
+    date_created = db.Column(db.DateTime, default=datetime.utcnow)
+    scenarios = db.relationship('DCFScenario', backref='scenario_set', cascade='all, delete-orphan',
+                                order_by='DCFScenario.position')
+
+    def __repr__(self):
+        return f'<DCFScenarioSet {self.ticker}>'
+
+class DCFScenario(db.Model):
+    """One named, weighted scenario of a DCFScenarioSet"""
+    id = db.Column(db.Integer, primary_key=True)
+    set_id = db.Column(db.Integer, db.ForeignKey('dcf_scenario_set.id'), nullable=False, index=True)
+    analysis_id = db.Column(db.Integer, db.ForeignKey('dcf_analysis.id'), nullable=False, unique=True)
+    name = db.Column(db.String(50), nullable=False)
+    probability = db.Column(db.Float, nullable=False)
+    position = db.Column(db.Integer, nullable=False, default=0)
+    analysis = db.relationship('DCFAnalysis', backref=db.backref('scenario_link', uselist=False,
+                                                                 cascade='all, delete-orphan'))
+
+    def __repr__(self):
+        return f'<DCFScenario {self.name}>'
+
 class Report(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     ticker = db.Column(db.String(10), nullable=False)
@@ -198,6 +252,13 @@ class Report(db.Model):
     date = db.Column(db.DateTime, nullable=False)
     notes = db.Column(db.Text, nullable=False)
     date_created = db.Column(db.DateTime, default=datetime.utcnow)
+    # Plain-text preview of notes (report_excerpt()), read by lists instead of notes
+    excerpt = db.Column(db.String(210))
+
+    # Serves the newest-first keyset pagination of the reports list
+    __table_args__ = (
+        db.Index('ix_report_date_created_id', 'date_created', 'id'),
+    )
 
     def __repr__(self):
         return f'<Report {self.ticker}>'
@@ -209,9 +270,148 @@ class Wishlist(db.Model):
     currency = db.Column(db.String(10), default='$')
     date_added = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_wishlist_date_added_id', 'date_added', 'id'),
+    )
+
     def __repr__(self):
         return f'<Wishlist {self.ticker}>'
 
+class QuoteSnapshot(db.Model):
+    """Latest known price per ticker, written by the background quote refresher"""
+    ticker = db.Column(db.String(10), primary_key=True)
+    price = db.Column(db.Float, nullable=False)
+    currency = db.Column(db.String(10))
+    fetched_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<QuoteSnapshot {self.ticker}>'
+
+class AlertEvent(db.Model):
+    """A wishlist row's price reaching its target. open_key is set while the alert is
+    open and cleared once the price moves back above target, so the unique
+    constraint allows exactly one open alert per wishlist row and target price."""
+    id = db.Column(db.Integer, primary_key=True)
+    wishlist_id = db.Column(db.Integer, nullable=False, index=True)
+    ticker = db.Column(db.String(10), nullable=False)
+    target_price = db.Column(db.Float, nullable=False)
+    target_currency = db.Column(db.String(10))
+    price = db.Column(db.Float, nullable=False)
+    price_currency = db.Column(db.String(10))
+    open_key = db.Column(db.String(64), unique=True)
+    triggered_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    cleared_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<AlertEvent {self.ticker}>'
+
+# Quote snapshot helpers
+def get_quote_snapshots(tickers):
+    """Fetch stored snapshots for many tickers in one query, keyed by ticker"""
+    tickers = list(set(tickers))
+    if not tickers:
+        return {}
+    rows = QuoteSnapshot.query.filter(QuoteSnapshot.ticker.in_(tickers)).all()
+    return {row.ticker: row for row in rows}
+
+def tickers_due_for_refresh():
+    """Wishlist and saved-analysis tickers whose snapshot is missing or older than
+    the refresh interval. Checking age here means that when several gunicorn workers
+    each run a refresher, a ticker another worker just refreshed is skipped."""
+    with app.app_context():
+        wishlist_tickers = db.session.query(Wishlist.ticker)
+        dcf_tickers = db.session.query(DCFAnalysis.ticker)
+        tickers = {ticker for (ticker,) in wishlist_tickers.union(dcf_tickers).all()}
+
+        cutoff = datetime.utcnow() - timedelta(seconds=QUOTE_REFRESH_INTERVAL_SECONDS * 0.9)
+        fresh = {
+            ticker for (ticker,) in db.session.query(QuoteSnapshot.ticker)
+            .filter(QuoteSnapshot.fetched_at >= cutoff).all()
+        }
+        return sorted(tickers - fresh)
+
+def save_quote_snapshots(quotes):
+    """Insert or update snapshots for a batch of fetched quotes in one transaction"""
+    with app.app_context():
+        try:
+            existing = get_quote_snapshots(quotes.keys())
+            now = datetime.utcnow()
+            for ticker, quote in quotes.items():
+                snapshot = existing.get(ticker)
+                if snapshot is None:
+                    snapshot = QuoteSnapshot(ticker=ticker)
+                    db.session.add(snapshot)
+                snapshot.price = quote['price']
+                snapshot.currency = quote.get('currency')
+                snapshot.fetched_at = now
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+def alert_open_key(wishlist_id, target_price):
+    """Identifies one open alert; a changed target price counts as a new alert"""
+    return f'{wishlist_id}:{target_price!r}'
+
+def evaluate_alerts():
+    """Check every wishlist row against its latest price in one vectorized pass,
+    opening alerts for new target crossings and clearing ones that no longer hold"""
+    with app.app_context():
+        started = time.perf_counter()
+        rows = (
+            db.session.query(Wishlist.id, Wishlist.ticker, Wishlist.target_price, Wishlist.currency,
+                             QuoteSnapshot.price, QuoteSnapshot.currency.label('quote_currency'))
+            .outerjoin(QuoteSnapshot, QuoteSnapshot.ticker == Wishlist.ticker)
+            .all()
+        )
+        rate_table = fx_rate_table.get()
+
+        triggered = evaluate_targets(
+            prices=[row.price if row.price is not None else float('nan') for row in rows],
+            targets=[row.target_price for row in rows],
+            quote_currencies=[row.quote_currency for row in rows],
+            target_symbols=[row.currency for row in rows],
+            rates=rate_table['rates'] if rate_table else None
+        )
+        crossed = {
+            alert_open_key(row.id, row.target_price): row
+            for row, hit in zip(rows, triggered) if hit
+        }
+
+        try:
+            now = datetime.utcnow()
+            open_alerts = AlertEvent.query.filter(AlertEvent.open_key.isnot(None)).all()
+            for alert in open_alerts:
+                if alert.open_key not in crossed:
+                    alert.open_key = None
+                    alert.cleared_at = now
+            already_open = {alert.open_key for alert in open_alerts}
+
+            new_alerts = [
+                AlertEvent(wishlist_id=row.id, ticker=row.ticker, target_price=row.target_price,
+                           target_currency=row.currency, price=row.price, price_currency=row.quote_currency,
+                           open_key=key, triggered_at=now)
+                for key, row in crossed.items() if key not in already_open
+            ]
+            db.session.add_all(new_alerts)
+            db.session.commit()
+        except IntegrityError:
+            # Another worker's refresher opened the same alert first
+            db.session.rollback()
+            new_alerts = []
+
+        logger.info(f'Alert evaluation: {len(rows)} rows, {len(crossed)} at target, '
+                    f'{len(new_alerts)} new in {time.perf_counter() - started:.3f}s')
+
+quote_refresher = QuoteRefresher(
+    load_tickers=tickers_due_for_refresh,
+    save_quotes=save_quote_snapshots,
+    interval=QUOTE_REFRESH_INTERVAL_SECONDS,
+    batch_size=QUOTE_REFRESH_BATCH_SIZE,
+    after_cycle=evaluate_alerts,
+    failure_backoff=QUOTE_REFRESH_FAILURE_BACKOFF_SECONDS
+)
+
 # Routes
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -252,17 +452,204 @@ def home():
     """Home page with overview and quick links"""
     return render_template('home.html')
 
-def get_saved_dcf_analyses():
-    """Helper function to fetch all saved DCF analyses"""
-    return DCFAnalysis.query.order_by(DCFAnalysis.date_created.desc()).all()
+# DCF form field names -> dcf_valuation_advanced() argument names
+DCF_MODEL_ARGS = {
+    'free_cash_flow': 'initial_fcf',
+    'growth_rate_5yr': 'growth_rate_1_5',
+    'growth_rate_6_10yr': 'growth_rate_6_10',
+    'discount_rate': 'discount_rate',
+    'terminal_growth_rate': 'terminal_growth_rate',
+    'shares_outstanding': 'shares_outstanding',
+    'share_dilution': 'share_change_rate'
+}
+
+def json_object(value, name):
+    """A JSON request member that must be an object; a missing one is {}. Raises
+    ValueError for a list, string or number, which would otherwise fail on .get()."""
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise ValueError(f'{name} must be an object.')
+    return value
+
+def parse_dcf_inputs(data):
+    """Read the DCF form fields from a dict as model arguments. Raises ValueError
+    naming the first missing or non-numeric field."""
+    inputs = {}
+    for field, arg in DCF_MODEL_ARGS.items():
+        value = data.get(field, 0.0 if field == 'share_dilution' else None)
+        try:
+            inputs[arg] = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'{field} must be a number.')
+    return inputs
+
+# Form fields the reverse DCF can solve for
+REVERSE_DCF_FIELDS = ('growth_rate_5yr', 'discount_rate')
+
+# Largest number of scenarios solved per /api/dcf/reverse request
+MAX_REVERSE_DCF_ITEMS = 1000
+
+def implied_market_rates(inputs, market_price):
+    """Growth rate (1-5 yrs) and discount rate implied by the market price, each with
+    the other inputs held fixed. A rate is None when no value in range fits the price."""
+    implied = {}
+    for field in REVERSE_DCF_FIELDS:
+        try:
+            implied[field] = implied_rate(market_price, DCF_MODEL_ARGS[field], inputs)
+        except ValueError:
+            implied[field] = None
+    return implied
+
+# Scenarios the DCF form offers next to the base case, and the inputs they can override
+FORM_SCENARIOS = ('bear', 'base', 'bull')
+SCENARIO_FORM_FIELDS = ('growth_rate_5yr', 'growth_rate_6_10yr', 'terminal_growth_rate', 'discount_rate')
+
+def build_scenarios(base, overrides):
+    """Scenarios for evaluate_scenarios(): each override ({"name", "probability",
+    <DCF form fields>}) applied on top of the base DCF form fields"""
+    scenarios = []
+    for index, override in enumerate(overrides):
+        if not isinstance(override, dict):
+            raise ValueError(f'scenarios[{index}] must be an object.')
+        name = str(override.get('name') or '').strip()
+        if not name or len(name) > 50:
+            raise ValueError(f'scenarios[{index}] needs a name of at most 50 characters.')
+
+        probability = override.get('probability')
+        try:
+            probability = float(probability) if probability not in (None, '') else None
+        except (TypeError, ValueError):
+            raise ValueError(f'{name}: probability must be a number.')
+
+        try:
+            # Fields in neither stay absent, so parse_dcf_inputs() applies its defaults
+            inputs = parse_dcf_inputs({
+                field: override[field] if field in override else base[field]
+                for field in DCF_MODEL_ARGS if field in override or field in base
+            })
+        except ValueError as e:
+            raise ValueError(f'{name}: {e}')
+
+        scenarios.append({
+            'name': name,
+            'probability': probability,
+            'fields': {field: inputs[arg] for field, arg in DCF_MODEL_ARGS.items()},
+            'inputs': inputs
+        })
+    return scenarios
+
+def scenarios_from_form(form):
+    """Bear/base/bull scenarios from the DCF form, or None if no bear or bull input
+    was filled in. Probabilities on the form are percentages."""
+    overrides = []
+    for name in FORM_SCENARIOS:
+        fields = {}
+        if name != 'base':
+            fields = {field: form[f'{name}_{field}'] for field in SCENARIO_FORM_FIELDS
+                      if form.get(f'{name}_{field}', '').strip()}
+            if not fields:
+                continue
+        probability = form.get(f'{name}_probability', '').strip()
+        try:
+            probability = float(probability) / 100 if probability else None
+        except ValueError:
+            raise ValueError(f'{name} probability must be a number.')
+        overrides.append({'name': name, 'probability': probability, **fields})
+
+    if len(overrides) < 2:
+        return None
+    return build_scenarios(form, overrides)
+
+def run_scenarios(scenarios):
+    """evaluate_scenarios() output, with each scenario's DCF form fields attached"""
+    evaluated = evaluate_scenarios(scenarios)
+    for scenario, entry in zip(scenarios, evaluated['scenarios']):
+        entry['inputs'] = scenario['fields']
+    return evaluated
+
+def price_at_save(ticker, fallback=None):
+    """Market price recorded with a saved analysis: the stored quote snapshot, else
+    the price shown with the result (`fallback`), else None"""
+    snapshot = db.session.get(QuoteSnapshot, ticker) if ticker else None
+    if snapshot:
+        return snapshot.price
+    try:
+        return float(fallback) if fallback not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+def save_scenario_set(ticker, currency, evaluated, market_price=None):
+    """Save every scenario as a DCFAnalysis row, plus the set linking them, in one transaction"""
+    scenario_set = DCFScenarioSet(ticker=ticker, currency=currency, weighted_value=evaluated['weighted_value'])
+    for position, entry in enumerate(evaluated['scenarios']):
+        analysis = DCFAnalysis(ticker=ticker, currency=currency, intrinsic_value=entry['intrinsic_value'],
+                               market_price=market_price, **entry['inputs'])
+        scenario_set.scenarios.append(DCFScenario(analysis=analysis, name=entry['name'],
+                                                  probability=entry['probability'], position=position))
+    try:
+        db.session.add(scenario_set)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return scenario_set
+
+# Rows per page of the saved analyses and reports lists
+PAGE_SIZE = 50
+
+def encode_cursor(row):
+    """Opaque cursor pointing just past `row` in a newest-first listing"""
+    key = json.dumps([row.date_created.isoformat(), row.id])
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """(date_created, id) from encode_cursor(); raises ValueError if malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created), int(row_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError('Invalid cursor.') from e
+
+def keyset_page(query, model, cursor=None, limit=PAGE_SIZE):
+    """One newest-first page of `query`, ordered on (date_created, id).
+
+    Instead of an OFFSET, the page starts after the row the cursor points at, so
+    the database seeks straight to it through the (date_created, id) index and
+    every page costs the same however deep it is. Returns (rows, next_cursor),
+    next_cursor being None on the last page.
+    """
+    if cursor:
+        created, row_id = decode_cursor(cursor)
+        query = query.filter(db.or_(
+            model.date_created < created,
+            db.and_(model.date_created == created, model.id < row_id)
+        ))
+    rows = query.order_by(model.date_created.desc(), model.id.desc()).limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
 
 @app.route('/dcf')
 @login_required
 def dcf():
-    """DCF analysis page"""
-    # Fetch all saved analyses ordered by most recent first
-    saved_analyses = get_saved_dcf_analyses()
-    return render_template('dcf.html', saved_analyses=saved_analyses)
+    """DCF analysis page. Saved analyses are loaded page by page from /api/dcf/analyses."""
+    return render_template('dcf.html')
+
+@app.route('/api/dcf/analyses')
+@login_required
+def list_dcf_analyses():
+    """API endpoint: one page of saved DCF analyses, newest first, as rendered table
+    rows. Pass the returned next_cursor back as ?cursor= for the following page."""
+    try:
+        rows, next_cursor = keyset_page(DCFAnalysis.query, DCFAnalysis, request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({
+        'html': render_template('dcf_analysis_rows.html', analyses=rows),
+        'count': len(rows),
+        'next_cursor': next_cursor
+    })
 
 @app.route('/calculate-dcf', methods=['POST'])
 @login_required
@@ -276,28 +663,19 @@ def calculate_dcf():
         # Validate ticker symbol
         if not ticker:
             flash('Please enter a ticker symbol.', 'danger')
-            saved_analyses = get_saved_dcf_analyses()
-            return render_template('dcf.html', saved_analyses=saved_analyses, **request.form)
+            return render_template('dcf.html', **request.form)
         
-        # Validate ticker exists using yfinance
-        info = None
-        ticker_valid = False
-        try:
-            stock = yf.Ticker(ticker)
-            # Try to get basic info to validate ticker exists
-            info = stock.info
-            # Check if ticker is valid by verifying we got meaningful data
-            # We check for 'symbol' or 'shortName' as indicators of a valid ticker
-            if info and (info.get('symbol') or info.get('shortName')):
-                ticker_valid = True
-        except Exception as e:
-            logger.error(f"Ticker validation error for {ticker}: {e}")
+        # Validate ticker exists: a hash lookup in the local SEC ticker registry, with
+        # the (cached) Yahoo Finance quote as the fallback for symbols it doesn't
+        # cover, such as foreign listings. The cache only returns a quote when
+        # Yahoo has a symbol or name for it.
+        registered = sec_tickers.is_registered(ticker)
+        quote = None if registered else quote_cache.get(ticker)
         
-        if not ticker_valid:
+        if not registered and quote is None:
             logger.warning(f"Invalid ticker symbol: {ticker}")
             flash(f'Invalid ticker symbol: {ticker}. Please enter a valid stock ticker.', 'danger')
-            saved_analyses = get_saved_dcf_analyses()
-            return render_template('dcf.html', saved_analyses=saved_analyses, **request.form)
+            return render_template('dcf.html', **request.form)
         
         # Validate and parse numeric form fields
         try:
@@ -311,8 +689,7 @@ def calculate_dcf():
         except (ValueError, TypeError) as e:
             logger.warning(f"Invalid numeric field input for {ticker}: {e}")
             flash('Please ensure all numeric fields are filled with valid numbers.', 'danger')
-            saved_analyses = get_saved_dcf_analyses()
-            return render_template('dcf.html', saved_analyses=saved_analyses, **request.form)
+            return render_template('dcf.html', **request.form)
         
         currency = request.form.get('currency', '$')  # Get manual currency input
         
@@ -327,12 +704,28 @@ def calculate_dcf():
             share_change_rate=share_dilution
         )
         
-        # Get current stock price from Yahoo Finance (if info was fetched successfully)
-        current_price = None
-        if info:
-            current_price = info.get("regularMarketPrice")
-            if current_price:
-                logger.info(f"Found price for {ticker}: {current_price}")
+        # Optional bear/bull scenarios around the base case, valued in one batch
+        scenario_result = None
+        scenarios = scenarios_from_form(request.form)
+        if scenarios:
+            scenario_result = run_scenarios(scenarios)
+        
+        # Get current stock price from the refresher's snapshot, falling back to
+        # the cached quote for tickers it hasn't seen yet. A failed lookup here only
+        # leaves the price unavailable; the ticker is already known to be valid.
+        snapshot = db.session.get(QuoteSnapshot, ticker)
+        if snapshot:
+            current_price = snapshot.price
+        else:
+            quote = quote or quote_cache.get(ticker)
+            current_price = quote.get("price") if quote else None
+        if current_price:
+            logger.info(f"Found price for {ticker}: {current_price}")
+        
+        # Reverse DCF: what the market price implies, holding the other inputs fixed
+        implied_rates = None
+        if current_price:
+            implied_rates = implied_market_rates(parse_dcf_inputs(request.form), current_price)
         
         # Prepare result data
         result = {
@@ -348,29 +741,219 @@ def calculate_dcf():
             'current_price': current_price,
             'currency': currency,        
             'intrinsic_value': intrinsic_value,
-            'current_price': current_price
+            'current_price': current_price,
+            'implied_rates': implied_rates,
+            'scenarios': scenario_result['scenarios'] if scenario_result else None,
+            'weighted_value': scenario_result['weighted_value'] if scenario_result else None
         }
         
         flash(f'DCF calculation completed for {ticker}!', 'success')
-        saved_analyses = get_saved_dcf_analyses()
-        return render_template('dcf.html', result=result, saved_analyses=saved_analyses, **request.form)
+        return render_template('dcf.html', result=result, **request.form)
         
     except ValueError as e:
         logger.error(f'DCF calculation error: {e}')
         flash(f'Calculation error: {str(e)}', 'danger')
-        saved_analyses = get_saved_dcf_analyses()
-        return render_template('dcf.html', saved_analyses=saved_analyses, **request.form)
+        return render_template('dcf.html', **request.form)
     except Exception as e:
         logger.error(f'Unexpected error in DCF calculation: {e}')
         flash(f'An error occurred: {str(e)}', 'danger')
-        saved_analyses = get_saved_dcf_analyses()
-        return render_template('dcf.html', saved_analyses=saved_analyses, **request.form)
+        return render_template('dcf.html', **request.form)
+
+@app.route('/api/dcf/sensitivity', methods=['POST'])
+@login_required
+def dcf_sensitivity():
+    """API endpoint returning a 2-D grid of intrinsic values over two DCF inputs.
+
+    Expects JSON: {"inputs": {<DCF form fields>}, "x": <axis>, "y": <axis>}, where an
+    axis is {"field": <form field>, "values": [...]} or {"field", "start", "stop", "steps"}.
+    Cells the model can't value (discount rate <= terminal growth) are null.
+    """
+    started = time.perf_counter()
+    try:
+        payload = json_object(request.get_json(silent=True), 'The request body')
+        base = parse_dcf_inputs(json_object(payload.get('inputs'), 'inputs'))
+        axes = []
+        for key in ('x', 'y'):
+            axis = json_object(payload.get(key), key)
+            field = axis.get('field')
+            if field not in DCF_MODEL_ARGS:
+                raise ValueError(f'{key}.field must be one of: {", ".join(DCF_MODEL_ARGS)}.')
+            if 'values' in axis:
+                if not isinstance(axis['values'], list):
+                    raise ValueError(f'{key}.values must be a list.')
+                values = [float(v) for v in axis['values']]
+            else:
+                values = axis_values(axis.get('start'), axis.get('stop'), axis.get('steps'))
+            axes.append((field, values))
+
+        (x_field, x_values), (y_field, y_values) = axes
+        grid = sensitivity_grid(base, DCF_MODEL_ARGS[x_field], x_values, DCF_MODEL_ARGS[y_field], y_values)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({
+        'x': {'field': x_field, 'values': [float(v) for v in x_values]},
+        'y': {'field': y_field, 'values': [float(v) for v in y_values]},
+        'values': [[None if math.isnan(v) else round(v, 4) for v in row] for row in grid.tolist()],
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+    })
+
+@app.route('/api/dcf/simulate', methods=['POST'])
+@login_required
+def dcf_simulate():
+    """API endpoint running a Monte Carlo simulation of the DCF model.
+
+    Expects JSON: {"inputs": {<DCF form fields>}, "distributions": {<form field>: spec},
+    "draws": 100000, "current_price": optional, "ticker": optional, "seed": optional}.
+    A spec is {"dist": "normal", "mean", "std"}, {"dist": "uniform", "low", "high"} or
+    {"dist": "triangular", "low", "mode", "high"}. Without a current_price, the stored
+    quote snapshot for the ticker is used for the probability of upside.
+    """
+    payload = request.get_json(silent=True) or {}
+    started = time.perf_counter()
+    try:
+        base = parse_dcf_inputs(payload.get('inputs') or {})
+        distributions = {}
+        for field, spec in (payload.get('distributions') or {}).items():
+            if field not in DCF_MODEL_ARGS:
+                raise ValueError(f'Unknown input {field!r}; expected one of: {", ".join(DCF_MODEL_ARGS)}.')
+            if not isinstance(spec, dict):
+                raise ValueError(f'{field}: distribution must be an object.')
+            distributions[DCF_MODEL_ARGS[field]] = spec
+
+        current_price = payload.get('current_price')
+        current_price = float(current_price) if current_price not in (None, '') else None
+        ticker = (payload.get('ticker') or '').upper().strip()
+        if current_price is None and ticker:
+            snapshot = db.session.get(QuoteSnapshot, ticker)
+            current_price = snapshot.price if snapshot else None
+
+        result = run_simulation(
+            base,
+            distributions,
+            draws=payload.get('draws', 100_000),
+            current_price=current_price,
+            seed=payload.get('seed'),
+            bins=min(max(int(payload.get('bins', 40)), 5), 200),
+            processes=DCF_SIMULATION_PROCESSES
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    result['current_price'] = current_price
+    result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return jsonify(result)
+
+@app.route('/api/dcf/reverse', methods=['POST'])
+@login_required
+def dcf_reverse():
+    """API endpoint solving the reverse DCF for many scenarios in one vectorized pass.
+
+    Expects JSON: {"solve_for": "growth_rate_5yr" | "discount_rate", "items": [{"ticker",
+    "market_price": optional, <DCF form fields>}, ...]}. Items without a market_price use
+    the stored quote snapshot for their ticker. implied_rate is null where no rate in range
+    reproduces the price.
+    """
+    payload = request.get_json(silent=True) or {}
+    started = time.perf_counter()
+    solve_for = payload.get('solve_for', 'growth_rate_5yr')
+    items = payload.get('items')
+    try:
+        if solve_for not in REVERSE_DCF_FIELDS:
+            raise ValueError(f'solve_for must be one of: {", ".join(REVERSE_DCF_FIELDS)}.')
+        if not isinstance(items, list) or not 1 <= len(items) <= MAX_REVERSE_DCF_ITEMS:
+            raise ValueError(f'items must be a list of 1 to {MAX_REVERSE_DCF_ITEMS} scenarios.')
+
+        tickers = [(item.get('ticker') or '').upper().strip() for item in items]
+        snapshots = get_quote_snapshots([t for t, item in zip(tickers, items) if t and item.get('market_price') in (None, '')])
+        prices = []
+        rows = []
+        for index, (ticker, item) in enumerate(zip(tickers, items)):
+            try:
+                rows.append(parse_dcf_inputs(item))
+                price = item.get('market_price')
+                if price in (None, ''):
+                    snapshot = snapshots.get(ticker)
+                    price = snapshot.price if snapshot else None
+                prices.append(float(price) if price is not None else math.nan)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f'items[{index}]: {e}')
+    except (AttributeError, TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    inputs = {arg: [row[arg] for row in rows] for arg in DCF_MODEL_ARGS.values()}
+    rates = implied_rates_batch(prices, DCF_MODEL_ARGS[solve_for], inputs)
+
+    return jsonify({
+        'solve_for': solve_for,
+        'results': [
+            {
+                'ticker': ticker or None,
+                'market_price': None if math.isnan(price) else price,
+                'implied_rate': None if math.isnan(rate) else round(rate, 4)
+            }
+            for ticker, price, rate in zip(tickers, prices, rates.tolist())
+        ],
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+    })
+
+@app.route('/api/dcf/scenarios', methods=['POST'])
+@login_required
+def dcf_scenarios():
+    """API endpoint valuing several named scenarios for one ticker in one batch.
+
+    Expects JSON: {"ticker", "currency": optional, "inputs": {<DCF form fields>},
+    "scenarios": [{"name", "probability": optional 0-1, <DCF form fields to override>}],
+    "save": optional}. Missing probabilities share whatever the given ones leave over.
+    With "save": true the scenarios are stored as one set of linked DCF analyses.
+    """
+    try:
+        payload = json_object(request.get_json(silent=True), 'The request body')
+        ticker = str(payload.get('ticker') or '').upper().strip()
+        currency = payload.get('currency') or '$'
+        if not ticker or len(ticker) > 10:
+            raise ValueError('ticker is required (at most 10 characters).')
+        scenarios = payload.get('scenarios')
+        if not isinstance(scenarios, list):
+            raise ValueError('scenarios must be a list.')
+        evaluated = run_scenarios(build_scenarios(json_object(payload.get('inputs'), 'inputs'), scenarios))
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    scenario_set_id = None
+    if payload.get('save'):
+        try:
+            scenario_set_id = save_scenario_set(ticker, currency, evaluated, market_price=price_at_save(ticker)).id
+        except Exception as e:
+            logger.error(f'Error saving DCF scenarios for {ticker}: {e}')
+            return jsonify({'error': f'Error saving scenarios: {e}'}), 500
+
+    snapshot = db.session.get(QuoteSnapshot, ticker)
+    return jsonify({
+        'ticker': ticker,
+        'currency': currency,
+        'current_price': snapshot.price if snapshot else None,
+        'scenario_set_id': scenario_set_id,
+        **evaluated
+    })
 
 @app.route('/save-dcf-analysis', methods=['POST'])
 @login_required
 def save_dcf_analysis():
     """Save DCF analysis to database"""
     try:
+        # A scenario calculation is saved as one set; values are recomputed rather
+        # than taken from the form
+        if request.form.get('scenarios_json'):
+            ticker = request.form.get('ticker', '').upper().strip()
+            overrides = [{'name': entry['name'], 'probability': entry['probability'], **entry['inputs']}
+                         for entry in json.loads(request.form['scenarios_json'])]
+            evaluated = run_scenarios(build_scenarios(request.form, overrides))
+            save_scenario_set(ticker, request.form.get('currency', '$'), evaluated,
+                              market_price=price_at_save(ticker, request.form.get('current_price')))
+            flash(f'{len(evaluated["scenarios"])} DCF scenarios for {ticker} saved successfully!', 'success')
+            return redirect(url_for('dcf'))
+
         analysis = DCFAnalysis(
             ticker=request.form.get('ticker'),
             free_cash_flow=float(request.form.get('free_cash_flow')),
@@ -381,7 +964,8 @@ def save_dcf_analysis():
             shares_outstanding=float(request.form.get('shares_outstanding')),
             share_dilution=float(request.form.get('share_dilution')),
             intrinsic_value=float(request.form.get('intrinsic_value')),
-            currency=request.form.get('currency', '$')
+            currency=request.form.get('currency', '$'),
+            market_price=price_at_save(request.form.get('ticker'), request.form.get('current_price'))
         )
         db.session.add(analysis)
         db.session.commit()
@@ -398,6 +982,10 @@ def delete_dcf_analysis(id):
     try:
         analysis = DCFAnalysis.query.get_or_404(id)
         ticker = analysis.ticker  # Save for flash message
+        # The scenario link goes with the analysis; a set left without scenarios goes too
+        link = analysis.scenario_link
+        if link is not None and len(link.scenario_set.scenarios) == 1:
+            db.session.delete(link.scenario_set)
         db.session.delete(analysis)
         db.session.commit()
         flash(f'Analysis for {ticker} deleted successfully!', 'success')
@@ -407,6 +995,137 @@ def delete_dcf_analysis(id):
     
     return redirect(url_for('dcf'))
 
+def get_latest_dcf_analyses():
+    """The most recent saved analysis for every ticker, joined with its quote snapshot,
+    in one query. row_number() ranks each ticker's analyses newest first."""
+    ranked = db.session.query(
+        DCFAnalysis.id,
+        db.func.row_number().over(
+            partition_by=DCFAnalysis.ticker,
+            order_by=(DCFAnalysis.date_created.desc(), DCFAnalysis.id.desc())
+        ).label('rank')
+    ).subquery()
+
+    return (
+        db.session.query(DCFAnalysis.id, DCFAnalysis.ticker, DCFAnalysis.intrinsic_value,
+                         DCFAnalysis.currency, DCFAnalysis.date_created,
+                         QuoteSnapshot.price, QuoteSnapshot.currency.label('quote_currency'),
+                         QuoteSnapshot.fetched_at)
+        .join(ranked, ranked.c.id == DCFAnalysis.id)
+        .outerjoin(QuoteSnapshot, QuoteSnapshot.ticker == DCFAnalysis.ticker)
+        .filter(ranked.c.rank == 1)
+        .all()
+    )
+
+def build_revaluation():
+    """Margin of safety for the latest analysis of every ticker, best upside first.
+    Tickers the refresher hasn't priced yet are fetched in one concurrent batch."""
+    rows = get_latest_dcf_analyses()
+
+    prices = {row.ticker: (row.price, row.quote_currency) for row in rows if row.price is not None}
+    missing = [row.ticker for row in rows if row.price is None]
+    if missing:
+        fetched = {ticker: quote for ticker, quote in quote_cache.get_many(missing).items()
+                   if quote and quote.get('price')}
+        if fetched:
+            save_quote_snapshots(fetched)
+        prices.update((ticker, (quote['price'], quote.get('currency'))) for ticker, quote in fetched.items())
+
+    rate_table = fx_rate_table.get()
+    converted, upside, order = revalue(
+        intrinsic_values=[row.intrinsic_value for row in rows],
+        prices=[prices.get(row.ticker, (float('nan'), None))[0] for row in rows],
+        quote_currencies=[prices.get(row.ticker, (None, None))[1] for row in rows],
+        value_symbols=[row.currency for row in rows],
+        rates=rate_table['rates'] if rate_table else None
+    )
+
+    items = []
+    for i in order.tolist():
+        row = rows[i]
+        price, price_currency = prices.get(row.ticker, (None, None))
+        items.append({
+            'id': row.id,
+            'ticker': row.ticker,
+            'date_created': row.date_created.strftime('%Y-%m-%d') if row.date_created else None,
+            'intrinsic_value': row.intrinsic_value,
+            'currency': row.currency,
+            'price': price,
+            'price_currency': price_currency,
+            'price_in_currency': None if math.isnan(converted[i]) else round(float(converted[i]), 4),
+            'upside_pct': None if math.isnan(upside[i]) else round(float(upside[i]), 2)
+        })
+    return items, bool(rate_table and rate_table['stale'])
+
+@app.route('/revaluation')
+@login_required
+def revaluation():
+    """Margin of safety of every ticker's latest DCF analysis at today's prices"""
+    items, fx_stale = build_revaluation()
+    return render_template('revaluation.html', items=items, fx_stale=fx_stale)
+
+@app.route('/api/dcf/revaluation')
+@login_required
+def revaluation_api():
+    """API endpoint: the revaluation table as JSON, sorted by upside (highest first)"""
+    started = time.perf_counter()
+    items, fx_stale = build_revaluation()
+    return jsonify({
+        'items': items,
+        'fx_stale': fx_stale,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+    })
+
+def resolve_sec_company(ticker):
+    """{'ticker', 'cik', 'name'} for the SEC filer behind a ticker, or None.
+
+    The ticker registry answers directly. A ticker it doesn't know (a stale
+    registry, or no registry file at all) falls back to the company name Yahoo
+    reports, matched against the registry's names and then the 13F filer index.
+    """
+    company = sec_tickers.lookup(ticker)
+    if company is not None:
+        return company
+
+    quote = quote_cache.get(ticker.upper())
+    name = quote and quote.get('name')
+    if not name:
+        return None
+    company = sec_tickers.find_by_name(name) or sec_filers.find_by_name(name)
+    if company is None:
+        return None
+    return {'ticker': ticker.upper(), 'cik': company['cik'], 'name': company['name']}
+
+@app.route('/api/dcf/prefill/<ticker>')
+@login_required
+def dcf_prefill_api(ticker):
+    """API endpoint with DCF inputs taken from the company's SEC XBRL filings:
+    free cash flow, diluted shares and the historical share-count change"""
+    company = resolve_sec_company(ticker)
+    if company is None:
+        return jsonify({'error': f'No SEC filer found for {ticker.upper()}. Pre-fill only covers companies that file with SEC.'}), 404
+
+    try:
+        prefill = dcf_prefill(get_company_facts(company['cik'], SEC_USER_AGENT, SEC_FACTS_CACHE_DIR))
+    except SecClientError as e:
+        logger.error(f'SEC company facts lookup failed for {company["ticker"]}: {e}')
+        return jsonify({'error': str(e)}), 502
+    except Exception as e:
+        logger.error(f'Unexpected error pre-filling DCF for {company["ticker"]}: {e}')
+        return jsonify({'error': f'Unexpected error reading SEC filings: {e}'}), 500
+
+    if prefill['free_cash_flow'] is None and prefill['shares_outstanding'] is None:
+        return jsonify({'error': f'No cash flow or share data found in {company["ticker"]}\'s SEC filings.'}), 404
+
+    symbols = {code: symbol for symbol, code in fx_rates.CURRENCY_CODES.items()}
+    return jsonify({
+        'ticker': company['ticker'],
+        'cik': company['cik'],
+        'name': prefill['entity_name'] or company['name'],
+        'currency_symbol': symbols.get(prefill['currency']),
+        **prefill
+    })
+
 @app.route('/api/stock-lookup/<ticker>')
 @login_required
 def stock_lookup(ticker):
@@ -444,6 +1163,61 @@ def stock_lookup(ticker):
     except Exception as e:
         return jsonify({'error': f'Error searching for {ticker}: {str(e)}'}), 500
 
+@app.route('/api/dcf/history/<ticker>')
+@login_required
+def dcf_history(ticker):
+    """API endpoint: a ticker's intrinsic value over time against the market price at
+    save time, oldest first. ?downsample=monthly keeps the last analysis of each month.
+    Served by the (ticker, date_created) index, reading only the charted columns."""
+    downsample = request.args.get('downsample') or None
+    if downsample not in (None, 'monthly'):
+        return jsonify({'error': 'downsample must be "monthly" or omitted.'}), 400
+
+    started = time.perf_counter()
+    ticker = ticker.upper().strip()
+    columns = (DCFAnalysis.date_created, DCFAnalysis.intrinsic_value,
+               DCFAnalysis.market_price, DCFAnalysis.currency)
+    query = db.session.query(*columns).filter(
+        DCFAnalysis.ticker == ticker, DCFAnalysis.date_created.isnot(None)
+    )
+
+    if downsample == 'monthly':
+        # Bucket by month in the database and keep each month's latest analysis,
+        # so only one row per month is ever read back
+        if db.engine.dialect.name == 'postgresql':
+            month = db.func.date_trunc('month', DCFAnalysis.date_created)
+        else:
+            month = db.func.strftime('%Y-%m', DCFAnalysis.date_created)
+        ranked = query.add_columns(
+            db.func.row_number().over(
+                partition_by=month,
+                order_by=(DCFAnalysis.date_created.desc(), DCFAnalysis.id.desc())
+            ).label('rank')
+        ).subquery()
+        rows = (
+            db.session.query(*(ranked.c[column.key] for column in columns))
+            .filter(ranked.c.rank == 1)
+            .order_by(ranked.c.date_created)
+            .all()
+        )
+    else:
+        rows = query.order_by(DCFAnalysis.date_created).all()
+
+    return jsonify({
+        'ticker': ticker,
+        'downsample': downsample,
+        'points': [
+            {
+                'date': row.date_created.strftime('%Y-%m-%d'),
+                'intrinsic_value': row.intrinsic_value,
+                'market_price': row.market_price,
+                'currency': row.currency
+            }
+            for row in rows
+        ],
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+    })
+
 def format_market_cap(value):
     """Format market cap to readable string"""
     if value >= 1e12:
@@ -458,9 +1232,28 @@ def format_market_cap(value):
 @app.route('/reports')
 @login_required
 def reports():
-    """Reports listing page"""
-    all_reports = Report.query.order_by(Report.date_created.desc()).all()
-    return render_template('reports.html', reports=all_reports)
+    """Reports listing page, one keyset page at a time (?cursor= from the previous page).
+    With ?q=, shows ranked full-text search results instead."""
+    query = request.args.get('q', '').strip()
+    if query:
+        started = time.perf_counter()
+        try:
+            results = report_search.search(db.session, query, limit=report_search.MAX_RESULTS)
+        except Exception as e:
+            logger.error(f"Report search failed for {query!r}: {e}")
+            db.session.rollback()
+            flash('Search is unavailable right now.', 'danger')
+            results = []
+        return render_template('reports.html', query=query, results=results,
+                               elapsed_ms=round((time.perf_counter() - started) * 1000, 1))
+
+    cursor = request.args.get('cursor')
+    try:
+        # The notes HTML can run to megabytes; the list only shows the excerpt
+        page, next_cursor = keyset_page(Report.query.options(db.defer(Report.notes)), Report, cursor)
+    except ValueError:
+        return redirect(url_for('reports'))
+    return render_template('reports.html', reports=page, next_cursor=next_cursor, paged=bool(cursor))
 
 @app.route('/create-report', methods=['POST'])
 @login_required
@@ -487,9 +1280,12 @@ def create_report():
             ticker=ticker,
             title=title,
             date=report_date,
-            notes=sanitized_notes
+            notes=sanitized_notes,
+            excerpt=report_excerpt(sanitized_notes)
         )
         db.session.add(new_report)
+        db.session.flush()
+        report_search.index_report(db.session, new_report.id, new_report.title, new_report.notes)
         db.session.commit()
         flash(f'Report for {ticker} created successfully!', 'success')
     except ValueError as e:
@@ -521,6 +1317,8 @@ def edit_report(report_id):
             # Sanitize HTML content to prevent XSS
             notes = request.form.get('notes', '').strip()
             report.notes = sanitize_html(notes)
+            report.excerpt = report_excerpt(report.notes)
+            report_search.index_report(db.session, report.id, report.title, report.notes)
             
             db.session.commit()
             flash('Report updated successfully!', 'success')
@@ -537,6 +1335,7 @@ def delete_report(report_id):
     try:
         report = Report.query.get_or_404(report_id)
         ticker = report.ticker
+        report_search.remove_report(db.session, report.id)
         db.session.delete(report)
         db.session.commit()
         flash(f'Report for {ticker} deleted successfully!', 'success')
@@ -550,25 +1349,115 @@ def delete_report(report_id):
 @app.route('/wishlist')
 @login_required
 def wishlist():
-    """Wishlist page"""
+    """Wishlist page. Rows render straight from the database; prices and EUR
+    conversions are filled in afterwards by static/wishlist.js."""
     wishlist_items = Wishlist.query.order_by(Wishlist.date_added.desc()).all()
-    
-    # Fetch current prices and convert target prices to EUR
-    for item in wishlist_items:
-        try:
-            stock = yf.Ticker(item.ticker)
-            info = stock.info
-            current_price = info.get("regularMarketPrice") or info.get("currentPrice") or info.get("previousClose")
-            item.current_price = current_price
-        except Exception as e:
-            print(f"Error fetching price for {item.ticker}: {e}")
-            item.current_price = None
-        
-        # Convert target price to EUR
-        item.target_price_eur = convert_to_eur(item.target_price, item.currency)
-    
     return render_template('wishlist.html', wishlist=wishlist_items)
 
+def wishlist_price_entry(item, snapshot, rate_table):
+    """JSON-ready price data for one wishlist row"""
+    return {
+        'id': item.id,
+        'ticker': item.ticker,
+        'currency': item.currency,
+        'current_price': snapshot.price if snapshot else None,
+        'fetched_at': snapshot.fetched_at.strftime('%Y-%m-%d %H:%M') if snapshot else None,
+        'target_price_eur': fx_rates.convert_to_eur(item.target_price, item.currency, rate_table)
+    }
+
+@app.route('/api/wishlist/prices')
+@login_required
+def wishlist_prices():
+    """API endpoint returning stored prices and EUR target prices for every wishlist row"""
+    wishlist_items = Wishlist.query.order_by(Wishlist.date_added.desc()).all()
+
+    # Read all current prices from the snapshot table in one query. Tickers the
+    # refresher hasn't priced yet come back empty and are picked up right away.
+    snapshots = get_quote_snapshots(item.ticker for item in wishlist_items)
+    quote_refresher.wake_for(item.ticker for item in wishlist_items if item.ticker not in snapshots)
+
+    # One rate table serves every row's EUR conversion
+    rate_table = fx_rate_table.get()
+
+    return jsonify({
+        'fx_stale': bool(rate_table and rate_table['stale']),
+        'items': [wishlist_price_entry(item, snapshots.get(item.ticker), rate_table)
+                  for item in wishlist_items]
+    })
+
+@app.route('/api/wishlist/prices/stream')
+@login_required
+def wishlist_prices_stream():
+    """Server-sent events: one 'price' event per ticker whose snapshot is missing or
+    out of date, sent as each live quote resolves, then a final 'done' event."""
+    wishlist_items = Wishlist.query.order_by(Wishlist.date_added.desc()).all()
+    snapshots = get_quote_snapshots(item.ticker for item in wishlist_items)
+    cutoff = datetime.utcnow() - timedelta(seconds=QUOTE_REFRESH_INTERVAL_SECONDS)
+    outdated = {
+        item.ticker: item for item in wishlist_items
+        if (item.ticker not in snapshots or snapshots[item.ticker].fetched_at < cutoff)
+        and not quote_refresher.backing_off(item.ticker)
+    }
+    rate_table = fx_rate_table.get()
+
+    def events():
+        for ticker, quote in iter_quotes(outdated):
+            if quote and quote.get('price'):
+                save_quote_snapshots({ticker: quote})
+                snapshot = QuoteSnapshot(ticker=ticker, price=quote['price'],
+                                         currency=quote.get('currency'), fetched_at=datetime.utcnow())
+            else:
+                quote_refresher.record_failures([ticker])
+                snapshot = snapshots.get(ticker)
+            entry = wishlist_price_entry(outdated[ticker], snapshot, rate_table)
+            yield f"event: price\ndata: {json.dumps(entry)}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    response = Response(stream_with_context(events()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop reverse proxies from buffering the stream into one response
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/alerts')
+@login_required
+def list_alerts():
+    """API endpoint listing wishlist target-price alerts, newest first.
+    ?status=open (default) for alerts still at target, or ?status=all for history."""
+    status = request.args.get('status', 'open')
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 500)
+
+    query = AlertEvent.query
+    if status == 'open':
+        query = query.filter(AlertEvent.open_key.isnot(None))
+    alerts = query.order_by(AlertEvent.triggered_at.desc(), AlertEvent.id.desc()).limit(limit).all()
+
+    return jsonify({
+        'status': status,
+        'count': len(alerts),
+        'alerts': [
+            {
+                'id': alert.id,
+                'wishlist_id': alert.wishlist_id,
+                'ticker': alert.ticker,
+                'target_price': alert.target_price,
+                'target_currency': alert.target_currency,
+                'price': alert.price,
+                'price_currency': alert.price_currency,
+                'open': alert.open_key is not None,
+                'triggered_at': alert.triggered_at.strftime('%Y-%m-%d %H:%M'),
+                'cleared_at': alert.cleared_at.strftime('%Y-%m-%d %H:%M') if alert.cleared_at else None
+            }
+            for alert in alerts
+        ]
+    })
+
+@app.route('/api/quote-cache/stats')
+@login_required
+def quote_cache_stats():
+    """API endpoint reporting quote cache size and hit/miss counters"""
+    return jsonify(quote_cache.stats())
+
 @app.route('/add-to-wishlist', methods=['POST'])
 @login_required
 def add_to_wishlist():
@@ -621,6 +1510,138 @@ def delete_wishlist(id):
     
     return redirect(url_for('wishlist'))
 
+# Bulk export/import. Rows are streamed in and out in batches of this size, and
+# an import reports at most MAX_IMPORT_ERRORS invalid records.
+BULK_BATCH_SIZE = 1000
+MAX_IMPORT_ERRORS = 20
+
+def bulk_model(kind):
+    return {'dcf-analyses': DCFAnalysis, 'reports': Report, 'wishlist': Wishlist}.get(kind)
+
+@app.route('/export/<kind>')
+@login_required
+def export_data(kind):
+    """Download every DCF analysis, report or wishlist item as CSV or JSONL
+    (?format=csv|jsonl). Rows come off a server-side cursor and are written out
+    in chunks, so memory use is the same for ten rows or a million."""
+    model = bulk_model(kind)
+    fmt = request.args.get('format', 'csv')
+    if model is None:
+        return jsonify({'error': f"Unknown export '{kind}'."}), 404
+    if fmt not in bulk_formats.FORMATS:
+        return jsonify({'error': f"Format must be one of: {', '.join(bulk_formats.FORMATS)}."}), 400
+
+    fields = bulk_records.FIELDS[kind]
+    statement = (
+        db.select(*(getattr(model, field) for field in fields))
+        .order_by(model.id)
+        .execution_options(yield_per=BULK_BATCH_SIZE)
+    )
+
+    def rows():
+        yield from db.session.execute(statement)
+
+    filename = f"{kind}-{datetime.utcnow():%Y%m%d}.{fmt}"
+    response = Response(stream_with_context(bulk_formats.encode_rows(rows(), fields, fmt)), mimetype=bulk_formats.MIMETYPES[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+def insert_batch(model, batch):
+    """Bulk-insert one batch of validated rows into the current transaction"""
+    if model is Report:
+        ids = db.session.execute(
+            db.insert(Report).returning(Report.id, sort_by_parameter_order=True), batch
+        ).scalars().all()
+        report_search.index_reports(db.session, [
+            (report_id, values['title'], values['notes']) for report_id, values in zip(ids, batch)
+        ])
+    else:
+        db.session.execute(db.insert(model), batch)
+
+@app.route('/import/<kind>', methods=['POST'])
+@login_required
+def import_data(kind):
+    """Load DCF analyses, reports or wishlist items from a CSV or JSONL upload
+    (multipart field "file", or the raw request body with ?format=).
+
+    Records are validated like the MCP server's create tools: intrinsic values
+    are recomputed, report notes sanitized and duplicate wishlist tickers
+    rejected. Valid rows are bulk-inserted in batches as the file is read, all in
+    one transaction, which is rolled back if any record is invalid.
+    """
+    model = bulk_model(kind)
+    if model is None:
+        return jsonify({'error': f"Unknown import '{kind}'."}), 404
+
+    upload = request.files.get('file')
+    fmt = request.values.get('format')
+    if not fmt and upload and upload.filename:
+        fmt = upload.filename.rsplit('.', 1)[-1].lower()
+    if fmt not in bulk_formats.FORMATS:
+        return jsonify({'error': f"Format must be one of: {', '.join(bulk_formats.FORMATS)}."}), 400
+
+    started = time.perf_counter()
+    stream = io.TextIOWrapper(upload.stream if upload else request.stream, encoding='utf-8-sig', newline='')
+    validate = bulk_records.VALIDATORS[kind]
+    now = datetime.utcnow()
+    tickers = {ticker for (ticker,) in db.session.query(Wishlist.ticker)} if model is Wishlist else None
+    errors = []
+    batch = []
+    imported = 0
+
+    try:
+        try:
+            for line, record in bulk_formats.decode_records(stream, fmt):
+                try:
+                    values = validate(record, now)
+                    if model is Report:
+                        values['notes'] = sanitize_html(values['notes'])
+                        values['excerpt'] = report_excerpt(values['notes'])
+                    elif model is Wishlist:
+                        if values['ticker'] in tickers:
+                            raise ValueError(f"{values['ticker']} is already in the wishlist.")
+                        tickers.add(values['ticker'])
+                except ValueError as e:
+                    errors.append({'line': line, 'error': str(e)})
+                    if len(errors) >= MAX_IMPORT_ERRORS:
+                        break
+                    continue
+
+                batch.append(values)
+                # Once a record has failed nothing will be kept, so stop inserting
+                if len(batch) >= BULK_BATCH_SIZE and not errors:
+                    insert_batch(model, batch)
+                    imported += len(batch)
+                    batch = []
+        except bulk_formats.RecordError as e:
+            errors.append({'line': e.line, 'error': e.message})
+        except UnicodeDecodeError:
+            errors.append({'line': None, 'error': 'File must be UTF-8 encoded.'})
+
+        if errors:
+            db.session.rollback()
+            return jsonify({'error': 'Nothing was imported: fix these records and retry.', 'errors': errors}), 400
+
+        if batch:
+            insert_batch(model, batch)
+            imported += len(batch)
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        logger.warning(f"Import of {kind} rejected by the database: {e}")
+        return jsonify({'error': 'Nothing was imported: a record conflicts with existing data.'}), 400
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Import of {kind} failed: {e}")
+        return jsonify({'error': 'Import failed.'}), 500
+
+    logger.info(f"Imported {imported} {kind} in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return jsonify({
+        'kind': kind,
+        'imported': imported,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+    })
+
 @app.route('/filings')
 @login_required
 def filings():
@@ -678,9 +1699,85 @@ def filings_lookup(cik):
     return jsonify(snapshot)
 
 
+@app.cli.command('backfill-report-excerpts')
+def backfill_report_excerpts():
+    """Compute Report.excerpt for reports saved before the column existed."""
+    total = 0
+    while True:
+        # Only id and notes are read, a batch at a time, so memory stays flat
+        batch = (
+            db.session.query(Report.id, Report.notes)
+            .filter(Report.excerpt.is_(None))
+            .limit(500)
+            .all()
+        )
+        if not batch:
+            break
+        db.session.execute(db.update(Report), [
+            {'id': row.id, 'excerpt': report_excerpt(row.notes)} for row in batch
+        ])
+        db.session.commit()
+        total += len(batch)
+    print(f'Backfilled excerpts for {total} reports.')
+
+# Columns added to tables that already existed, as (table, column). Only these
+# are added by upgrade_schema(); any other model column missing from the
+# database needs a real migration. Each must be nullable.
+ADDED_COLUMNS = (
+    ('dcf_analysis', 'market_price'),
+    ('report', 'excerpt'),
+)
+
+def upgrade_schema():
+    """Add the ADDED_COLUMNS and any indexes introduced since a table was first
+    created. db.create_all() only creates missing tables, so without this an
+    existing database would never get them. A nullable column can be added in
+    place on every database; a NOT NULL one can't, so listing one is an error.
+    Several workers may race here at startup; whichever loses just logs the error."""
+    inspector = db.inspect(db.engine)
+    quote = db.engine.dialect.identifier_preparer.quote
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            if (table.name, column.name) not in ADDED_COLUMNS:
+                logger.error(f'Column {table.name}.{column.name} is missing from the database '
+                             f'and needs a migration; it is not in ADDED_COLUMNS')
+                continue
+            if not column.nullable:
+                raise RuntimeError(f'{table.name}.{column.name} is NOT NULL and cannot be added '
+                                   f'by upgrade_schema(); write a migration instead')
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            try:
+                with db.engine.begin() as connection:
+                    connection.execute(db.text(
+                        f'ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}'
+                    ))
+                logger.info(f'Added column {table.name}.{column.name}')
+            except Exception as e:
+                logger.warning(f'Could not add column {table.name}.{column.name}: {e}')
+
+        existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing_indexes:
+                continue
+            try:
+                index.create(db.engine)
+                logger.info(f'Created index {index.name}')
+            except Exception as e:
+                logger.warning(f'Could not create index {index.name}: {e}')
+
 # Initialize database tables
 with app.app_context():
     db.create_all()
+    upgrade_schema()
+    try:
+        report_search.ensure_index(db.engine)
+    except Exception as e:
+        logger.warning(f'Could not create the report search index: {e}')
 
 if __name__ == '__main__':
     app.run(debug=False)
@@ -0,0 +1,94 @@
+"""Streaming CSV and JSON Lines encoding for bulk export and import.
+
+Pure logic module with no Flask imports. Both directions work on iterators, so
+an export is written out as the database cursor yields rows and an import is
+validated as the upload is read: memory use doesn't depend on the row count.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+
+FORMATS = ("csv", "jsonl")
+
+MIMETYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+# Rows are buffered into chunks of about this many characters per response write
+CHUNK_SIZE = 64 * 1024
+
+
+class RecordError(ValueError):
+    """A record in an import file that can't be read or fails validation."""
+
+    def __init__(self, line, message):
+        super().__init__(f"Line {line}: {message}")
+        self.line = line
+        self.message = message
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def encode_rows(rows, fields, fmt):
+    """Yield `rows` (tuples in `fields` order) as CSV or JSONL text, in chunks."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Format must be one of: {', '.join(FORMATS)}.")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(fields)
+
+    for row in rows:
+        values = [_plain(value) for value in row]
+        if writer:
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(fields, values)), ensure_ascii=False))
+            buffer.write("\n")
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def decode_records(stream, fmt):
+    """Yield (line number, record dict) from a text stream of CSV or JSONL.
+
+    CSV needs a header row; empty cells come back as None. Blank JSONL lines are
+    skipped. Raises RecordError for a line that isn't a valid record.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Format must be one of: {', '.join(FORMATS)}.")
+
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        try:
+            for record in reader:
+                if None in record:
+                    raise RecordError(reader.line_num, "more values than header columns.")
+                yield reader.line_num, {key: (value if value != "" else None) for key, value in record.items()}
+        except csv.Error as e:
+            raise RecordError(reader.line_num, str(e))
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise RecordError(line_number, f"invalid JSON ({e}).")
+        if not isinstance(record, dict):
+            raise RecordError(line_number, "each line must be a JSON object.")
+        yield line_number, record
@@ -0,0 +1,153 @@
+"""Validation of imported analyses, reports and wishlist items.
+
+Pure logic module with no Flask imports. Each function takes one decoded record
+and returns the column values to insert, applying the same rules as the MCP
+server's create_dcf_analysis/create_report/add_wishlist_item (mcp_server/db.py),
+or raises ValueError. As there, a DCF analysis's intrinsic value is recomputed
+rather than taken from the file. Report notes are returned unsanitized: the
+caller sanitizes them with the app's sanitize_html().
+"""
+
+import math
+from datetime import datetime
+
+from dcf.dcf_default import dcf_valuation_advanced
+
+# Columns written by export and read back by import, per kind. ids are never
+# exported: imported rows get new ones.
+FIELDS = {
+    "dcf-analyses": (
+        "ticker", "free_cash_flow", "growth_rate_5yr", "growth_rate_6_10yr",
+        "terminal_growth_rate", "discount_rate", "shares_outstanding", "share_dilution",
+        "intrinsic_value", "currency", "market_price", "date_created",
+    ),
+    "reports": ("ticker", "title", "date", "notes", "date_created"),
+    "wishlist": ("ticker", "target_price", "currency", "date_added"),
+}
+
+MAX_TICKER_LENGTH = 10
+MAX_TITLE_LENGTH = 200
+MAX_CURRENCY_LENGTH = 10
+
+
+def _ticker(record):
+    ticker = str(record.get("ticker") or "").upper().strip()
+    if not ticker:
+        raise ValueError("ticker is required.")
+    if len(ticker) > MAX_TICKER_LENGTH:
+        raise ValueError(f"ticker must be {MAX_TICKER_LENGTH} characters or fewer.")
+    return ticker
+
+
+def _as_float(value, field):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a number.")
+    # float() accepts "nan" and "inf", which SQLite refuses at insert and
+    # Postgres would store
+    if not math.isfinite(number):
+        raise ValueError(f"{field} must be a finite number.")
+    return number
+
+
+def _optional_float(value, field):
+    return None if value is None else _as_float(value, field)
+
+
+def _timestamp(value, field, default=None):
+    if value is None:
+        return default
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        raise ValueError(f"{field} must be an ISO date, e.g. 2025-01-31 or 2025-01-31T09:30:00.")
+
+
+def _currency(record):
+    currency = (str(record.get("currency") or "$")).strip() or "$"
+    if len(currency) > MAX_CURRENCY_LENGTH:
+        raise ValueError(f"currency must be {MAX_CURRENCY_LENGTH} characters or fewer.")
+    return currency
+
+
+def dcf_analysis(record, now):
+    """DCFAnalysis columns for a record; `now` is the default date_created."""
+    inputs = {
+        field: _as_float(record.get(field), field)
+        for field in ("free_cash_flow", "growth_rate_5yr", "growth_rate_6_10yr",
+                      "terminal_growth_rate", "discount_rate", "shares_outstanding")
+    }
+    inputs["share_dilution"] = _as_float(
+        record.get("share_dilution") if record.get("share_dilution") is not None else 0.0, "share_dilution"
+    )
+    if inputs["shares_outstanding"] <= 0:
+        raise ValueError("shares_outstanding must be a positive number.")
+    if inputs["discount_rate"] <= inputs["terminal_growth_rate"]:
+        raise ValueError("discount_rate must be greater than terminal_growth_rate.")
+
+    try:
+        intrinsic_value = dcf_valuation_advanced(
+            initial_fcf=inputs["free_cash_flow"],
+            growth_rate_1_5=inputs["growth_rate_5yr"],
+            growth_rate_6_10=inputs["growth_rate_6_10yr"],
+            discount_rate=inputs["discount_rate"],
+            terminal_growth_rate=inputs["terminal_growth_rate"],
+            shares_outstanding=inputs["shares_outstanding"],
+            share_change_rate=inputs["share_dilution"],
+        )
+    except ZeroDivisionError:
+        raise ValueError("Inputs produce a division by zero -- check the share dilution rate.")
+
+    return {
+        "ticker": _ticker(record),
+        **inputs,
+        "intrinsic_value": intrinsic_value,
+        "currency": _currency(record),
+        "market_price": _optional_float(record.get("market_price"), "market_price"),
+        "date_created": _timestamp(record.get("date_created"), "date_created", now),
+    }
+
+
+def report(record, now):
+    """Report columns for a record, with notes still to be sanitized."""
+    ticker = _ticker(record)
+    title = str(record.get("title") or "").strip()
+    notes = str(record.get("notes") or "").strip()
+    if not title or not notes:
+        raise ValueError("ticker, title, and notes are all required.")
+    if len(title) > MAX_TITLE_LENGTH:
+        raise ValueError(f"title must be {MAX_TITLE_LENGTH} characters or fewer.")
+    report_date = _timestamp(record.get("date"), "date")
+    if report_date is None:
+        raise ValueError("date is required.")
+
+    return {
+        "ticker": ticker,
+        "title": title,
+        "date": report_date,
+        "notes": notes,
+        "date_created": _timestamp(record.get("date_created"), "date_created", now),
+    }
+
+
+def wishlist_item(record, now):
+    """Wishlist columns for a record. Duplicate tickers are the caller's to check."""
+    ticker = _ticker(record)
+    target_price = _as_float(record.get("target_price"), "target_price")
+    if not (0 < target_price < 10_000_000):
+        raise ValueError("target_price must be a positive, realistic number.")
+
+    return {
+        "ticker": ticker,
+        "target_price": target_price,
+        "currency": _currency(record),
+        "date_added": _timestamp(record.get("date_added"), "date_added", now),
+    }
+
+
+VALIDATORS = {
+    "dcf-analyses": dcf_analysis,
+    "reports": report,
+    "wishlist": wishlist_item,
+}
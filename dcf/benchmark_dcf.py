@@ -0,0 +1,182 @@
+"""Check the closed-form DCF against the original loop, then time both.
+
+Not imported by the app. Run it by hand from the repository root after touching
+the model:
+
+    python -m dcf.benchmark_dcf [--cases 20000] [--batch 1000000] [--seed 0]
+
+Step 1 checks dcf_valuation_advanced() (closed form), dcf_valuation_batch() and
+the MCP server's copies of both in mcp_server/dcf_calc.py against
+dcf_valuation_iterative(), the original year-by-year loop, on randomized inputs.
+The inputs deliberately include buybacks, zero growth, discount rates a hair above
+terminal growth, and (in about one case in ten) the error cases -- discount <=
+terminal, non-positive shares, a -100% share change -- which must fail the same
+way everywhere. It exits non-zero on any mismatch. tests/test_dcf.py runs the
+same check, plus fixed cases, under pytest.
+
+Step 2 reports the time per call for the scalar functions and per batch for the
+vectorized one.
+"""
+
+import argparse
+import importlib.util
+import math
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from dcf.dcf_batch import dcf_valuation_batch
+from dcf.dcf_default import dcf_valuation_advanced, dcf_valuation_iterative
+
+MCP_DCF_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "mcp_server", "dcf_calc.py")
+
+# Relative tolerance between implementations. Reordering the arithmetic costs a
+# few ulps; near-equal discount/terminal rates amplify that by 1 / (r - g).
+REL_TOL = 1e-9
+
+# Share of random cases drawn as one of the error cases
+ERROR_CASE_SHARE = 0.1
+
+
+def load_mcp_copy():
+    spec = importlib.util.spec_from_file_location("mcp_dcf_calc", MCP_DCF_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def random_case(rng):
+    """One set of inputs, weighted towards the edge cases the closed form must handle.
+
+    Most cases are valid; ERROR_CASE_SHARE of them break exactly one input, so each
+    error path is still exercised a few hundred times in a default run.
+    """
+    terminal = rng.choice([0.0, rng.uniform(-2, 5)])
+    discount = terminal + rng.choice([
+        rng.uniform(1e-9, 1e-4),      # discount a hair above terminal growth
+        rng.uniform(0.5, 20),
+        rng.uniform(0.5, 20),
+    ])
+    shares = rng.uniform(0.01, 20_000)
+    dilution = rng.choice([0.0, rng.uniform(-8, 0), rng.uniform(0, 8)])  # buybacks / dilution
+
+    if rng.random() < ERROR_CASE_SHARE:
+        error = rng.choice(["discount", "zero shares", "negative shares", "no shares left"])
+        if error == "discount":
+            discount = terminal - rng.uniform(0, 2)   # discount <= terminal
+        elif error == "zero shares":
+            shares = 0.0
+        elif error == "negative shares":
+            shares = -5.0
+        else:
+            dilution = -100.0
+
+    return (
+        rng.choice([rng.uniform(-5_000, 100_000), 0.0]),        # FCF, sometimes negative or zero
+        rng.choice([0.0, rng.uniform(-40, 80)]),                 # growth 1-5, often exactly zero
+        rng.choice([0.0, rng.uniform(-30, 50)]),                 # growth 6-10
+        discount,
+        terminal,
+        shares,
+        dilution,
+    )
+
+
+def outcome(function, args):
+    try:
+        return function(*args)
+    except (ValueError, ZeroDivisionError) as e:
+        return type(e).__name__
+
+
+def check_equivalence(cases, seed):
+    rng = random.Random(seed)
+    mcp_dcf = load_mcp_copy()
+    inputs = [random_case(rng) for _ in range(cases)]
+    failures = 0
+    worst = 0.0
+
+    batch = dcf_valuation_batch(*np.array(inputs).T)
+    mcp_batch = mcp_dcf.dcf_valuation_batch(*np.array(inputs).T)
+
+    for args, batch_value, mcp_batch_value in zip(inputs, batch, mcp_batch):
+        reference = outcome(dcf_valuation_iterative, args)
+        results = {
+            "closed form": outcome(dcf_valuation_advanced, args),
+            "mcp copy": outcome(mcp_dcf.dcf_valuation_advanced, args),
+            "batch": float(batch_value) if not math.isnan(batch_value) else "NaN",
+            "mcp batch copy": float(mcp_batch_value) if not math.isnan(mcp_batch_value) else "NaN",
+        }
+        for name, value in results.items():
+            if isinstance(reference, str):
+                expected = "NaN" if "batch" in name else reference
+                ok = value == expected
+            else:
+                ok = not isinstance(value, str) and math.isclose(value, reference, rel_tol=REL_TOL, abs_tol=1e-9)
+                if ok:
+                    worst = max(worst, abs(value - reference) / max(abs(reference), 1e-12))
+            if not ok:
+                failures += 1
+                if failures <= 10:
+                    print(f"  MISMATCH ({name}): inputs={args} expected={reference!r} got={value!r}")
+
+    errors = sum(1 for args in inputs if isinstance(outcome(dcf_valuation_iterative, args), str))
+    print(f"Equivalence: {cases:,} cases ({errors:,} error cases), "
+          f"worst relative difference {worst:.2e}, {failures} mismatches")
+    return failures == 0
+
+
+def time_per_call(function, inputs, repeat=3):
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for args in inputs:
+            function(*args)
+        best = min(best, time.perf_counter() - started)
+    return best / len(inputs)
+
+
+def benchmark(batch_size, seed):
+    rng = np.random.default_rng(seed)
+    scalar_inputs = [
+        (float(rng.uniform(100, 100_000)), float(rng.uniform(-10, 30)), float(rng.uniform(-5, 20)),
+         float(rng.uniform(8, 15)), float(rng.uniform(0, 4)), float(rng.uniform(10, 10_000)),
+         float(rng.uniform(-5, 5)))
+        for _ in range(20_000)
+    ]
+
+    loop_us = time_per_call(dcf_valuation_iterative, scalar_inputs) * 1e6
+    closed_us = time_per_call(dcf_valuation_advanced, scalar_inputs) * 1e6
+    print(f"Per call:  loop {loop_us:.2f} us, closed form {closed_us:.2f} us "
+          f"({loop_us / closed_us:.1f}x faster)")
+
+    columns = np.array(scalar_inputs).T
+    reps = -(-batch_size // columns.shape[1])
+    columns = np.tile(columns, reps)[:, :batch_size]
+
+    started = time.perf_counter()
+    dcf_valuation_batch(*columns)
+    batch_s = time.perf_counter() - started
+    print(f"Per batch: {batch_size:,} scenarios in {batch_s * 1000:.1f} ms "
+          f"({batch_s / batch_size * 1e9:.0f} ns each, "
+          f"{loop_us * 1e-6 * batch_size / batch_s:.0f}x the scalar loop)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--cases", type=int, default=20_000)
+    parser.add_argument("--batch", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if not check_equivalence(args.cases, args.seed):
+        sys.exit(1)
+    benchmark(args.batch, args.seed)
+
+
+if __name__ == "__main__":
+    main()
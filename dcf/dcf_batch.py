@@ -0,0 +1,73 @@
+"""Vectorized counterpart of dcf_valuation_advanced() for many scenarios at once.
+
+Takes the same inputs as dcf/dcf_default.py's scalar function, but each one may be
+a NumPy array (or anything array-like). Inputs are broadcast against each other,
+so a grid, a Monte Carlo sample or a bulk revaluation is a single call:
+
+    dcf_valuation_batch(fcf, 15, 10, discount_rates[:, None], terminal_rates[None, :], shares)
+
+The model is the same closed form as the scalar function -- two geometric series
+for years 1-5 and 6-10 plus the discounted terminal value -- evaluated over whole
+arrays, so results agree with dcf_valuation_advanced() to floating-point tolerance.
+Where the scalar function raises ValueError (discount rate <= terminal growth
+rate, non-positive shares) or ZeroDivisionError (a -100% share change), the batch
+version returns NaN for that scenario instead, so one bad cell doesn't fail the
+whole batch.
+"""
+
+import numpy as np
+
+from dcf.dcf_default import _geometric_sum_5
+
+
+def dcf_valuation_batch(
+    initial_fcf,
+    growth_rate_1_5,
+    growth_rate_6_10,
+    discount_rate,
+    terminal_growth_rate,
+    shares_outstanding,
+    share_change_rate=0.0,  # Positive for dilution, Negative for buybacks, 0 for no change
+):
+    """
+    Calculates Intrinsic Value per Share for every broadcast combination of inputs.
+
+    Parameters are the same as dcf_valuation_advanced() (rates in percent), each a
+    scalar or an array. Returns a float array of the broadcast shape, with NaN for
+    invalid scenarios.
+    """
+    fcf, g1, g2, r, tg, shares, dilution = np.broadcast_arrays(*(
+        np.asarray(value, dtype=float) for value in (
+            initial_fcf, growth_rate_1_5, growth_rate_6_10, discount_rate,
+            terminal_growth_rate, shares_outstanding, share_change_rate,
+        )
+    ))
+
+    # --- 1. Input Conversion & Validation ---
+    g1 = g1 / 100
+    g2 = g2 / 100
+    r = r / 100
+    tg = tg / 100
+    dilution = dilution / 100
+
+    valid = (r > tg) & (shares > 0)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # --- 2. Per-Year Ratios (see dcf_valuation_advanced) ---
+        fcf_per_share = fcf / shares
+        per_share_discount = (1 + dilution) * (1 + r)
+        q_1_5 = (1 + g1) / per_share_discount
+        q_6_10 = (1 + g2) / per_share_discount
+
+        year_5_factor = q_1_5 ** 5
+        year_10_factor = year_5_factor * q_6_10 ** 5
+
+        # --- 3. Years 1-10 ---
+        total = fcf_per_share * (_geometric_sum_5(q_1_5) + year_5_factor * _geometric_sum_5(q_6_10))
+
+        # --- 4. Terminal Value, discounted to today ---
+        total = total + fcf_per_share * year_10_factor * (1 + tg) / (r - tg)
+
+    # A -100% share change leaves no shares, which the scalar model can't value either.
+    valid &= np.isfinite(total)
+    return np.where(valid, total, np.nan)
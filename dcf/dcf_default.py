@@ -1,4 +1,11 @@
 # Simple 2-stage DCF calculator with Share Dilution/Buyback logic
+def _geometric_sum_5(q):
+    """q + q^2 + q^3 + q^4 + q^5, in nested (Horner) form: exact at q == 1 and for
+    negative q, where the textbook q * (q^5 - 1) / (q - 1) divides by zero or
+    loses precision."""
+    return q * (1 + q * (1 + q * (1 + q * (1 + q))))
+
+
 def dcf_valuation_advanced(
     initial_fcf, 
     growth_rate_1_5, 
@@ -11,6 +18,72 @@ def dcf_valuation_advanced(
     """
     Calculates Intrinsic Value per Share accounting for changing share counts.
     
+    Parameters:
+    - share_change_rate: Annual % change in share count (e.g., 2.0 for 2% dilution, -2.0 for 2% buyback, 0 for no change)
+
+    Closed-form evaluation of the same model as dcf_valuation_iterative() in
+    dcf/dcf_default.py, the original year-by-year loop.
+    """
+
+    # --- 1. Input Conversion & Validation ---
+    # Convert percentage inputs to decimals
+    growth_rate_1_5 /= 100
+    growth_rate_6_10 /= 100
+    discount_rate /= 100
+    terminal_growth_rate /= 100
+    share_change_rate /= 100 
+
+    if discount_rate <= terminal_growth_rate:
+        raise ValueError("Discount rate must be greater than terminal growth rate.")
+
+    if shares_outstanding <= 0:
+        raise ValueError("Shares outstanding must be a positive number.")
+
+    # --- 2. Per-Year Ratios ---
+    # Each year FCF grows by (1 + g), the share count by (1 + dilution) and the
+    # discount factor by (1 + r), so the discounted FCF per share is multiplied by
+    # q = (1 + g) / ((1 + dilution) * (1 + r)) every year. Years 1-5 and 6-10 are
+    # therefore two geometric series, which replaces the 10-year projection loop.
+    fcf_per_share = initial_fcf / shares_outstanding
+    per_share_discount = (1 + share_change_rate) * (1 + discount_rate)
+    q_1_5 = (1 + growth_rate_1_5) / per_share_discount
+    q_6_10 = (1 + growth_rate_6_10) / per_share_discount
+
+    # Discounted FCF per share at the end of year 5, relative to today
+    year_5_factor = q_1_5 ** 5
+    year_10_factor = year_5_factor * q_6_10 ** 5
+
+    # --- 3. Years 1-10 ---
+    discounted_fcf_per_share = fcf_per_share * (
+        _geometric_sum_5(q_1_5) + year_5_factor * _geometric_sum_5(q_6_10)
+    )
+
+    # --- 4. Terminal Value Calculation ---
+    # Year 10 FCF per share (on the Year 10 share count), discounted to today, grown
+    # into a Gordon growth perpetuity: (FCF_Year_10 * (1 + g)) / (r - g)
+    discounted_terminal_value_per_share = (
+        fcf_per_share * year_10_factor * (1 + terminal_growth_rate)
+        / (discount_rate - terminal_growth_rate)
+    )
+
+    # --- 5. Final Summation ---
+    return discounted_fcf_per_share + discounted_terminal_value_per_share
+
+
+# Reference implementation: the original year-by-year projection. Kept to check the
+# closed form against (see dcf/benchmark_dcf.py); both services use the function above.
+def dcf_valuation_iterative(
+    initial_fcf, 
+    growth_rate_1_5, 
+    growth_rate_6_10, 
+    discount_rate, 
+    terminal_growth_rate, 
+    shares_outstanding, 
+    share_change_rate=0.0  # Positive for dilution, Negative for buybacks, 0 for no change
+):
+    """
+    Calculates Intrinsic Value per Share accounting for changing share counts.
+    
     Parameters:
     - share_change_rate: Annual % change in share count (e.g., 2.0 for 2% dilution, -2.0 for 2% buyback, 0 for no change)
     """
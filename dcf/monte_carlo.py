@@ -0,0 +1,155 @@
+"""Monte Carlo simulation of the DCF model.
+
+Pure logic module with no Flask imports. Each simulated input gets a distribution
+(normal, uniform or triangular); every draw is a full dcf_valuation_advanced()
+scenario, valued in vectorized batches with dcf_valuation_batch(). Very large runs
+can optionally be split across a process pool, with one independent random stream
+per chunk, so a run is reproducible for a given seed and process count.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from dcf.dcf_batch import dcf_valuation_batch
+from dcf.sensitivity import PARAMETERS
+
+DISTRIBUTIONS = ("normal", "uniform", "triangular")
+
+# Draws valued per dcf_valuation_batch() call -- big enough to amortise NumPy's
+# per-call overhead, small enough that a chunk's temporaries stay in the tens of MB.
+BATCH_SIZE = 250_000
+
+MAX_DRAWS = 2_000_000
+
+# Below this many draws a process pool costs more to start than it saves.
+PROCESS_POOL_MIN_DRAWS = 500_000
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def validate_distribution(name, spec):
+    """Check one distribution spec, raising ValueError with a readable message.
+
+    Specs look like {"dist": "normal", "mean": 10, "std": 2},
+    {"dist": "uniform", "low": 8, "high": 12} or
+    {"dist": "triangular", "low": 8, "mode": 10, "high": 14}.
+    """
+    dist = spec.get("dist")
+    if dist not in DISTRIBUTIONS:
+        raise ValueError(f"{name}: dist must be one of {', '.join(DISTRIBUTIONS)}.")
+
+    required = {"normal": ("mean", "std"), "uniform": ("low", "high"),
+                "triangular": ("low", "mode", "high")}[dist]
+    try:
+        values = {key: float(spec[key]) for key in required}
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"{name}: {dist} needs numeric {', '.join(required)}.")
+
+    if dist == "normal" and values["std"] < 0:
+        raise ValueError(f"{name}: std must not be negative.")
+    if dist == "uniform" and values["low"] > values["high"]:
+        raise ValueError(f"{name}: low must not exceed high.")
+    if dist == "triangular" and not values["low"] <= values["mode"] <= values["high"]:
+        raise ValueError(f"{name}: needs low <= mode <= high.")
+    return {"dist": dist, **values}
+
+
+def _draw(rng, spec, size):
+    if spec["dist"] == "normal":
+        return rng.normal(spec["mean"], spec["std"], size)
+    if spec["dist"] == "uniform":
+        return rng.uniform(spec["low"], spec["high"], size)
+    if spec["low"] == spec["high"]:
+        # numpy's triangular rejects a zero-width range
+        return np.full(size, spec["low"])
+    return rng.triangular(spec["low"], spec["mode"], spec["high"], size)
+
+
+def _simulate_chunk(base, distributions, draws, seed_sequence):
+    """Value `draws` scenarios with their own random stream. Runs in a worker
+    process for parallel runs, so it only takes picklable arguments."""
+    rng = np.random.default_rng(seed_sequence)
+    values = np.empty(draws)
+    for start in range(0, draws, BATCH_SIZE):
+        size = min(BATCH_SIZE, draws - start)
+        inputs = dict(base)
+        for name, spec in distributions.items():
+            inputs[name] = _draw(rng, spec, size)
+        values[start:start + size] = dcf_valuation_batch(**inputs)
+    return values
+
+
+def run_simulation(base, distributions, draws=100_000, current_price=None,
+                   seed=None, bins=40, processes=1):
+    """Simulate the intrinsic value distribution.
+
+    Parameters:
+    - base: dict of dcf_valuation_advanced() arguments; inputs without a
+      distribution stay fixed at these values
+    - distributions: {argument name: distribution spec}
+    - draws: number of scenarios (up to MAX_DRAWS)
+    - current_price: optional market price for the probability of upside
+    - seed: optional integer for reproducible runs
+    - bins: histogram bin count
+    - processes: worker processes for runs of PROCESS_POOL_MIN_DRAWS or more
+
+    Scenarios the model can't value (a draw with discount rate <= terminal growth)
+    are dropped and counted in "invalid_draws".
+    """
+    try:
+        draws = int(draws)
+    except (TypeError, ValueError):
+        raise ValueError("draws must be a whole number.")
+    if not 1 <= draws <= MAX_DRAWS:
+        raise ValueError(f"draws must be between 1 and {MAX_DRAWS:,}.")
+    for name in distributions:
+        if name not in PARAMETERS:
+            raise ValueError(f"Unknown input {name!r}; expected one of {', '.join(PARAMETERS)}.")
+    distributions = {name: validate_distribution(name, spec) for name, spec in distributions.items()}
+    base = {name: float(base[name]) for name in PARAMETERS}
+
+    processes = max(1, min(int(processes or 1), os.cpu_count() or 1))
+    chunks = processes if draws >= PROCESS_POOL_MIN_DRAWS else 1
+    chunk_sizes = [draws // chunks + (1 if i < draws % chunks else 0) for i in range(chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(chunks)
+
+    if chunks == 1:
+        values = _simulate_chunk(base, distributions, draws, seeds[0])
+    else:
+        with ProcessPoolExecutor(max_workers=chunks) as pool:
+            parts = pool.map(_simulate_chunk, [base] * chunks, [distributions] * chunks, chunk_sizes, seeds)
+            values = np.concatenate(list(parts))
+
+    valid = values[np.isfinite(values)]
+    result = {
+        "draws": draws,
+        "valid_draws": int(valid.size),
+        "invalid_draws": int(draws - valid.size),
+        "processes": chunks,
+    }
+    if valid.size == 0:
+        result.update({"percentiles": None, "mean": None, "probability_above_price": None,
+                       "histogram": None})
+        return result
+
+    result["percentiles"] = {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(valid, PERCENTILES))}
+    result["mean"] = float(valid.mean())
+    result["probability_above_price"] = (
+        float(np.mean(valid > current_price)) if current_price else None
+    )
+
+    # Bin the central 99% so a few extreme draws don't flatten the whole chart;
+    # the tails are reported as counts instead.
+    low, high = np.percentile(valid, [0.5, 99.5])
+    if low == high:
+        high = low + 1e-9
+    counts, edges = np.histogram(valid, bins=int(bins), range=(low, high))
+    result["histogram"] = {
+        "edges": edges.tolist(),
+        "counts": counts.tolist(),
+        "below": int(np.sum(valid < low)),
+        "above": int(np.sum(valid > high)),
+    }
+    return result
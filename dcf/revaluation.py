@@ -0,0 +1,49 @@
+"""Margin of safety for many saved DCF analyses against current prices.
+
+Pure logic module with no Flask imports. app.py loads the latest analysis per
+ticker together with its quote snapshot; this module converts every price into
+the currency the analysis was made in and computes upside/downside for all rows
+in one vectorized pass, then orders them best upside first.
+
+Currency conversion works as in quotes/alerts.py: one EUR factor per distinct
+currency, so the cost doesn't grow with the number of tickers.
+"""
+
+import numpy as np
+
+from quotes.alerts import eur_factors
+from quotes.fx_rates import currency_code
+
+
+def revalue(intrinsic_values, prices, quote_currencies, value_symbols, rates):
+    """Return (prices, upside, order) arrays for a set of analyses.
+
+    Parameters:
+    - intrinsic_values: intrinsic value per share of each analysis
+    - prices: current prices (NaN where no quote is stored)
+    - quote_currencies: ISO codes the prices are quoted in (None if unknown)
+    - value_symbols: analysis currency symbols, e.g. '$' or '€'
+    - rates: OpenExchangeRates table ({code: units per USD}), may be None
+
+    `prices` in the result are converted to each analysis's currency, `upside` is
+    (intrinsic value - price) / price in percent, and `order` sorts the rows by
+    upside, highest first. Rows without a price or a usable exchange rate get NaN
+    and sort last.
+    """
+    intrinsic_values = np.asarray(intrinsic_values, dtype=float)
+    prices = np.asarray(prices, dtype=float)
+    value_codes = np.array([currency_code(symbol) for symbol in value_symbols], dtype=object)
+    quote_codes = np.asarray(quote_currencies, dtype=object)
+
+    # A quote with no reported currency is taken to be in the analysis currency,
+    # as the DCF page's own margin of safety does.
+    quote_codes = np.where(np.equal(quote_codes, None), value_codes, quote_codes)
+    same = quote_codes == value_codes
+    with np.errstate(invalid="ignore", divide="ignore"):
+        factor = np.where(same, 1.0, eur_factors(quote_codes, rates) / eur_factors(value_codes, rates))
+        prices = prices * factor
+        upside = np.where(prices > 0, (intrinsic_values - prices) / prices * 100, np.nan)
+
+    # Negating keeps NaN last, and a stable sort keeps ties in input order
+    order = np.argsort(-upside, kind="stable")
+    return prices, upside, order
@@ -0,0 +1,191 @@
+"""Reverse DCF: the growth or discount rate implied by a market price.
+
+Pure logic module with no Flask imports. Instead of valuing a stock from its
+inputs, dcf_valuation_advanced() is solved backwards: every input but one is held
+fixed, and we find the stage-1 growth rate (or the discount rate) at which the
+intrinsic value per share equals the market price.
+
+Over the brackets below the value is monotonic in either rate, so a safeguarded
+Newton iteration converges in a handful of evaluations: Newton steps use the
+analytic derivative of the closed-form model, and any step that would leave the
+current bracket is replaced by a bisection. implied_rate() solves one scenario in
+plain Python; implied_rates_batch() runs the same iteration over NumPy arrays, so
+many tickers are solved at once.
+"""
+
+import numpy as np
+
+from dcf.dcf_default import _geometric_sum_5
+
+# Inputs that can be solved for, and the bracket searched, in percent. The discount
+# rate bracket is an offset above the terminal growth rate, where the model is defined.
+SOLVABLE = {
+    "growth_rate_1_5": (-99.0, 500.0),
+    "discount_rate": (0.01, 100.0),
+}
+
+LABELS = {
+    "growth_rate_1_5": "growth rate (1-5 yrs)",
+    "discount_rate": "discount rate",
+}
+
+MAX_ITERATIONS = 60
+RATE_TOLERANCE = 1e-9  # percentage points
+PRICE_TOLERANCE = 1e-10  # relative to the market price
+
+
+def _geometric_slope_5(q):
+    """Derivative of _geometric_sum_5: 1 + 2q + 3q^2 + 4q^3 + 5q^4."""
+    return 1 + q * (2 + q * (3 + q * (4 + 5 * q)))
+
+
+def _value_and_slope(solve_for, x, inputs):
+    """Intrinsic value with `solve_for` set to x, and its derivative per percentage
+    point of x. Plain arithmetic, so it works on floats and NumPy arrays alike."""
+    fcf_per_share = inputs["initial_fcf"] / inputs["shares_outstanding"]
+    g1 = (x if solve_for == "growth_rate_1_5" else inputs["growth_rate_1_5"]) / 100
+    g2 = inputs["growth_rate_6_10"] / 100
+    r = (x if solve_for == "discount_rate" else inputs["discount_rate"]) / 100
+    tg = inputs["terminal_growth_rate"] / 100
+    dilution = inputs["share_change_rate"] / 100
+
+    # Same closed form as dcf_valuation_advanced(), regrouped as
+    # FCF/share * (S(q1) + q1^5 * tail), tail being years 6-10 plus terminal value.
+    per_share_discount = (1 + dilution) * (1 + r)
+    q1 = (1 + g1) / per_share_discount
+    q2 = (1 + g2) / per_share_discount
+    terminal = (1 + tg) / (r - tg)
+    q1_4 = q1 ** 4
+    q2_4 = q2 ** 4
+    tail = _geometric_sum_5(q2) + q2_4 * q2 * terminal
+    value = fcf_per_share * (_geometric_sum_5(q1) + q1_4 * q1 * tail)
+
+    d_value_d_q1 = _geometric_slope_5(q1) + 5 * q1_4 * tail
+    if solve_for == "growth_rate_1_5":
+        slope = fcf_per_share * d_value_d_q1 / per_share_discount
+    else:
+        # Both ratios scale with 1 / (1 + r); the terminal multiple with 1 / (r - tg)
+        dq1 = -q1 / (1 + r)
+        dq2 = -q2 / (1 + r)
+        d_tail = (_geometric_slope_5(q2) + 5 * q2_4 * terminal) * dq2 - q2_4 * q2 * terminal / (r - tg)
+        slope = fcf_per_share * (d_value_d_q1 * dq1 + q1_4 * q1 * d_tail)
+    return value, slope / 100
+
+
+def _bracket(solve_for, inputs):
+    low, high = SOLVABLE[solve_for]
+    if solve_for == "discount_rate":
+        tg = inputs["terminal_growth_rate"]
+        return tg + low, tg + high
+    return low, high
+
+
+def implied_rate(market_price, solve_for, inputs):
+    """The value of `solve_for` (in percent) at which the model values one share at
+    `market_price`.
+
+    Parameters:
+    - market_price: current price per share, in the same currency as the FCF
+    - solve_for: "growth_rate_1_5" or "discount_rate"
+    - inputs: dict of dcf_valuation_advanced() arguments; the current value of
+      `solve_for` is only used as the starting guess
+
+    Raises ValueError for invalid inputs, or when no rate inside the bracket
+    reproduces the price (e.g. a negative FCF can never be worth a positive price).
+    """
+    if solve_for not in SOLVABLE:
+        raise ValueError(f"Can only solve for: {', '.join(SOLVABLE)}.")
+    if not market_price > 0:
+        raise ValueError("Market price must be a positive number.")
+    if inputs["shares_outstanding"] <= 0:
+        raise ValueError("Shares outstanding must be a positive number.")
+    if inputs["share_change_rate"] <= -100:
+        raise ValueError("Share change must be greater than -100%.")
+    if solve_for == "growth_rate_1_5" and inputs["discount_rate"] <= inputs["terminal_growth_rate"]:
+        raise ValueError("Discount rate must be greater than terminal growth rate.")
+
+    low, high = _bracket(solve_for, inputs)
+    f_low = _value_and_slope(solve_for, low, inputs)[0] - market_price
+    f_high = _value_and_slope(solve_for, high, inputs)[0] - market_price
+    if f_low * f_high > 0:
+        raise ValueError(
+            f"No {LABELS[solve_for]} between {low:.2f}% and {high:.2f}% "
+            f"values the stock at {market_price:.2f}."
+        )
+    rising = f_high > f_low
+
+    x = inputs[solve_for]
+    if not low < x < high:
+        x = (low + high) / 2
+
+    for _ in range(MAX_ITERATIONS):
+        value, slope = _value_and_slope(solve_for, x, inputs)
+        f = value - market_price
+        if abs(f) <= PRICE_TOLERANCE * market_price:
+            break
+
+        # Shrink the bracket around the root, then try a Newton step inside it
+        if (f < 0) == rising:
+            low = x
+        else:
+            high = x
+        step = x - f / slope if slope else low
+        if not low < step < high:
+            step = (low + high) / 2
+
+        converged = abs(step - x) <= RATE_TOLERANCE
+        x = step
+        if converged:
+            break
+    return x
+
+
+def implied_rates_batch(market_prices, solve_for, inputs):
+    """Vectorized implied_rate(): solve many scenarios at once.
+
+    `market_prices` and every value in `inputs` may be scalars or arrays; they are
+    broadcast against each other. Returns a float array of implied rates, with NaN
+    where implied_rate() would raise.
+    """
+    if solve_for not in SOLVABLE:
+        raise ValueError(f"Can only solve for: {', '.join(SOLVABLE)}.")
+
+    names = list(inputs)
+    price, *values = np.broadcast_arrays(*(
+        np.asarray(value, dtype=float) for value in [market_prices, *inputs.values()]
+    ))
+    arrays = dict(zip(names, values))
+
+    valid = (price > 0) & (arrays["shares_outstanding"] > 0) & (arrays["share_change_rate"] > -100)
+    if solve_for == "growth_rate_1_5":
+        valid &= arrays["discount_rate"] > arrays["terminal_growth_rate"]
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        low, high = (np.broadcast_to(bound, price.shape) for bound in _bracket(solve_for, arrays))
+        f_low = _value_and_slope(solve_for, low, arrays)[0] - price
+        f_high = _value_and_slope(solve_for, high, arrays)[0] - price
+        valid &= f_low * f_high <= 0
+        rising = f_high > f_low
+
+        start = arrays[solve_for]
+        x = np.where((start > low) & (start < high), start, (low + high) / 2)
+        active = valid.copy()
+
+        for _ in range(MAX_ITERATIONS):
+            if not active.any():
+                break
+            value, slope = _value_and_slope(solve_for, x, arrays)
+            f = value - price
+            active &= ~(np.abs(f) <= PRICE_TOLERANCE * price)
+
+            move_low = active & ((f < 0) == rising)
+            low = np.where(move_low, x, low)
+            high = np.where(active & ~move_low, x, high)
+            step = x - f / slope
+            step = np.where((step > low) & (step < high), step, (low + high) / 2)
+
+            converged = np.abs(step - x) <= RATE_TOLERANCE
+            x = np.where(active, step, x)
+            active &= ~converged
+
+    return np.where(valid, x, np.nan)
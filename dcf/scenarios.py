@@ -0,0 +1,78 @@
+"""Probability-weighted DCF over several named scenarios (e.g. bear/base/bull).
+
+Pure logic module with no Flask imports. Each scenario is a full set of
+dcf_valuation_advanced() inputs with an optional probability; all scenarios are
+valued in one dcf_valuation_batch() call and combined into a probability-weighted
+intrinsic value.
+"""
+
+import math
+
+import numpy as np
+
+from dcf.dcf_batch import dcf_valuation_batch
+from dcf.sensitivity import PARAMETERS
+
+MAX_SCENARIOS = 10
+
+# Slack allowed when probabilities are checked to add up to 1
+PROBABILITY_TOLERANCE = 1e-6
+
+
+def resolve_probabilities(probabilities):
+    """Fill in missing probabilities and check the result adds up to 1.
+
+    `probabilities` has one entry per scenario, each a number between 0 and 1 or
+    None. Whatever probability the given entries leave over is split equally over
+    the None entries, so no probabilities at all means equal weights.
+    """
+    given = [p for p in probabilities if p is not None]
+    for p in given:
+        if not 0 <= p <= 1:
+            raise ValueError("Probabilities must be between 0 and 1.")
+
+    remainder = 1 - sum(given)
+    missing = len(probabilities) - len(given)
+    if remainder < -PROBABILITY_TOLERANCE or (missing == 0 and abs(remainder) > PROBABILITY_TOLERANCE):
+        raise ValueError(f"Scenario probabilities add up to {sum(given):g}, not 1.")
+
+    fill = max(remainder, 0.0) / missing if missing else 0.0
+    return [fill if p is None else p for p in probabilities]
+
+
+def evaluate_scenarios(scenarios):
+    """Value every scenario in one batch and weight the results.
+
+    Parameters:
+    - scenarios: list of {"name", "probability" (or None), "inputs"}, where inputs
+      is a dict of dcf_valuation_advanced() arguments
+
+    Returns {"scenarios": [{"name", "probability", "intrinsic_value"}, ...],
+    "weighted_value"}. Raises ValueError naming the first scenario the model can't
+    value (e.g. discount rate <= terminal growth rate).
+    """
+    if not 1 <= len(scenarios) <= MAX_SCENARIOS:
+        raise ValueError(f"Provide between 1 and {MAX_SCENARIOS} scenarios.")
+    names = [scenario["name"] for scenario in scenarios]
+    if len(set(names)) != len(names):
+        raise ValueError("Scenario names must be unique.")
+
+    probabilities = resolve_probabilities([scenario.get("probability") for scenario in scenarios])
+    values = dcf_valuation_batch(**{
+        name: [scenario["inputs"][name] for scenario in scenarios] for name in PARAMETERS
+    })
+
+    for scenario, value in zip(scenarios, values.tolist()):
+        if math.isnan(value):
+            raise ValueError(
+                f"Scenario {scenario['name']!r}: discount rate must be greater than terminal "
+                "growth rate, shares outstanding positive and share change above -100%."
+            )
+
+    return {
+        "scenarios": [
+            {"name": name, "probability": probability, "intrinsic_value": value}
+            for name, probability, value in zip(names, probabilities, values.tolist())
+        ],
+        "weighted_value": float(np.dot(probabilities, values)),
+    }
@@ -0,0 +1,63 @@
+"""Two-way DCF sensitivity grids, evaluated in one vectorized call.
+
+Pure logic module with no Flask imports. Any two inputs of dcf_valuation_advanced()
+can be used as the axes; the x values are laid out along columns and the y values
+along rows, and the whole grid is one broadcast dcf_valuation_batch() call.
+"""
+
+import numpy as np
+
+from dcf.dcf_batch import dcf_valuation_batch
+
+# dcf_valuation_advanced() argument names, in order
+PARAMETERS = (
+    "initial_fcf",
+    "growth_rate_1_5",
+    "growth_rate_6_10",
+    "discount_rate",
+    "terminal_growth_rate",
+    "shares_outstanding",
+    "share_change_rate",
+)
+
+# Largest number of points allowed on one axis (101 x 101 is ~10k cells)
+MAX_AXIS_POINTS = 101
+
+
+def sensitivity_grid(base, x_param, x_values, y_param, y_values):
+    """Intrinsic value for every (y, x) combination, with the other inputs at `base`.
+
+    Parameters:
+    - base: dict of dcf_valuation_advanced() arguments
+    - x_param / y_param: names from PARAMETERS; must differ
+    - x_values / y_values: 1-D sequences of values for each axis
+
+    Returns a (len(y_values), len(x_values)) array. Cells the model can't value --
+    e.g. discount rate <= terminal growth -- are NaN.
+    """
+    if x_param not in PARAMETERS or y_param not in PARAMETERS:
+        raise ValueError(f"Axes must be two of: {', '.join(PARAMETERS)}.")
+    if x_param == y_param:
+        raise ValueError("The two axes must be different inputs.")
+
+    x_values = np.asarray(x_values, dtype=float)
+    y_values = np.asarray(y_values, dtype=float)
+    for name, values in ((x_param, x_values), (y_param, y_values)):
+        if values.ndim != 1 or not 1 <= values.size <= MAX_AXIS_POINTS:
+            raise ValueError(f"{name} needs between 1 and {MAX_AXIS_POINTS} values.")
+        if not np.all(np.isfinite(values)):
+            raise ValueError(f"{name} values must be finite numbers.")
+
+    inputs = {name: base[name] for name in PARAMETERS}
+    inputs[x_param] = x_values[np.newaxis, :]
+    inputs[y_param] = y_values[:, np.newaxis]
+
+    return dcf_valuation_batch(**inputs)
+
+
+def axis_values(start, stop, steps):
+    """Evenly spaced axis values from start to stop inclusive."""
+    steps = int(steps)
+    if not 1 <= steps <= MAX_AXIS_POINTS:
+        raise ValueError(f"steps must be between 1 and {MAX_AXIS_POINTS}.")
+    return np.linspace(float(start), float(stop), steps)
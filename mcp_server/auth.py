@@ -31,10 +31,17 @@ from starlette.requests import Request
 from starlette.responses import HTMLResponse, RedirectResponse, Response
 
 import db
+from token_cache import AccessTokenCache
 
 ACCESS_TOKEN_TTL_SECONDS = 3600
 DEFAULT_SCOPES = ["reports:write", "wishlist:write"]
 
+# Verified access tokens are kept in memory so tool calls skip the token lookup.
+# A token revoked on another replica stops working within the epoch check interval.
+TOKEN_CACHE_TTL_SECONDS = int(os.environ.get("MCP_TOKEN_CACHE_TTL_SECONDS", 300))
+TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get("MCP_TOKEN_CACHE_MAX_ENTRIES", 1000))
+TOKEN_EPOCH_CHECK_SECONDS = float(os.environ.get("MCP_TOKEN_EPOCH_CHECK_SECONDS", 5))
+
 
 class StockDashboardOAuthProvider(OAuthAuthorizationServerProvider[AuthorizationCode, RefreshToken, AccessToken]):
     def __init__(self):
@@ -53,6 +60,21 @@ class StockDashboardOAuthProvider(OAuthAuthorizationServerProvider[Authorization
             token_endpoint_auth_method="client_secret_post",
             scope="reports:write wishlist:write",
         )
+        self._token_cache = AccessTokenCache(
+            ttl=TOKEN_CACHE_TTL_SECONDS,
+            max_entries=TOKEN_CACHE_MAX_ENTRIES,
+            epoch_check_interval=TOKEN_EPOCH_CHECK_SECONDS,
+        )
+
+    def token_cache_stats(self) -> dict:
+        """Size and hit/miss counters of this process's access-token cache."""
+        return self._token_cache.stats()
+
+    async def _delete_token(self, token: str) -> None:
+        epoch = await db.delete_token(token)
+        self._token_cache.discard(token)
+        if epoch is not None:
+            self._token_cache.set_epoch(epoch, own_change=True)
 
     # -- Client lookup -------------------------------------------------
 
@@ -74,7 +96,7 @@ class StockDashboardOAuthProvider(OAuthAuthorizationServerProvider[Authorization
             raise AuthorizeError(error="invalid_request", error_description="Unrecognized redirect_uri.")
 
         state = params.state or secrets.token_urlsafe(24)
-        db.save_login_state(
+        await db.save_login_state(
             state=state,
             client_id=client.client_id,
             redirect_uri=str(params.redirect_uri),
@@ -135,7 +157,7 @@ class StockDashboardOAuthProvider(OAuthAuthorizationServerProvider[Authorization
         if not isinstance(username, str) or not isinstance(password, str) or not isinstance(state, str):
             raise HTTPException(400, "Missing or invalid form fields.")
 
-        pending = db.pop_login_state(state)
+        pending = await db.pop_login_state(state)
         if not pending:
             raise HTTPException(400, "Invalid or expired login session -- please reconnect from Claude.")
 
@@ -146,7 +168,7 @@ class StockDashboardOAuthProvider(OAuthAuthorizationServerProvider[Authorization
             raise HTTPException(401, "Invalid username or password.")
 
         code = f"mcp_{secrets.token_urlsafe(32)}"
-        db.save_auth_code(
+        await db.save_auth_code(
             code=code,
             client_id=pending["client_id"],
             redirect_uri=pending["redirect_uri"],
@@ -164,7 +186,7 @@ class StockDashboardOAuthProvider(OAuthAuthorizationServerProvider[Authorization
     async def load_authorization_code(
         self, client: OAuthClientInformationFull, authorization_code: str
     ) -> AuthorizationCode | None:
-        row = db.load_auth_code(authorization_code)
+        row = await db.load_auth_code(authorization_code)
         if not row or row["client_id"] != client.client_id:
             return None
         return AuthorizationCode(
@@ -183,17 +205,17 @@ class StockDashboardOAuthProvider(OAuthAuthorizationServerProvider[Authorization
         self, client: OAuthClientInformationFull, authorization_code: AuthorizationCode
     ) -> OAuthToken:
         if authorization_code.expires_at < time.time():
-            db.delete_auth_code(authorization_code.code)
+            await db.delete_auth_code(authorization_code.code)
             raise TokenError(error="invalid_grant", error_description="Authorization code expired.")
 
         access_token = f"mcp_at_{secrets.token_urlsafe(32)}"
         refresh_token = f"mcp_rt_{secrets.token_urlsafe(32)}"
 
-        db.save_token(access_token, "access", client.client_id, authorization_code.scopes,
-                      authorization_code.subject, int(time.time()) + ACCESS_TOKEN_TTL_SECONDS)
-        db.save_token(refresh_token, "refresh", client.client_id, authorization_code.scopes,
-                      authorization_code.subject, None)
-        db.delete_auth_code(authorization_code.code)
+        await db.save_token(access_token, "access", client.client_id, authorization_code.scopes,
+                            authorization_code.subject, int(time.time()) + ACCESS_TOKEN_TTL_SECONDS)
+        await db.save_token(refresh_token, "refresh", client.client_id, authorization_code.scopes,
+                            authorization_code.subject, None)
+        await db.delete_auth_code(authorization_code.code)
 
         return OAuthToken(
             access_token=access_token,
@@ -208,7 +230,7 @@ class StockDashboardOAuthProvider(OAuthAuthorizationServerProvider[Authorization
     async def load_refresh_token(
         self, client: OAuthClientInformationFull, refresh_token: str
     ) -> RefreshToken | None:
-        row = db.load_token(refresh_token, "refresh")
+        row = await db.load_token(refresh_token, "refresh")
         if not row or row["client_id"] != client.client_id:
             return None
         return RefreshToken(token=row["token"], client_id=row["client_id"], scopes=row["scopes"], expires_at=None)
@@ -220,16 +242,16 @@ class StockDashboardOAuthProvider(OAuthAuthorizationServerProvider[Authorization
         scopes: list[str],
     ) -> OAuthToken:
         # Rotate both tokens on every refresh.
-        db.delete_token(refresh_token.token)
+        await self._delete_token(refresh_token.token)
 
         new_access = f"mcp_at_{secrets.token_urlsafe(32)}"
         new_refresh = f"mcp_rt_{secrets.token_urlsafe(32)}"
         granted_scopes = scopes or refresh_token.scopes
 
-        db.save_token(new_access, "access", client.client_id, granted_scopes,
-                      refresh_token.subject, int(time.time()) + ACCESS_TOKEN_TTL_SECONDS)
-        db.save_token(new_refresh, "refresh", client.client_id, granted_scopes,
-                      refresh_token.subject, None)
+        await db.save_token(new_access, "access", client.client_id, granted_scopes,
+                            refresh_token.subject, int(time.time()) + ACCESS_TOKEN_TTL_SECONDS)
+        await db.save_token(new_refresh, "refresh", client.client_id, granted_scopes,
+                            refresh_token.subject, None)
 
         return OAuthToken(
             access_token=new_access,
@@ -242,17 +264,27 @@ class StockDashboardOAuthProvider(OAuthAuthorizationServerProvider[Authorization
     # -- Bearer token verification (gates every MCP tool call) ------------
 
     async def load_access_token(self, token: str) -> AccessToken | None:
-        row = db.load_token(token, "access")
+        cache = self._token_cache
+        if cache.epoch_due():
+            cache.set_epoch(await db.token_epoch())
+        access_token = cache.get(token)
+        if access_token is not None:
+            return access_token
+
+        epoch = cache.epoch
+        row = await db.load_token(token, "access")
         if not row:
             return None
-        return AccessToken(
+        access_token = AccessToken(
             token=row["token"],
             client_id=row["client_id"],
             scopes=row["scopes"],
             expires_at=int(row["expires_at"]) if row["expires_at"] else None,
             subject=row["subject"],
         )
+        cache.put(access_token, epoch)
+        return access_token
 
     async def revoke_token(self, token, token_type_hint: str | None = None) -> None:
         token_value = token.token if hasattr(token, "token") else token
-        db.delete_token(token_value)
+        await self._delete_token(token_value)
@@ -2,43 +2,85 @@
 
 Shares the same Postgres database as the main Flask app (same DATABASE_URL) using
 plain SQLAlchemy -- there's no Flask app in this service, so Flask-SQLAlchemy isn't
-usable here. `DCFAnalysis`, `Report` and `Wishlist` below are a structural mirror of the models in
+usable here. Every helper is a coroutine on SQLAlchemy's asyncio extension
+(asyncpg for Postgres, aiosqlite locally), so tool calls wait on the database
+without tying up a thread each; concurrency is bounded by the connection pool
+alone, sized with MCP_DB_POOL_SIZE / MCP_DB_MAX_OVERFLOW.
+
+`DCFAnalysis`, `Report` and `Wishlist` below are a structural mirror of the models in
 ../app.py (same table/column names). This service never creates or migrates those
 tables -- app.py's db.create_all() remains the only owner of that schema. If those
 models ever change in app.py, mirror the change here too.
 """
 
+import asyncio
+import base64
+import json
+import math
 import os
 import time
-from contextlib import contextmanager
-from datetime import datetime
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 
 import bleach
 from bleach.css_sanitizer import CSSSanitizer
-from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, Text, create_engine
+from sqlalchemy import Boolean, Column, DateTime, Float, Index, Integer, String, Text, and_, delete, func, make_url, or_, select, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 
-from dcf_calc import dcf_valuation_advanced
+import report_search
+from dcf_calc import dcf_valuation_advanced, dcf_valuation_batch, implied_rate
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///mcp_local.db")
 
-engine = create_engine(DATABASE_URL, pool_size=2, max_overflow=3, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+# Connections held open, plus extra ones opened under load and closed when
+# returned. Calls beyond both wait up to POOL_TIMEOUT seconds for a connection.
+POOL_SIZE = int(os.environ.get("MCP_DB_POOL_SIZE", 10))
+MAX_OVERFLOW = int(os.environ.get("MCP_DB_MAX_OVERFLOW", 10))
+POOL_TIMEOUT = float(os.environ.get("MCP_DB_POOL_TIMEOUT", 30))
+
+
+def _async_url(database_url: str):
+    """DATABASE_URL with its async driver, plus any connect_args that driver needs.
+
+    Railway hands out postgres:// or postgresql:// URLs for psycopg2. asyncpg takes
+    TLS settings as an `ssl` argument rather than libpq's `sslmode` query param.
+    """
+    url = make_url(database_url)
+    connect_args = {}
+    if url.get_backend_name() in ("postgres", "postgresql"):
+        if "sslmode" in url.query:
+            connect_args["ssl"] = url.query["sslmode"]
+            url = url.difference_update_query(["sslmode"])
+        url = url.set(drivername="postgresql+asyncpg")
+    elif url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url, connect_args
+
+
+_url, _connect_args = _async_url(DATABASE_URL)
+engine = create_async_engine(
+    _url,
+    connect_args=_connect_args,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT,
+    pool_pre_ping=True,
+)
+SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
 Base = declarative_base()
 
 
-@contextmanager
-def session_scope():
-    session = SessionLocal()
-    try:
-        yield session
-        session.commit()
-    except Exception:
-        session.rollback()
-        raise
-    finally:
-        session.close()
+@asynccontextmanager
+async def session_scope():
+    async with SessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
 
 
 # ---------------------------------------------------------------------------
@@ -60,6 +102,12 @@ class DCFAnalysis(Base):
     intrinsic_value = Column(Float, nullable=False)
     currency = Column(String(10), default="$")
     date_created = Column(DateTime, default=datetime.utcnow)
+    market_price = Column(Float)
+
+    __table_args__ = (
+        Index("ix_dcf_analysis_ticker_date_created", "ticker", "date_created"),
+        Index("ix_dcf_analysis_date_created_id", "date_created", "id"),
+    )
 
 
 class Report(Base):
@@ -71,6 +119,11 @@ class Report(Base):
     date = Column(DateTime, nullable=False)
     notes = Column(Text, nullable=False)
     date_created = Column(DateTime, default=datetime.utcnow)
+    excerpt = Column(String(210))
+
+    __table_args__ = (
+        Index("ix_report_date_created_id", "date_created", "id"),
+    )
 
 
 class Wishlist(Base):
@@ -82,6 +135,10 @@ class Wishlist(Base):
     currency = Column(String(10), default="$")
     date_added = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_wishlist_date_added_id", "date_added", "id"),
+    )
+
 # ---------------------------------------------------------------------------
 # End of mirrored models
 # ---------------------------------------------------------------------------
@@ -106,6 +163,10 @@ class OAuthLoginState(Base):
     resource = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_mcp_oauth_login_state_created_at", "created_at"),
+    )
+
 
 class OAuthAuthCode(Base):
     __tablename__ = "mcp_oauth_auth_code"
@@ -120,6 +181,10 @@ class OAuthAuthCode(Base):
     subject = Column(String(200), nullable=True)
     expires_at = Column(Float, nullable=False)
 
+    __table_args__ = (
+        Index("ix_mcp_oauth_auth_code_expires_at", "expires_at"),
+    )
+
 
 class OAuthTokenRecord(Base):
     __tablename__ = "mcp_oauth_token"
@@ -132,19 +197,58 @@ class OAuthTokenRecord(Base):
     expires_at = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Access tokens are swept by expires_at, refresh tokens (no expires_at) by age
+        Index("ix_mcp_oauth_token_expires_at", "expires_at"),
+        Index("ix_mcp_oauth_token_kind_created_at", "token_kind", "created_at"),
+    )
+
+
+class OAuthTokenEpoch(Base):
+    """A single-row counter bumped whenever an access token is deleted.
+
+    Replicas compare it against the value they last saw to know when their
+    in-memory access-token caches (token_cache.py) must be dropped.
+    """
 
-def init_oauth_tables():
+    __tablename__ = "mcp_oauth_token_epoch"
+
+    id = Column(Integer, primary_key=True)
+    epoch = Column(Integer, nullable=False, default=0)
+
+
+OAUTH_TABLES = [
+    OAuthLoginState.__table__,
+    OAuthAuthCode.__table__,
+    OAuthTokenRecord.__table__,
+    OAuthTokenEpoch.__table__,
+]
+
+
+def _create_oauth_tables(connection):
+    Base.metadata.create_all(connection, tables=OAUTH_TABLES)
+    # create_all() skips existing tables, so indexes added later are created here
+    for table in OAUTH_TABLES:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+async def init_oauth_tables():
     """Create only the tables this service owns. Never touches dcf_analysis/report/wishlist."""
-    Base.metadata.create_all(bind=engine, tables=[
-        OAuthLoginState.__table__,
-        OAuthAuthCode.__table__,
-        OAuthTokenRecord.__table__,
-    ])
+    async with engine.begin() as connection:
+        await connection.run_sync(_create_oauth_tables)
+    try:
+        async with session_scope() as session:
+            if await session.get(OAuthTokenEpoch, 1) is None:
+                session.add(OAuthTokenEpoch(id=1, epoch=0))
+    except IntegrityError:
+        pass  # another replica seeded it first
 
 
 # ---------------------------------------------------------------------------
-# HTML sanitization -- copied verbatim from app.py's sanitize_html() so
-# Report.notes gets identical treatment regardless of which service wrote it.
+# HTML sanitization -- copied verbatim from app.py's sanitize_html() and
+# report_excerpt() so Report.notes/excerpt get identical treatment regardless
+# of which service wrote them.
 # ---------------------------------------------------------------------------
 
 def sanitize_html(html_content):
@@ -164,6 +268,17 @@ def sanitize_html(html_content):
     return cleaned_html
 
 
+EXCERPT_LENGTH = 200
+
+
+def report_excerpt(notes_html):
+    """Plain-text preview of sanitized report notes, cut at a word boundary."""
+    text = report_search.plain_text(notes_html)
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    return text[:EXCERPT_LENGTH].rsplit(' ', 1)[0].rstrip(' .,;:') + '…'
+
+
 # ---------------------------------------------------------------------------
 # DCF / Report / Wishlist query helpers used by the MCP tools in server.py.
 # Validation mirrors app.py's calculate_dcf/create_report/add_to_wishlist routes exactly.
@@ -178,25 +293,76 @@ class DuplicateTickerError(Exception):
 
 
 def _as_float(value, field: str) -> float:
+    if isinstance(value, bool):
+        raise ValidationError(f"{field} must be a number.")
     try:
-        return float(value)
+        number = float(value)
     except (TypeError, ValueError):
         raise ValidationError(f"{field} must be a number.")
-
-
-def create_dcf_analysis(ticker: str, free_cash_flow: float, growth_rate_5yr: float,
-                        growth_rate_6_10yr: float, terminal_growth_rate: float,
-                        discount_rate: float, shares_outstanding: float,
-                        share_dilution: float = 0.0, currency: str = "$") -> dict:
-    """Run the DCF model and save the result, exactly as the /calculate-dcf +
-    /save-dcf-analysis pair does in app.py. intrinsic_value is always computed
-    here rather than accepted from the caller, so a saved row can never disagree
-    with the model the DCF page shows."""
-    ticker = (ticker or "").upper().strip()
+    if not math.isfinite(number):
+        raise ValidationError(f"{field} must be a finite number.")
+    return number
+
+
+def _as_text(value, field: str, max_length: int, default: str = "") -> str:
+    """A stripped string field, no longer than its column. Numbers are accepted
+    as their text, so a ticker like 7203 (a Tokyo listing) works unquoted."""
+    if value is None:
+        value = default
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    elif not isinstance(value, str):
+        raise ValidationError(f"{field} must be a string.")
+    value = value.strip()
+    if len(value) > max_length:
+        raise ValidationError(f"{field} must be {max_length} characters or fewer.")
+    return value
+
+
+# Most items a batch tool accepts in one call
+MAX_BATCH_ITEMS = 500
+
+# DCFAnalysis columns -> dcf_valuation_advanced()/dcf_valuation_batch() argument names
+DCF_MODEL_ARGS = {
+    "free_cash_flow": "initial_fcf",
+    "growth_rate_5yr": "growth_rate_1_5",
+    "growth_rate_6_10yr": "growth_rate_6_10",
+    "terminal_growth_rate": "terminal_growth_rate",
+    "discount_rate": "discount_rate",
+    "shares_outstanding": "shares_outstanding",
+    "share_dilution": "share_change_rate",
+}
+
+# Fields of one create_dcf_analyses() item, as in the create_dcf_analysis tool
+DCF_ITEM_FIELDS = ("ticker", *DCF_MODEL_ARGS, "currency")
+
+
+def _check_batch(items) -> None:
+    if not isinstance(items, list) or not items:
+        raise ValidationError("items must be a non-empty list.")
+    if len(items) > MAX_BATCH_ITEMS:
+        raise ValidationError(f"At most {MAX_BATCH_ITEMS} items per call.")
+
+
+def _item_args(item, names) -> dict:
+    """The named fields of one batch item (missing ones as None); other keys are ignored."""
+    if not isinstance(item, dict):
+        raise ValidationError("Each item must be an object.")
+    return {name: item.get(name) for name in names}
+
+
+def _batch_result(results: list[dict]) -> dict:
+    failed = sum(1 for result in results if "error" in result)
+    return {"created": len(results) - failed, "failed": failed, "results": results}
+
+
+def _validate_dcf_inputs(ticker, free_cash_flow, growth_rate_5yr, growth_rate_6_10yr,
+                         terminal_growth_rate, discount_rate, shares_outstanding,
+                         share_dilution=0.0, currency="$") -> dict:
+    """Normalized DCFAnalysis column values, without intrinsic_value."""
+    ticker = _as_text(ticker, "ticker", 10).upper()
     if not ticker:
         raise ValidationError("ticker is required.")
-    if len(ticker) > 10:
-        raise ValidationError("ticker must be 10 characters or fewer.")
 
     free_cash_flow = _as_float(free_cash_flow, "free_cash_flow")
     growth_rate_5yr = _as_float(growth_rate_5yr, "growth_rate_5yr")
@@ -211,163 +377,432 @@ def create_dcf_analysis(ticker: str, free_cash_flow: float, growth_rate_5yr: flo
     if discount_rate <= terminal_growth_rate:
         raise ValidationError("discount_rate must be greater than terminal_growth_rate.")
 
+    return {
+        "ticker": ticker,
+        "free_cash_flow": free_cash_flow,
+        "growth_rate_5yr": growth_rate_5yr,
+        "growth_rate_6_10yr": growth_rate_6_10yr,
+        "terminal_growth_rate": terminal_growth_rate,
+        "discount_rate": discount_rate,
+        "shares_outstanding": shares_outstanding,
+        "share_dilution": share_dilution,
+        "currency": _as_text(currency, "currency", 10) or "$",
+    }
+
+
+DIVISION_BY_ZERO_MESSAGE = "Inputs produce a division by zero -- check the share dilution rate."
+OVERFLOW_MESSAGE = "Inputs produce an intrinsic value too large to represent -- check the growth rates."
+
+
+def _dcf_value(fields) -> float:
+    """Intrinsic value of validated DCFAnalysis fields from the scalar model.
+    Raises ValidationError saying why the inputs can't be valued."""
     try:
-        intrinsic_value = dcf_valuation_advanced(
-            initial_fcf=free_cash_flow,
-            growth_rate_1_5=growth_rate_5yr,
-            growth_rate_6_10=growth_rate_6_10yr,
-            discount_rate=discount_rate,
-            terminal_growth_rate=terminal_growth_rate,
-            shares_outstanding=shares_outstanding,
-            share_change_rate=share_dilution,
+        value = dcf_valuation_advanced(
+            **{arg: fields[column] for column, arg in DCF_MODEL_ARGS.items()}
         )
     except ValueError as e:
         raise ValidationError(str(e))
     except ZeroDivisionError:
-        raise ValidationError("Inputs produce a division by zero -- check the share dilution rate.")
-
-    currency = (currency or "$").strip() or "$"
-
-    with session_scope() as session:
-        analysis = DCFAnalysis(
-            ticker=ticker,
-            free_cash_flow=free_cash_flow,
-            growth_rate_5yr=growth_rate_5yr,
-            growth_rate_6_10yr=growth_rate_6_10yr,
-            terminal_growth_rate=terminal_growth_rate,
-            discount_rate=discount_rate,
-            shares_outstanding=shares_outstanding,
-            share_dilution=share_dilution,
-            intrinsic_value=intrinsic_value,
-            currency=currency,
-        )
+        raise ValidationError(DIVISION_BY_ZERO_MESSAGE)
+    except OverflowError:
+        raise ValidationError(OVERFLOW_MESSAGE)
+    if not math.isfinite(value):
+        raise ValidationError(OVERFLOW_MESSAGE)
+    return value
+
+
+async def create_dcf_analysis(ticker: str, free_cash_flow: float, growth_rate_5yr: float,
+                              growth_rate_6_10yr: float, terminal_growth_rate: float,
+                              discount_rate: float, shares_outstanding: float,
+                              share_dilution: float = 0.0, currency: str = "$") -> dict:
+    """Run the DCF model and save the result, exactly as the /calculate-dcf +
+    /save-dcf-analysis pair does in app.py. intrinsic_value is always computed
+    here rather than accepted from the caller, so a saved row can never disagree
+    with the model the DCF page shows."""
+    fields = _validate_dcf_inputs(ticker, free_cash_flow, growth_rate_5yr, growth_rate_6_10yr,
+                                  terminal_growth_rate, discount_rate, shares_outstanding,
+                                  share_dilution, currency)
+    intrinsic_value = _dcf_value(fields)
+
+    async with session_scope() as session:
+        analysis = DCFAnalysis(**fields, intrinsic_value=intrinsic_value)
         session.add(analysis)
-        session.flush()
+        await session.flush()
         return _dcf_to_dict(analysis)
 
 
-def list_dcf_analyses(ticker: str | None = None, limit: int = 20) -> list[dict]:
+async def create_dcf_analyses(items: list[dict]) -> dict:
+    """create_dcf_analysis() for many items: every item is validated, the valid ones
+    are valued in one dcf_valuation_batch() pass and saved in one transaction.
+
+    Returns {"created", "failed", "results"}, with one result per item in input
+    order: the saved analysis, or {"index", "error"} for an item that was skipped.
+    """
+    _check_batch(items)
+    results = [None] * len(items)
+    valid = []  # (index, fields)
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, _validate_dcf_inputs(**_item_args(item, DCF_ITEM_FIELDS))))
+        except ValidationError as e:
+            results[index] = {"index": index, "error": str(e)}
+
+    if valid:
+        values = dcf_valuation_batch(**{
+            arg: [fields[column] for _, fields in valid] for column, arg in DCF_MODEL_ARGS.items()
+        })
+        analyses = []
+        for (index, fields), value in zip(valid, values.tolist()):
+            if math.isnan(value):
+                # The batch engine marks every invalid row NaN; the scalar model
+                # says which way this one is invalid
+                try:
+                    value = _dcf_value(fields)
+                except ValidationError as e:
+                    results[index] = {"index": index, "error": str(e)}
+                    continue
+            analyses.append((index, DCFAnalysis(**fields, intrinsic_value=value)))
+
+        async with session_scope() as session:
+            session.add_all(analysis for _, analysis in analyses)
+            await session.flush()
+            for index, analysis in analyses:
+                results[index] = {"index": index, **_dcf_to_dict(analysis)}
+
+    return _batch_result(results)
+
+
+def reverse_dcf(market_price: float, free_cash_flow: float, growth_rate_5yr: float,
+                growth_rate_6_10yr: float, terminal_growth_rate: float,
+                discount_rate: float, shares_outstanding: float,
+                share_dilution: float = 0.0, solve_for: str = "growth_rate_5yr") -> dict:
+    """Solve the DCF model backwards for the growth rate (1-5 yrs) or discount rate
+    that values one share at market_price, with every other input held fixed.
+    Nothing is saved."""
+    fields = {"growth_rate_5yr": "growth_rate_1_5", "discount_rate": "discount_rate"}
+    if solve_for not in fields:
+        raise ValidationError(f"solve_for must be one of: {', '.join(fields)}.")
+
+    market_price = _as_float(market_price, "market_price")
+    inputs = {
+        "initial_fcf": _as_float(free_cash_flow, "free_cash_flow"),
+        "growth_rate_1_5": _as_float(growth_rate_5yr, "growth_rate_5yr"),
+        "growth_rate_6_10": _as_float(growth_rate_6_10yr, "growth_rate_6_10yr"),
+        "discount_rate": _as_float(discount_rate, "discount_rate"),
+        "terminal_growth_rate": _as_float(terminal_growth_rate, "terminal_growth_rate"),
+        "shares_outstanding": _as_float(shares_outstanding, "shares_outstanding"),
+        "share_change_rate": _as_float(share_dilution if share_dilution is not None else 0.0, "share_dilution"),
+    }
+
+    try:
+        rate = implied_rate(market_price, fields[solve_for], inputs)
+    except ValueError as e:
+        raise ValidationError(str(e))
+
+    return {
+        "solve_for": solve_for,
+        "implied_rate": round(rate, 4),
+        "market_price": market_price,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Keyset pagination -- KEEP IN SYNC with app.py's encode_cursor/decode_cursor/
+# keyset_page, so a cursor means the same thing in both services.
+# ---------------------------------------------------------------------------
+
+def _encode_cursor(row, created_attr: str = "date_created") -> str:
+    key = json.dumps([getattr(row, created_attr).isoformat(), row.id])
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created), int(row_id)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValidationError("Invalid cursor -- pass back a next_cursor from a previous call.")
+
+
+async def _keyset_page(session, query, model, cursor: str | None, limit: int,
+                       created_attr: str = "date_created") -> tuple[list, str | None]:
+    """One newest-first page on (created_attr, id), starting after `cursor`.
+
+    `query` selects columns (see _select_columns) and must include created_attr
+    and id, which the cursor is built from.
+    """
+    created_column = getattr(model, created_attr)
+    if cursor:
+        created, row_id = _decode_cursor(cursor)
+        query = query.where(or_(
+            created_column < created,
+            and_(created_column == created, model.id < row_id),
+        ))
+    query = query.order_by(created_column.desc(), model.id.desc()).limit(limit + 1)
+    rows = (await session.execute(query)).all()
+    next_cursor = _encode_cursor(rows[limit - 1], created_attr) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+# ---------------------------------------------------------------------------
+# Field projection for the list tools. Every output field is a column of the
+# same name; only the requested ones (plus the cursor's sort key) are SELECTed.
+# ---------------------------------------------------------------------------
+
+def _date(value):
+    return value.strftime("%Y-%m-%d") if value else None
+
+
+def _minute(value):
+    return value.strftime("%Y-%m-%d %H:%M") if value else None
+
+
+# Output field -> formatter, in output order. Fields without one are returned as stored.
+DCF_FIELDS = {
+    "id": None, "ticker": None, "free_cash_flow": None, "growth_rate_5yr": None,
+    "growth_rate_6_10yr": None, "terminal_growth_rate": None, "discount_rate": None,
+    "shares_outstanding": None, "share_dilution": None,
+    "intrinsic_value": lambda value: round(value, 2),
+    "currency": None, "date_created": _minute,
+}
+REPORT_FIELDS = {
+    "id": None, "ticker": None, "title": None, "date": _date, "date_created": _minute, "excerpt": None,
+}
+WISHLIST_FIELDS = {
+    "id": None, "ticker": None, "target_price": None, "currency": None, "date_added": _date,
+}
+
+
+def _projected_fields(fields: list[str] | None, allowed: dict) -> list[str]:
+    """The requested output fields, in `allowed` order; all of them when `fields` is None."""
+    if fields is None:
+        return list(allowed)
+    unknown = [field for field in fields if field not in allowed]
+    if unknown or not fields:
+        raise ValidationError(f"fields must be a non-empty list of: {', '.join(allowed)}.")
+    return [field for field in allowed if field in fields]
+
+
+def _select_columns(model, fields: list[str], created_attr: str = "date_created"):
+    """SELECT of just `fields` plus the keyset columns."""
+    names = dict.fromkeys([*fields, created_attr, "id"])
+    return select(*(getattr(model, name) for name in names))
+
+
+def _project(row, fields: list[str], allowed: dict) -> dict:
+    item = {}
+    for field in fields:
+        value = getattr(row, field)
+        formatter = allowed[field]
+        item[field] = formatter(value) if formatter and value is not None else value
+    return item
+
+
+async def list_dcf_analyses(ticker: str | None = None, limit: int = 20, cursor: str | None = None,
+                            fields: list[str] | None = None) -> dict:
     limit = max(1, min(limit, 100))
-    with session_scope() as session:
-        query = session.query(DCFAnalysis)
+    fields = _projected_fields(fields, DCF_FIELDS)
+    async with session_scope() as session:
+        query = _select_columns(DCFAnalysis, fields)
         if ticker:
-            query = query.filter(DCFAnalysis.ticker == ticker.upper().strip())
-        rows = query.order_by(DCFAnalysis.date_created.desc()).limit(limit).all()
-        return [_dcf_to_dict(row) for row in rows]
+            query = query.where(DCFAnalysis.ticker == ticker.upper().strip())
+        rows, next_cursor = await _keyset_page(session, query, DCFAnalysis, cursor, limit)
+        return {"items": [_project(row, fields, DCF_FIELDS) for row in rows], "next_cursor": next_cursor}
 
 
 def _dcf_to_dict(row: DCFAnalysis) -> dict:
-    return {
-        "id": row.id,
-        "ticker": row.ticker,
-        "free_cash_flow": row.free_cash_flow,
-        "growth_rate_5yr": row.growth_rate_5yr,
-        "growth_rate_6_10yr": row.growth_rate_6_10yr,
-        "terminal_growth_rate": row.terminal_growth_rate,
-        "discount_rate": row.discount_rate,
-        "shares_outstanding": row.shares_outstanding,
-        "share_dilution": row.share_dilution,
-        "intrinsic_value": round(row.intrinsic_value, 2),
-        "currency": row.currency,
-        "date_created": row.date_created.strftime("%Y-%m-%d %H:%M") if row.date_created else None,
-    }
+    return _project(row, list(DCF_FIELDS), DCF_FIELDS)
 
 
-def create_report(ticker: str, title: str, date_str: str, notes: str) -> dict:
-    ticker = (ticker or "").upper().strip()
-    title = (title or "").strip()
+def _validate_report(ticker, title, date, notes) -> dict:
+    """Normalized Report column values, with the notes sanitized and excerpted."""
+    ticker = _as_text(ticker, "ticker", 10).upper()
+    title = _as_text(title, "title", 200)
+    if notes is not None and not isinstance(notes, str):
+        raise ValidationError("notes must be a string.")
     notes = (notes or "").strip()
 
     if not ticker or not title or not notes:
         raise ValidationError("ticker, title, and notes are all required.")
 
     try:
-        report_date = datetime.strptime(date_str, "%Y-%m-%d")
+        report_date = datetime.strptime(date, "%Y-%m-%d")
     except (TypeError, ValueError):
         raise ValidationError("date must be in YYYY-MM-DD format.")
 
     sanitized_notes = sanitize_html(notes)
+    return {"ticker": ticker, "title": title, "date": report_date, "notes": sanitized_notes,
+            "excerpt": report_excerpt(sanitized_notes)}
+
+
+def _report_to_dict(report: Report) -> dict:
+    return {"id": report.id, "ticker": report.ticker, "title": report.title,
+            "date": report.date.strftime("%Y-%m-%d")}
+
+
+async def create_report(ticker: str, title: str, date_str: str, notes: str) -> dict:
+    report = Report(**_validate_report(ticker, title, date_str, notes))
 
-    with session_scope() as session:
-        report = Report(ticker=ticker, title=title, date=report_date, notes=sanitized_notes)
+    async with session_scope() as session:
         session.add(report)
-        session.flush()
-        return {"id": report.id, "ticker": report.ticker, "title": report.title,
-                "date": report.date.strftime("%Y-%m-%d")}
+        await session.flush()
+        # report_search is synchronous code shared with app.py; run_sync drives it
+        # on this session's connection
+        await session.run_sync(report_search.index_report, report.id, report.title, report.notes)
+        return _report_to_dict(report)
+
+
+async def create_reports(items: list[dict]) -> dict:
+    """create_report() for many items, saved and indexed in one transaction.
+
+    Items use the create_report tool's field names (ticker, title, date, notes).
+    Returns {"created", "failed", "results"} like create_dcf_analyses().
+    """
+    _check_batch(items)
+    results = [None] * len(items)
+    reports = []  # (index, Report)
+    for index, item in enumerate(items):
+        try:
+            fields = _validate_report(**_item_args(item, ("ticker", "title", "date", "notes")))
+            reports.append((index, Report(**fields)))
+        except ValidationError as e:
+            results[index] = {"index": index, "error": str(e)}
+
+    if reports:
+        async with session_scope() as session:
+            session.add_all(report for _, report in reports)
+            await session.flush()
+            await session.run_sync(report_search.index_reports, [
+                (report.id, report.title, report.notes) for _, report in reports
+            ])
+            for index, report in reports:
+                results[index] = {"index": index, **_report_to_dict(report)}
+
+    return _batch_result(results)
+
+
+async def search_reports(query: str, limit: int = 10) -> dict:
+    if not (query or "").strip():
+        raise ValidationError("query is required.")
+    limit = max(1, min(limit, report_search.MAX_RESULTS))
+    async with session_scope() as session:
+        results = await session.run_sync(
+            report_search.search, query, limit, highlight=("**", "**"), escape=False
+        )
+    for result in results:
+        result["date"] = result["date"].strftime("%Y-%m-%d")
+    return {"results": results}
 
 
-def list_reports(ticker: str | None = None, limit: int = 20) -> list[dict]:
+async def list_reports(ticker: str | None = None, limit: int = 20, cursor: str | None = None,
+                       fields: list[str] | None = None) -> dict:
     limit = max(1, min(limit, 100))
-    with session_scope() as session:
-        query = session.query(Report)
+    fields = _projected_fields(fields, REPORT_FIELDS)
+    async with session_scope() as session:
+        # notes is never a list field, so report bodies are never read here
+        query = _select_columns(Report, fields)
         if ticker:
-            query = query.filter(Report.ticker == ticker.upper().strip())
-        rows = query.order_by(Report.date_created.desc()).limit(limit).all()
-        return [
-            {
-                "id": r.id,
-                "ticker": r.ticker,
-                "title": r.title,
-                "date": r.date.strftime("%Y-%m-%d"),
-                "date_created": r.date_created.strftime("%Y-%m-%d %H:%M"),
-            }
-            for r in rows
-        ]
-
-
-def add_wishlist_item(ticker: str, target_price: float, currency: str = "$") -> dict:
-    ticker = (ticker or "").upper().strip()
+            query = query.where(Report.ticker == ticker.upper().strip())
+        rows, next_cursor = await _keyset_page(session, query, Report, cursor, limit)
+        return {"items": [_project(row, fields, REPORT_FIELDS) for row in rows], "next_cursor": next_cursor}
+
+
+def _validate_wishlist_item(ticker, target_price, currency="$") -> dict:
+    ticker = _as_text(ticker, "ticker", 10).upper()
     if not ticker:
         raise ValidationError("ticker is required.")
 
-    try:
-        target_price = float(target_price)
-    except (TypeError, ValueError):
-        raise ValidationError("target_price must be a number.")
-
+    target_price = _as_float(target_price, "target_price")
     if not (0 < target_price < 10_000_000):
         raise ValidationError("target_price must be a positive, realistic number.")
 
-    currency = (currency or "$").strip() or "$"
+    currency = _as_text(currency, "currency", 10) or "$"
+    return {"ticker": ticker, "target_price": target_price, "currency": currency}
+
 
-    with session_scope() as session:
-        existing = session.query(Wishlist).filter_by(ticker=ticker).first()
+def _wishlist_to_dict(item: Wishlist) -> dict:
+    return {"id": item.id, "ticker": item.ticker, "target_price": item.target_price,
+            "currency": item.currency}
+
+
+async def add_wishlist_item(ticker: str, target_price: float, currency: str = "$") -> dict:
+    item = Wishlist(**_validate_wishlist_item(ticker, target_price, currency))
+
+    async with session_scope() as session:
+        existing = await session.scalar(select(Wishlist.id).where(Wishlist.ticker == item.ticker))
         if existing:
-            raise DuplicateTickerError(f"{ticker} is already in the wishlist.")
+            raise DuplicateTickerError(f"{item.ticker} is already in the wishlist.")
 
-        item = Wishlist(ticker=ticker, target_price=target_price, currency=currency)
         session.add(item)
         try:
-            session.flush()
+            await session.flush()
         except IntegrityError:
-            session.rollback()
-            raise DuplicateTickerError(f"{ticker} is already in the wishlist.")
-        return {"id": item.id, "ticker": item.ticker, "target_price": item.target_price,
-                "currency": item.currency}
-
-
-def list_wishlist() -> list[dict]:
-    with session_scope() as session:
-        rows = session.query(Wishlist).order_by(Wishlist.date_added.desc()).all()
-        return [
-            {
-                "id": w.id,
-                "ticker": w.ticker,
-                "target_price": w.target_price,
-                "currency": w.currency,
-                "date_added": w.date_added.strftime("%Y-%m-%d"),
-            }
-            for w in rows
-        ]
+            await session.rollback()
+            raise DuplicateTickerError(f"{item.ticker} is already in the wishlist.")
+        return _wishlist_to_dict(item)
+
+
+async def add_wishlist_items(items: list[dict]) -> dict:
+    """add_wishlist_item() for many items, saved in one transaction.
+
+    A ticker already on the wishlist, or repeated within the batch, fails that
+    item only. Returns {"created", "failed", "results"} like create_dcf_analyses().
+    Raises DuplicateTickerError, saving nothing, if another call adds one of the
+    tickers while this one runs.
+    """
+    _check_batch(items)
+    results = [None] * len(items)
+    candidates = {}  # ticker -> (index, Wishlist), first occurrence wins
+    for index, item in enumerate(items):
+        try:
+            fields = _validate_wishlist_item(**_item_args(item, ("ticker", "target_price", "currency")))
+        except ValidationError as e:
+            results[index] = {"index": index, "error": str(e)}
+            continue
+        if fields["ticker"] in candidates:
+            results[index] = {"index": index, "error": f"{fields['ticker']} appears more than once in items."}
+        else:
+            candidates[fields["ticker"]] = (index, Wishlist(**fields))
+
+    if candidates:
+        async with session_scope() as session:
+            existing = set(await session.scalars(
+                select(Wishlist.ticker).where(Wishlist.ticker.in_(list(candidates)))
+            ))
+            for ticker in existing:
+                index, _ = candidates.pop(ticker)
+                results[index] = {"index": index, "error": f"{ticker} is already in the wishlist."}
+
+            session.add_all(item for _, item in candidates.values())
+            try:
+                await session.flush()
+            except IntegrityError:
+                await session.rollback()
+                raise DuplicateTickerError("A ticker in items was added to the wishlist meanwhile; nothing was saved.")
+            for index, item in candidates.values():
+                results[index] = {"index": index, **_wishlist_to_dict(item)}
+
+    return _batch_result(results)
+
+
+async def list_wishlist(limit: int = 50, cursor: str | None = None, fields: list[str] | None = None) -> dict:
+    limit = max(1, min(limit, 100))
+    fields = _projected_fields(fields, WISHLIST_FIELDS)
+    async with session_scope() as session:
+        query = _select_columns(Wishlist, fields, "date_added")
+        rows, next_cursor = await _keyset_page(session, query, Wishlist, cursor, limit, "date_added")
+        return {"items": [_project(row, fields, WISHLIST_FIELDS) for row in rows], "next_cursor": next_cursor}
 
 
 # ---------------------------------------------------------------------------
 # OAuth state helpers
 # ---------------------------------------------------------------------------
 
-def save_login_state(state, client_id, redirect_uri, redirect_uri_provided_explicitly,
-                      code_challenge, scopes, resource):
-    with session_scope() as session:
+async def save_login_state(state, client_id, redirect_uri, redirect_uri_provided_explicitly,
+                           code_challenge, scopes, resource):
+    async with session_scope() as session:
         session.add(OAuthLoginState(
             state=state,
             client_id=client_id,
@@ -379,9 +814,9 @@ def save_login_state(state, client_id, redirect_uri, redirect_uri_provided_expli
         ))
 
 
-def pop_login_state(state):
-    with session_scope() as session:
-        row = session.query(OAuthLoginState).filter_by(state=state).first()
+async def pop_login_state(state):
+    async with session_scope() as session:
+        row = await session.get(OAuthLoginState, state)
         if not row:
             return None
         data = {
@@ -392,13 +827,13 @@ def pop_login_state(state):
             "scopes": row.scopes.split(" ") if row.scopes else [],
             "resource": row.resource,
         }
-        session.delete(row)
+        await session.delete(row)
         return data
 
 
-def save_auth_code(code, client_id, redirect_uri, redirect_uri_provided_explicitly,
-                    code_challenge, scopes, resource, subject, ttl_seconds=300):
-    with session_scope() as session:
+async def save_auth_code(code, client_id, redirect_uri, redirect_uri_provided_explicitly,
+                         code_challenge, scopes, resource, subject, ttl_seconds=300):
+    async with session_scope() as session:
         session.add(OAuthAuthCode(
             code=code,
             client_id=client_id,
@@ -412,9 +847,9 @@ def save_auth_code(code, client_id, redirect_uri, redirect_uri_provided_explicit
         ))
 
 
-def load_auth_code(code):
-    with session_scope() as session:
-        row = session.query(OAuthAuthCode).filter_by(code=code).first()
+async def load_auth_code(code):
+    async with session_scope() as session:
+        row = await session.get(OAuthAuthCode, code)
         if not row:
             return None
         return {
@@ -430,13 +865,13 @@ def load_auth_code(code):
         }
 
 
-def delete_auth_code(code):
-    with session_scope() as session:
-        session.query(OAuthAuthCode).filter_by(code=code).delete()
+async def delete_auth_code(code):
+    async with session_scope() as session:
+        await session.execute(delete(OAuthAuthCode).where(OAuthAuthCode.code == code))
 
 
-def save_token(token, token_kind, client_id, scopes, subject, expires_at):
-    with session_scope() as session:
+async def save_token(token, token_kind, client_id, scopes, subject, expires_at):
+    async with session_scope() as session:
         session.add(OAuthTokenRecord(
             token=token,
             token_kind=token_kind,
@@ -447,13 +882,16 @@ def save_token(token, token_kind, client_id, scopes, subject, expires_at):
         ))
 
 
-def load_token(token, token_kind):
-    with session_scope() as session:
-        row = session.query(OAuthTokenRecord).filter_by(token=token, token_kind=token_kind).first()
-        if not row:
+async def load_token(token, token_kind):
+    async with session_scope() as session:
+        row = await session.get(OAuthTokenRecord, token)
+        if not row or row.token_kind != token_kind:
             return None
-        if row.expires_at and row.expires_at < time.time():
-            session.delete(row)
+        expired = row.expires_at and row.expires_at < time.time()
+        if row.token_kind == "refresh" and row.created_at and row.created_at < _refresh_token_cutoff():
+            expired = True
+        if expired:
+            await session.delete(row)
             return None
         return {
             "token": row.token,
@@ -464,6 +902,91 @@ def load_token(token, token_kind):
         }
 
 
-def delete_token(token):
-    with session_scope() as session:
-        session.query(OAuthTokenRecord).filter_by(token=token).delete()
+async def delete_token(token):
+    """Delete a token. Deleting an access token also bumps the token epoch, in the
+    same transaction; refresh tokens are never in the replicas' caches, so
+    rotating one leaves the epoch alone.
+
+    Returns the new epoch, or None if no access token was deleted.
+    """
+    async with session_scope() as session:
+        token_kind = await session.scalar(
+            delete(OAuthTokenRecord).where(OAuthTokenRecord.token == token).returning(OAuthTokenRecord.token_kind)
+        )
+        if token_kind != "access":
+            return None
+        return await session.scalar(
+            update(OAuthTokenEpoch)
+            .where(OAuthTokenEpoch.id == 1)
+            .values(epoch=OAuthTokenEpoch.epoch + 1)
+            .returning(OAuthTokenEpoch.epoch)
+        )
+
+
+async def token_epoch():
+    async with session_scope() as session:
+        return await session.scalar(select(OAuthTokenEpoch.epoch).where(OAuthTokenEpoch.id == 1))
+
+
+# ---------------------------------------------------------------------------
+# Expiry sweep. Expired rows are otherwise only deleted when presented again,
+# and abandoned logins or never-refreshed tokens never are.
+# ---------------------------------------------------------------------------
+
+# Login states and refresh tokens carry no expires_at, so they are swept by age
+LOGIN_STATE_MAX_AGE_SECONDS = 3600
+REFRESH_TOKEN_MAX_AGE_SECONDS = int(os.environ.get("MCP_REFRESH_TOKEN_MAX_AGE_DAYS", 90)) * 86400
+
+# Rows deleted per transaction, so a large backlog never holds locks for long
+SWEEP_BATCH_SIZE = 500
+
+
+def _refresh_token_cutoff():
+    return datetime.utcnow() - timedelta(seconds=REFRESH_TOKEN_MAX_AGE_SECONDS)
+
+
+async def _delete_in_batches(key, condition, batch_size):
+    deleted = 0
+    while True:
+        async with session_scope() as session:
+            result = await session.execute(
+                delete(key.table).where(key.in_(select(key).where(condition).limit(batch_size)))
+            )
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+        await asyncio.sleep(0)  # let waiting tool calls run between batches
+
+
+async def sweep_expired_oauth_state(batch_size: int = SWEEP_BATCH_SIZE) -> dict:
+    """Delete expired OAuth rows in batches. Returns {table name: rows deleted}.
+
+    Expired access tokens need no token-epoch bump: the access-token cache never
+    serves a token past its expires_at.
+    """
+    now = time.time()
+    login_cutoff = datetime.utcnow() - timedelta(seconds=LOGIN_STATE_MAX_AGE_SECONDS)
+    login_states = await _delete_in_batches(
+        OAuthLoginState.state, OAuthLoginState.created_at < login_cutoff, batch_size
+    )
+    auth_codes = await _delete_in_batches(OAuthAuthCode.code, OAuthAuthCode.expires_at < now, batch_size)
+    tokens = await _delete_in_batches(OAuthTokenRecord.token, OAuthTokenRecord.expires_at < now, batch_size)
+    tokens += await _delete_in_batches(
+        OAuthTokenRecord.token,
+        and_(OAuthTokenRecord.token_kind == "refresh", OAuthTokenRecord.created_at < _refresh_token_cutoff()),
+        batch_size,
+    )
+    return {
+        OAuthLoginState.__tablename__: login_states,
+        OAuthAuthCode.__tablename__: auth_codes,
+        OAuthTokenRecord.__tablename__: tokens,
+    }
+
+
+async def oauth_table_counts() -> dict:
+    """{table name: row count} for the tables the sweep cleans."""
+    async with session_scope() as session:
+        return {
+            model.__tablename__: await session.scalar(select(func.count()).select_from(model))
+            for model in (OAuthLoginState, OAuthAuthCode, OAuthTokenRecord)
+        }
@@ -4,11 +4,27 @@ KEEP IN SYNC WITH ../dcf/dcf_default.py -- this is a verbatim copy of
 dcf_valuation_advanced(). The MCP server is deployed as its own Railway service
 rooted at mcp_server/, so it can't import the main app's `dcf` package; copying
 the function is the same trade-off already made for sanitize_html() in db.py.
+The year-by-year dcf_valuation_iterative() reference stays in dcf_default.py:
+tests/test_dcf.py checks this copy against it.
 
 Both services must produce identical intrinsic values for identical inputs, so
 if the model in ../dcf/dcf_default.py changes, mirror the change here.
+
+dcf_valuation_batch() is a copy of ../dcf/dcf_batch.py's vectorized version, used
+by the batch create tool. The reverse DCF solver at the bottom is likewise a copy
+of implied_rate() and its helpers from ../dcf/reverse_dcf.py (the NumPy batch
+solver is not copied).
 """
 
+import numpy as np
+
+
+def _geometric_sum_5(q):
+    """q + q^2 + q^3 + q^4 + q^5, in nested (Horner) form: exact at q == 1 and for
+    negative q, where the textbook q * (q^5 - 1) / (q - 1) divides by zero or
+    loses precision."""
+    return q * (1 + q * (1 + q * (1 + q * (1 + q))))
+
 
 def dcf_valuation_advanced(
     initial_fcf,
@@ -17,13 +33,16 @@ def dcf_valuation_advanced(
     discount_rate,
     terminal_growth_rate,
     shares_outstanding,
-    share_change_rate=0.0,  # Positive for dilution, Negative for buybacks, 0 for no change
+    share_change_rate=0.0  # Positive for dilution, Negative for buybacks, 0 for no change
 ):
     """
     Calculates Intrinsic Value per Share accounting for changing share counts.
 
     Parameters:
     - share_change_rate: Annual % change in share count (e.g., 2.0 for 2% dilution, -2.0 for 2% buyback, 0 for no change)
+
+    Closed-form evaluation of the same model as dcf_valuation_iterative() in
+    dcf/dcf_default.py, the original year-by-year loop.
     """
 
     # --- 1. Input Conversion & Validation ---
@@ -39,37 +58,213 @@ def dcf_valuation_advanced(
     if shares_outstanding <= 0:
         raise ValueError("Shares outstanding must be a positive number.")
 
-    # --- 2. Projection Loop (Years 1-10) ---
-    discounted_fcf_per_share_values = []
+    # --- 2. Per-Year Ratios ---
+    # Each year FCF grows by (1 + g), the share count by (1 + dilution) and the
+    # discount factor by (1 + r), so the discounted FCF per share is multiplied by
+    # q = (1 + g) / ((1 + dilution) * (1 + r)) every year. Years 1-5 and 6-10 are
+    # therefore two geometric series, which replaces the 10-year projection loop.
+    fcf_per_share = initial_fcf / shares_outstanding
+    per_share_discount = (1 + share_change_rate) * (1 + discount_rate)
+    q_1_5 = (1 + growth_rate_1_5) / per_share_discount
+    q_6_10 = (1 + growth_rate_6_10) / per_share_discount
 
-    current_fcf = initial_fcf
-    current_shares = shares_outstanding
+    # Discounted FCF per share at the end of year 5, relative to today
+    year_5_factor = q_1_5 ** 5
+    year_10_factor = year_5_factor * q_6_10 ** 5
 
-    for year in range(1, 11):
-        # A. Grow the Total Free Cash Flow
-        if year <= 5:
-            current_fcf = current_fcf * (1 + growth_rate_1_5)
-        else:
-            current_fcf = current_fcf * (1 + growth_rate_6_10)
+    # --- 3. Years 1-10 ---
+    discounted_fcf_per_share = fcf_per_share * (
+        _geometric_sum_5(q_1_5) + year_5_factor * _geometric_sum_5(q_6_10)
+    )
+
+    # --- 4. Terminal Value Calculation ---
+    # Year 10 FCF per share (on the Year 10 share count), discounted to today, grown
+    # into a Gordon growth perpetuity: (FCF_Year_10 * (1 + g)) / (r - g)
+    discounted_terminal_value_per_share = (
+        fcf_per_share * year_10_factor * (1 + terminal_growth_rate)
+        / (discount_rate - terminal_growth_rate)
+    )
+
+    # --- 5. Final Summation ---
+    return discounted_fcf_per_share + discounted_terminal_value_per_share
+
+
+# --- Batch DCF (KEEP IN SYNC WITH ../dcf/dcf_batch.py) ---
+# Values many analyses in one vectorized pass; invalid ones come back as NaN.
+
+def dcf_valuation_batch(
+    initial_fcf,
+    growth_rate_1_5,
+    growth_rate_6_10,
+    discount_rate,
+    terminal_growth_rate,
+    shares_outstanding,
+    share_change_rate=0.0,  # Positive for dilution, Negative for buybacks, 0 for no change
+):
+    """
+    Calculates Intrinsic Value per Share for every broadcast combination of inputs.
+
+    Parameters are the same as dcf_valuation_advanced() (rates in percent), each a
+    scalar or an array. Returns a float array of the broadcast shape, with NaN for
+    invalid scenarios.
+    """
+    fcf, g1, g2, r, tg, shares, dilution = np.broadcast_arrays(*(
+        np.asarray(value, dtype=float) for value in (
+            initial_fcf, growth_rate_1_5, growth_rate_6_10, discount_rate,
+            terminal_growth_rate, shares_outstanding, share_change_rate,
+        )
+    ))
+
+    # --- 1. Input Conversion & Validation ---
+    g1 = g1 / 100
+    g2 = g2 / 100
+    r = r / 100
+    tg = tg / 100
+    dilution = dilution / 100
 
-        # B. Adjust Share Count (Compound the dilution/buyback)
-        current_shares = current_shares * (1 + share_change_rate)
+    valid = (r > tg) & (shares > 0)
 
-        # C. Calculate FCF Per Share for this specific year
-        fcf_per_share = current_fcf / current_shares
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # --- 2. Per-Year Ratios (see dcf_valuation_advanced) ---
+        fcf_per_share = fcf / shares
+        per_share_discount = (1 + dilution) * (1 + r)
+        q_1_5 = (1 + g1) / per_share_discount
+        q_6_10 = (1 + g2) / per_share_discount
 
-        # D. Discount this year's FCF/Share to Present Value
-        pv_fcf_per_share = fcf_per_share / ((1 + discount_rate) ** year)
-        discounted_fcf_per_share_values.append(pv_fcf_per_share)
+        year_5_factor = q_1_5 ** 5
+        year_10_factor = year_5_factor * q_6_10 ** 5
 
-    # --- 3. Terminal Value Calculation ---
-    total_terminal_value = (current_fcf * (1 + terminal_growth_rate)) / (discount_rate - terminal_growth_rate)
+        # --- 3. Years 1-10 ---
+        total = fcf_per_share * (_geometric_sum_5(q_1_5) + year_5_factor * _geometric_sum_5(q_6_10))
 
-    terminal_value_per_share = total_terminal_value / current_shares
+        # --- 4. Terminal Value, discounted to today ---
+        total = total + fcf_per_share * year_10_factor * (1 + tg) / (r - tg)
 
-    discounted_terminal_value_per_share = terminal_value_per_share / ((1 + discount_rate) ** 10)
+    # A -100% share change leaves no shares, which the scalar model can't value either.
+    valid &= np.isfinite(total)
+    return np.where(valid, total, np.nan)
 
-    # --- 4. Final Summation ---
-    intrinsic_value_per_share = sum(discounted_fcf_per_share_values) + discounted_terminal_value_per_share
 
-    return intrinsic_value_per_share
+# --- Reverse DCF (KEEP IN SYNC WITH ../dcf/reverse_dcf.py) ---
+
+# Inputs that can be solved for, and the bracket searched, in percent. The discount
+# rate bracket is an offset above the terminal growth rate, where the model is defined.
+SOLVABLE = {
+    "growth_rate_1_5": (-99.0, 500.0),
+    "discount_rate": (0.01, 100.0),
+}
+
+LABELS = {
+    "growth_rate_1_5": "growth rate (1-5 yrs)",
+    "discount_rate": "discount rate",
+}
+
+MAX_ITERATIONS = 60
+RATE_TOLERANCE = 1e-9  # percentage points
+PRICE_TOLERANCE = 1e-10  # relative to the market price
+
+
+def _geometric_slope_5(q):
+    """Derivative of _geometric_sum_5: 1 + 2q + 3q^2 + 4q^3 + 5q^4."""
+    return 1 + q * (2 + q * (3 + q * (4 + 5 * q)))
+
+
+def _value_and_slope(solve_for, x, inputs):
+    """Intrinsic value with `solve_for` set to x, and its derivative per percentage
+    point of x. Plain arithmetic, so it works on floats and NumPy arrays alike."""
+    fcf_per_share = inputs["initial_fcf"] / inputs["shares_outstanding"]
+    g1 = (x if solve_for == "growth_rate_1_5" else inputs["growth_rate_1_5"]) / 100
+    g2 = inputs["growth_rate_6_10"] / 100
+    r = (x if solve_for == "discount_rate" else inputs["discount_rate"]) / 100
+    tg = inputs["terminal_growth_rate"] / 100
+    dilution = inputs["share_change_rate"] / 100
+
+    # Same closed form as dcf_valuation_advanced(), regrouped as
+    # FCF/share * (S(q1) + q1^5 * tail), tail being years 6-10 plus terminal value.
+    per_share_discount = (1 + dilution) * (1 + r)
+    q1 = (1 + g1) / per_share_discount
+    q2 = (1 + g2) / per_share_discount
+    terminal = (1 + tg) / (r - tg)
+    q1_4 = q1 ** 4
+    q2_4 = q2 ** 4
+    tail = _geometric_sum_5(q2) + q2_4 * q2 * terminal
+    value = fcf_per_share * (_geometric_sum_5(q1) + q1_4 * q1 * tail)
+
+    d_value_d_q1 = _geometric_slope_5(q1) + 5 * q1_4 * tail
+    if solve_for == "growth_rate_1_5":
+        slope = fcf_per_share * d_value_d_q1 / per_share_discount
+    else:
+        # Both ratios scale with 1 / (1 + r); the terminal multiple with 1 / (r - tg)
+        dq1 = -q1 / (1 + r)
+        dq2 = -q2 / (1 + r)
+        d_tail = (_geometric_slope_5(q2) + 5 * q2_4 * terminal) * dq2 - q2_4 * q2 * terminal / (r - tg)
+        slope = fcf_per_share * (d_value_d_q1 * dq1 + q1_4 * q1 * d_tail)
+    return value, slope / 100
+
+
+def _bracket(solve_for, inputs):
+    low, high = SOLVABLE[solve_for]
+    if solve_for == "discount_rate":
+        tg = inputs["terminal_growth_rate"]
+        return tg + low, tg + high
+    return low, high
+
+
+def implied_rate(market_price, solve_for, inputs):
+    """The value of `solve_for` (in percent) at which the model values one share at
+    `market_price`.
+
+    Parameters:
+    - market_price: current price per share, in the same currency as the FCF
+    - solve_for: "growth_rate_1_5" or "discount_rate"
+    - inputs: dict of dcf_valuation_advanced() arguments; the current value of
+      `solve_for` is only used as the starting guess
+
+    Raises ValueError for invalid inputs, or when no rate inside the bracket
+    reproduces the price (e.g. a negative FCF can never be worth a positive price).
+    """
+    if solve_for not in SOLVABLE:
+        raise ValueError(f"Can only solve for: {', '.join(SOLVABLE)}.")
+    if not market_price > 0:
+        raise ValueError("Market price must be a positive number.")
+    if inputs["shares_outstanding"] <= 0:
+        raise ValueError("Shares outstanding must be a positive number.")
+    if inputs["share_change_rate"] <= -100:
+        raise ValueError("Share change must be greater than -100%.")
+    if solve_for == "growth_rate_1_5" and inputs["discount_rate"] <= inputs["terminal_growth_rate"]:
+        raise ValueError("Discount rate must be greater than terminal growth rate.")
+
+    low, high = _bracket(solve_for, inputs)
+    f_low = _value_and_slope(solve_for, low, inputs)[0] - market_price
+    f_high = _value_and_slope(solve_for, high, inputs)[0] - market_price
+    if f_low * f_high > 0:
+        raise ValueError(
+            f"No {LABELS[solve_for]} between {low:.2f}% and {high:.2f}% "
+            f"values the stock at {market_price:.2f}."
+        )
+    rising = f_high > f_low
+
+    x = inputs[solve_for]
+    if not low < x < high:
+        x = (low + high) / 2
+
+    for _ in range(MAX_ITERATIONS):
+        value, slope = _value_and_slope(solve_for, x, inputs)
+        f = value - market_price
+        if abs(f) <= PRICE_TOLERANCE * market_price:
+            break
+
+        # Shrink the bracket around the root, then try a Newton step inside it
+        if (f < 0) == rising:
+            low = x
+        else:
+            high = x
+        step = x - f / slope if slope else low
+        if not low < step < high:
+            step = (low + high) / 2
+
+        converged = abs(step - x) <= RATE_TOLERANCE
+        x = step
+        if converged:
+            break
+    return x
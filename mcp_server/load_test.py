@@ -0,0 +1,136 @@
+"""Concurrency load test for the MCP server's tools.
+
+Keeps --concurrency tool calls in flight until --calls have completed, then
+prints throughput and latency percentiles. Two targets:
+
+- In-process (default): awaits the db.* coroutines the tools call, against
+  DATABASE_URL. This measures the database layer and its connection pool
+  (MCP_DB_POOL_SIZE / MCP_DB_MAX_OVERFLOW) without HTTP or auth in the way.
+- --url/--token: calls the real tools on a running server over Streamable HTTP,
+  with a bearer token from the OAuth flow, so auth and transport are included.
+
+Only read tools are called unless --write is given, which also creates DCF
+analyses for the ticker LOADTEST -- don't use it against the production database.
+
+    DATABASE_URL=sqlite:///mcp_local.db python load_test.py --create-tables --write
+    python load_test.py --url https://<host>/mcp --token mcp_at_... --concurrency 50
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+
+READ_CALLS = [
+    ("list_dcf_analyses", {"limit": 20}),
+    ("list_reports", {"limit": 20}),
+    ("list_wishlist", {}),
+]
+
+WRITE_CALLS = [
+    ("create_dcf_analysis", {
+        "ticker": "LOADTEST", "free_cash_flow": 1000.0, "growth_rate_5yr": 10.0,
+        "growth_rate_6_10yr": 6.0, "terminal_growth_rate": 2.5, "discount_rate": 9.0,
+        "shares_outstanding": 500.0,
+    }),
+]
+
+
+async def _in_process_caller(create_tables):
+    import db
+
+    if create_tables:
+        # Scratch databases only: in production app.py owns these tables
+        async with db.engine.begin() as connection:
+            await connection.run_sync(db.Base.metadata.create_all)
+
+    async def call(name, arguments):
+        return await getattr(db, name)(**arguments)
+
+    return call, db.engine.dispose
+
+
+async def _http_caller(url, token, stack):
+    from mcp import ClientSession
+    from mcp.client.streamable_http import create_mcp_http_client, streamable_http_client
+
+    http_client = await stack.enter_async_context(
+        create_mcp_http_client(headers={"Authorization": f"Bearer {token}"})
+    )
+    read_stream, write_stream = await stack.enter_async_context(
+        streamable_http_client(url, http_client=http_client)
+    )
+    session = await stack.enter_async_context(ClientSession(read_stream, write_stream))
+    await session.initialize()
+
+    async def call(name, arguments):
+        result = await session.call_tool(name, arguments)
+        if result.is_error:
+            raise RuntimeError(str(result.content))
+        return result
+
+    return call, None
+
+
+async def run(args):
+    from contextlib import AsyncExitStack
+
+    workload = itertools.cycle(READ_CALLS + (WRITE_CALLS if args.write else []))
+    calls = itertools.islice(workload, args.calls)
+    latencies = []
+    errors = []
+
+    async with AsyncExitStack() as stack:
+        if args.url:
+            call, cleanup = await _http_caller(args.url, args.token, stack)
+        else:
+            call, cleanup = await _in_process_caller(args.create_tables)
+
+        async def worker():
+            # Workers share one iterator, so together they make exactly --calls calls
+            for name, arguments in calls:
+                started = time.perf_counter()
+                try:
+                    await call(name, arguments)
+                    latencies.append(time.perf_counter() - started)
+                except Exception as e:
+                    errors.append(f"{name}: {e}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        if cleanup:
+            await cleanup()
+
+    latencies.sort()
+    print(f"{len(latencies)} calls ok, {len(errors)} failed, {args.concurrency} concurrent, {elapsed:.2f} s")
+    print(f"throughput: {len(latencies) / elapsed:.0f} calls/s")
+    if latencies:
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000
+
+        print(f"latency ms: p50 {percentile(50):.1f}  p95 {percentile(95):.1f}  "
+              f"p99 {percentile(99):.1f}  max {latencies[-1] * 1000:.1f}  "
+              f"mean {statistics.mean(latencies) * 1000:.1f}")
+    for error in errors[:5]:
+        print(f"error: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=50, help="tool calls in flight at once (default 50)")
+    parser.add_argument("--calls", type=int, default=2000, help="total tool calls (default 2000)")
+    parser.add_argument("--write", action="store_true", help="also call create_dcf_analysis")
+    parser.add_argument("--create-tables", action="store_true",
+                        help="in-process only: create the app's tables first (scratch databases only)")
+    parser.add_argument("--url", help="MCP endpoint of a running server, e.g. http://localhost:8000/mcp")
+    parser.add_argument("--token", help="bearer access token for --url")
+    args = parser.parse_args()
+    if args.url and not args.token:
+        parser.error("--url needs --token")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
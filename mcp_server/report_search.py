@@ -0,0 +1,228 @@
+"""Report full-text search for the MCP server.
+
+KEEP IN SYNC WITH ../search/reports.py -- this is a verbatim copy of everything
+below that module's docstring. The MCP server is deployed as its own Railway
+service rooted at mcp_server/, so it can't import the main app's `search`
+package; copying the module is the same trade-off dcf_calc.py makes for the DCF
+model and db.py for sanitize_html().
+
+Both services write reports, so both must keep the SQLite FTS5 index in step
+the same way: if ../search/reports.py changes, mirror the change here. The index
+itself (FTS5 table or Postgres tsvector column) is created by app.py at startup;
+this service never calls ensure_index().
+"""
+
+import html
+import logging
+import re
+
+from sqlalchemy import DateTime, text
+
+logger = logging.getLogger(__name__)
+
+MAX_TERMS = 10
+MAX_RESULTS = 50
+
+# A shorter last term is matched as a whole word: a one- or two-letter prefix
+# matches most of the vocabulary and makes the search scan nearly every report.
+MIN_PREFIX_LENGTH = 3
+
+# Placeholders the database wraps around matches. They can't occur in report
+# text, so they survive HTML escaping and are swapped for the caller's markup.
+_START, _STOP = "\x02", "\x03"
+
+_TAG = re.compile(r"<[^>]*>")
+_TERM = re.compile(r"\w+")
+
+# Entities sanitize_html() leaves in report notes, decoded by the Postgres index
+# so that it sees the same text as plain_text() gives FTS5. A generated column
+# can only use immutable functions, so this is a chain of replace() calls rather
+# than a general decoder; &amp; comes last so "&amp;lt;" decodes only once.
+_POSTGRES_ENTITIES = (
+    ("&nbsp;", " "), ("&lt;", "<"), ("&gt;", ">"), ("&quot;", '"'), ("&#39;", "'"), ("&amp;", "&"),
+)
+
+
+def _postgres_plain_notes():
+    expression = "regexp_replace(coalesce(notes, ''), '<[^>]*>', ' ', 'g')"
+    for entity, char in _POSTGRES_ENTITIES:
+        quoted = char.replace("'", "''")
+        expression = f"replace({expression}, '{entity}', '{quoted}')"
+    return expression
+
+
+_POSTGRES_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('english', {_postgres_plain_notes()}), 'B')"
+)
+
+_SQLITE_SEARCH = text(f"""
+    SELECT r.id, r.ticker, r.date,
+           highlight(report_fts, 0, '{_START}', '{_STOP}') AS title,
+           snippet(report_fts, 1, '{_START}', '{_STOP}', ' … ', 24) AS snippet,
+           -bm25(report_fts, 10.0, 1.0) AS score
+    FROM report_fts JOIN report r ON r.id = report_fts.rowid
+    WHERE report_fts MATCH :query
+    ORDER BY score DESC
+    LIMIT :limit
+""").columns(date=DateTime)
+
+# Rank through the GIN index first; ts_headline() is slow, so only the returned
+# page of reports gets highlighted.
+_POSTGRES_SEARCH = text("""
+    SELECT r.id, r.ticker, r.date,
+           ts_headline('english', r.title, ranked.q, :title_options) AS title,
+           ts_headline('english', regexp_replace(r.notes, '<[^>]*>', ' ', 'g'), ranked.q, :snippet_options) AS snippet,
+           ranked.score
+    FROM (
+        SELECT id, q, ts_rank_cd(search_vector, q) AS score
+        FROM report, to_tsquery('english', :query) AS q
+        WHERE search_vector @@ q
+        ORDER BY score DESC
+        LIMIT :limit
+    ) AS ranked
+    JOIN report r ON r.id = ranked.id
+    ORDER BY ranked.score DESC
+""")
+
+_TITLE_OPTIONS = f"StartSel={_START}, StopSel={_STOP}, HighlightAll=true"
+_SNIPPET_OPTIONS = (
+    f'StartSel={_START}, StopSel={_STOP}, MaxWords=30, MinWords=10, '
+    'MaxFragments=2, FragmentDelimiter=" … "'
+)
+
+
+def plain_text(notes_html):
+    """Report notes with tags dropped and entities decoded, whitespace collapsed."""
+    return " ".join(html.unescape(_TAG.sub(" ", notes_html or "")).split())
+
+
+def ensure_index(engine):
+    """Create the search index if the database doesn't have it yet.
+
+    Called at startup by the service that owns the report table. On SQLite a
+    newly created FTS5 table is filled from the existing reports.
+    """
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as connection:
+            exists = connection.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'report_fts'"
+            )).first()
+            if exists:
+                return
+            connection.execute(text(
+                "CREATE VIRTUAL TABLE report_fts USING fts5(title, body, tokenize = 'porter unicode61')"
+            ))
+            rows = connection.execute(text("SELECT id, title, notes FROM report")).all()
+            if rows:
+                connection.execute(
+                    text("INSERT INTO report_fts (rowid, title, body) VALUES (:id, :title, :body)"),
+                    [{"id": row.id, "title": row.title, "body": plain_text(row.notes)} for row in rows],
+                )
+        logger.info("Created report search index (FTS5) with %s reports", len(rows))
+    elif engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            # A column generated by an older expression (before entities were
+            # decoded) is dropped, index and all, and rebuilt below.
+            expression = connection.execute(text(
+                "SELECT generation_expression FROM information_schema.columns "
+                "WHERE table_name = 'report' AND column_name = 'search_vector'"
+            )).scalar()
+            if expression is not None and "&amp;" not in expression:
+                connection.execute(text("ALTER TABLE report DROP COLUMN search_vector"))
+                logger.info("Rebuilding report search index (tsvector) to decode HTML entities")
+            connection.execute(text(
+                f"ALTER TABLE report ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS ({_POSTGRES_VECTOR}) STORED"
+            ))
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_report_search_vector ON report USING GIN (search_vector)"
+            ))
+    else:
+        logger.warning("Report search is not supported on %s", engine.dialect.name)
+
+
+def index_report(session, report_id, title, notes_html):
+    """Add or refresh one report in the index. Call after the report is flushed."""
+    if session.get_bind().dialect.name != "sqlite":
+        return
+    session.execute(text("DELETE FROM report_fts WHERE rowid = :id"), {"id": report_id})
+    session.execute(
+        text("INSERT INTO report_fts (rowid, title, body) VALUES (:id, :title, :body)"),
+        {"id": report_id, "title": title, "body": plain_text(notes_html)},
+    )
+
+
+def index_reports(session, reports):
+    """Add many new reports, given as (id, title, notes_html), in one executemany."""
+    if session.get_bind().dialect.name != "sqlite" or not reports:
+        return
+    session.execute(
+        text("INSERT INTO report_fts (rowid, title, body) VALUES (:id, :title, :body)"),
+        [{"id": report_id, "title": title, "body": plain_text(notes_html)} for report_id, title, notes_html in reports],
+    )
+
+
+def remove_report(session, report_id):
+    """Drop one report from the index."""
+    if session.get_bind().dialect.name != "sqlite":
+        return
+    session.execute(text("DELETE FROM report_fts WHERE rowid = :id"), {"id": report_id})
+
+
+def _terms(query):
+    return _TERM.findall((query or "").lower())[:MAX_TERMS]
+
+
+def _render(fragment, highlight, escape):
+    fragment = fragment or ""
+    if escape:
+        fragment = html.escape(fragment, quote=False)
+    return fragment.replace(_START, highlight[0]).replace(_STOP, highlight[1])
+
+
+def search(session, query, limit=20, highlight=("<mark>", "</mark>"), escape=True):
+    """Best-matching reports for a free-text query, best first.
+
+    Returns [{"id", "ticker", "date", "title", "snippet", "score"}], where title
+    and snippet have every match wrapped in `highlight`. With escape=True they
+    are HTML-escaped first, so the result is safe to render as markup. Searching
+    is on whole words (stemmed), all of which must match; punctuation is ignored.
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+    limit = max(1, min(int(limit), MAX_RESULTS))
+
+    prefix = len(terms[-1]) >= MIN_PREFIX_LENGTH
+
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        match = " ".join(f'"{term}"' for term in terms) + ("*" if prefix else "")
+        rows = session.execute(_SQLITE_SEARCH, {"query": match, "limit": limit}).all()
+    elif dialect == "postgresql":
+        tsquery = " & ".join(terms) + (":*" if prefix else "")
+        rows = session.execute(_POSTGRES_SEARCH, {
+            "query": tsquery,
+            "limit": limit,
+            "title_options": _TITLE_OPTIONS,
+            "snippet_options": _SNIPPET_OPTIONS,
+        }).all()
+    else:
+        raise ValueError(f"Report search is not supported on {dialect}.")
+
+    results = []
+    for row in rows:
+        snippet = row.snippet or ""
+        if dialect == "postgresql":
+            # ts_headline ran on the notes HTML with only the tags stripped
+            snippet = html.unescape(snippet)
+        results.append({
+            "id": row.id,
+            "ticker": row.ticker,
+            "date": row.date,
+            "title": _render(row.title, highlight, escape),
+            "snippet": _render(snippet, highlight, escape),
+            "score": round(float(row.score), 4),
+        })
+    return results
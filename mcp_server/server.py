@@ -1,16 +1,20 @@
 """Remote MCP server for the Stock Dashboard app.
 
-Exposes create_report / add_wishlist_item / create_dcf_analysis / list_reports /
-list_wishlist / list_dcf_analyses as MCP tools over Streamable HTTP, gated behind the
-OAuth 2.1 + PKCE provider in auth.py. Nothing here can delete: the tools are read and
-create only. Deployed as its own Railway service (see mcp_server/Procfile), sharing
-the main app's Postgres database (DATABASE_URL) but never touching the main app's
-table schema/migrations.
+Exposes create_report(s) / add_wishlist_item(s) / create_dcf_analysis /
+create_dcf_analyses / reverse_dcf / list_reports / search_reports / list_wishlist /
+list_dcf_analyses / oauth_sweep_stats / token_cache_stats as MCP tools over
+Streamable HTTP, gated behind the OAuth 2.1 + PKCE provider in auth.py. Nothing
+here can delete: the tools are read and create only. Deployed as its own Railway
+service (see mcp_server/Procfile), sharing the main app's Postgres database
+(DATABASE_URL) but never touching the main app's table schema/migrations.
 """
 
 import asyncio
 import logging
 import os
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 
 from mcp.server.auth.settings import AuthSettings, ClientRegistrationOptions
 from mcp.server.mcpserver.server import MCPServer
@@ -27,6 +31,9 @@ logger = logging.getLogger(__name__)
 
 PUBLIC_URL = os.environ.get("MCP_PUBLIC_URL", "http://localhost:8000").rstrip("/")
 
+# How often expired logins, auth codes and tokens are deleted from the OAuth tables
+SWEEP_INTERVAL_SECONDS = int(os.environ.get("MCP_SWEEP_INTERVAL_SECONDS", 3600))
+
 oauth_provider = StockDashboardOAuthProvider()
 
 auth_settings = AuthSettings(
@@ -39,6 +46,42 @@ auth_settings = AuthSettings(
     resource_server_url=None,
 )
 
+# Outcome of this process's most recent sweep, served by the oauth_sweep_stats tool
+_last_sweep = None
+
+
+async def _sweep_oauth_state():
+    global _last_sweep
+    while True:
+        try:
+            started = time.perf_counter()
+            deleted = await db.sweep_expired_oauth_state()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            counts = await db.oauth_table_counts()
+            _last_sweep = {
+                "deleted": deleted,
+                "duration_ms": round(elapsed_ms, 1),
+                "finished_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "rows_left": counts,
+            }
+            logger.info("OAuth sweep deleted %s in %.0f ms; rows left: %s", deleted, elapsed_ms, counts)
+        except Exception:
+            logger.exception("OAuth sweep failed")
+        await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(server):
+    # Runs on the HTTP server's event loop, so the pool's connections belong to it
+    await db.init_oauth_tables()
+    sweeper = asyncio.create_task(_sweep_oauth_state())
+    try:
+        yield {}
+    finally:
+        sweeper.cancel()
+        await db.engine.dispose()
+
+
 app = MCPServer(
     name="stock-dashboard",
     instructions=(
@@ -47,6 +90,7 @@ app = MCPServer(
     ),
     auth_server_provider=oauth_provider,
     auth=auth_settings,
+    lifespan=lifespan,
 )
 
 
@@ -73,7 +117,25 @@ async def create_report(ticker: str, title: str, date: str, notes: str) -> dict:
         notes: Report body. Plain text or simple HTML (p, br, strong, em, u, h2, h3, ul, ol, li, b, i).
     """
     try:
-        return await asyncio.to_thread(db.create_report, ticker, title, date, notes)
+        return await db.create_report(ticker, title, date, notes)
+    except db.ValidationError as e:
+        return {"error": str(e)}
+
+
+@app.tool()
+async def create_reports(items: list[dict]) -> dict:
+    """Create many research reports in one call (up to 500), saved in one transaction.
+
+    Each item has the create_report fields: ticker, title, date (YYYY-MM-DD) and notes.
+    Invalid items are skipped and reported; the rest are saved. Returns {"created",
+    "failed", "results"} with one result per item, in order: the created report, or
+    {"index", "error"}.
+
+    Args:
+        items: List of {"ticker", "title", "date", "notes"} objects.
+    """
+    try:
+        return await db.create_reports(items)
     except db.ValidationError as e:
         return {"error": str(e)}
 
@@ -90,7 +152,26 @@ async def add_wishlist_item(ticker: str, target_price: float, currency: str = "$
         currency: Currency symbol, e.g. "$", "€", "£". Defaults to "$".
     """
     try:
-        return await asyncio.to_thread(db.add_wishlist_item, ticker, target_price, currency)
+        return await db.add_wishlist_item(ticker, target_price, currency)
+    except (db.ValidationError, db.DuplicateTickerError) as e:
+        return {"error": str(e)}
+
+
+@app.tool()
+async def add_wishlist_items(items: list[dict]) -> dict:
+    """Add many stocks to the wishlist in one call (up to 500), saved in one transaction.
+
+    Each item has the add_wishlist_item fields: ticker, target_price and optionally
+    currency (default "$"). Invalid items, tickers already on the wishlist and
+    repeats within items are skipped and reported; the rest are saved. Returns
+    {"created", "failed", "results"} with one result per item, in order: the added
+    item, or {"index", "error"}.
+
+    Args:
+        items: List of {"ticker", "target_price", "currency"} objects.
+    """
+    try:
+        return await db.add_wishlist_items(items)
     except (db.ValidationError, db.DuplicateTickerError) as e:
         return {"error": str(e)}
 
@@ -128,8 +209,8 @@ async def create_dcf_analysis(
         currency: Currency symbol, e.g. "$", "€", "£". Defaults to "$".
     """
     try:
-        return await asyncio.to_thread(
-            db.create_dcf_analysis, ticker, free_cash_flow, growth_rate_5yr,
+        return await db.create_dcf_analysis(
+            ticker, free_cash_flow, growth_rate_5yr,
             growth_rate_6_10yr, terminal_growth_rate, discount_rate,
             shares_outstanding, share_dilution, currency,
         )
@@ -138,36 +219,182 @@ async def create_dcf_analysis(
 
 
 @app.tool()
-async def list_dcf_analyses(ticker: str | None = None, limit: int = 20) -> list[dict]:
-    """List saved DCF analyses with their inputs and resulting intrinsic value per share.
+async def create_dcf_analyses(items: list[dict]) -> dict:
+    """Run and save many DCF valuations in one call (up to 500), e.g. a whole watchlist.
+
+    Each item has the create_dcf_analysis fields and follows the same rules (same
+    unit for free_cash_flow and shares_outstanding, rates in percent, discount_rate
+    above terminal_growth_rate); share_dilution and currency are optional. All
+    intrinsic values are computed server-side in one pass. Invalid items are skipped
+    and reported; the rest are saved in one transaction. Returns {"created",
+    "failed", "results"} with one result per item, in order: the saved analysis, or
+    {"index", "error"}.
+
+    Args:
+        items: List of {"ticker", "free_cash_flow", "growth_rate_5yr", "growth_rate_6_10yr",
+            "terminal_growth_rate", "discount_rate", "shares_outstanding",
+            "share_dilution", "currency"} objects.
+    """
+    try:
+        return await db.create_dcf_analyses(items)
+    except db.ValidationError as e:
+        return {"error": str(e)}
+
+
+@app.tool()
+async def reverse_dcf(
+    market_price: float,
+    free_cash_flow: float,
+    growth_rate_5yr: float,
+    growth_rate_6_10yr: float,
+    terminal_growth_rate: float,
+    discount_rate: float,
+    shares_outstanding: float,
+    share_dilution: float = 0.0,
+    solve_for: str = "growth_rate_5yr",
+) -> dict:
+    """Reverse DCF: find the rate the market price implies. Nothing is saved.
+
+    Solves the same model as create_dcf_analysis backwards -- holding every other
+    input fixed, it returns the growth rate for years 1-5 (or the discount rate) at
+    which the intrinsic value per share equals market_price. Use it to ask "what
+    growth is priced in?". The same unit rules apply: free_cash_flow and
+    shares_outstanding in the SAME unit, market_price per share in the FCF's currency.
+
+    Args:
+        market_price: Current price per share, as a positive number.
+        free_cash_flow: Current/average annual free cash flow, in millions or billions.
+        growth_rate_5yr: FCF growth for years 1-5, in percent. Only the starting guess
+            when solve_for is "growth_rate_5yr".
+        growth_rate_6_10yr: FCF growth for years 6-10, in percent.
+        terminal_growth_rate: Perpetual growth rate after year 10, in percent.
+        discount_rate: Required rate of return / WACC, in percent. Only the starting
+            guess when solve_for is "discount_rate".
+        shares_outstanding: Share count, in the same unit as free_cash_flow.
+        share_dilution: Annual change in share count, in percent. Defaults to 0.
+        solve_for: "growth_rate_5yr" (default) or "discount_rate".
+    """
+    try:
+        return db.reverse_dcf(
+            market_price, free_cash_flow, growth_rate_5yr, growth_rate_6_10yr,
+            terminal_growth_rate, discount_rate, shares_outstanding, share_dilution,
+            solve_for,
+        )
+    except db.ValidationError as e:
+        return {"error": str(e)}
+
+
+@app.tool()
+async def list_dcf_analyses(
+    ticker: str | None = None,
+    limit: int = 20,
+    cursor: str | None = None,
+    fields: list[str] | None = None,
+) -> dict:
+    """List saved DCF analyses with their inputs and resulting intrinsic value per share, newest first.
 
     Use this to see what valuations already exist, or to read back the assumptions
-    behind one, before running a new analysis.
+    behind one, before running a new analysis. Returns {"items": [...], "next_cursor"};
+    pass next_cursor back as `cursor` for the next page (it is null on the last page).
 
     Args:
         ticker: Optional ticker symbol to filter by.
-        limit: Max number of analyses to return (default 20, max 100).
+        limit: Max number of analyses per page (default 20, max 100).
+        cursor: next_cursor from a previous call, to continue where it left off.
+        fields: Optional subset of fields to return, e.g. ["ticker", "intrinsic_value"].
+            One or more of: id, ticker, free_cash_flow, growth_rate_5yr, growth_rate_6_10yr,
+            terminal_growth_rate, discount_rate, shares_outstanding, share_dilution,
+            intrinsic_value, currency, date_created. Defaults to all.
     """
-    return await asyncio.to_thread(db.list_dcf_analyses, ticker, limit)
+    try:
+        return await db.list_dcf_analyses(ticker, limit, cursor, fields)
+    except db.ValidationError as e:
+        return {"error": str(e)}
 
 
 @app.tool()
-async def list_wishlist() -> list[dict]:
-    """List all stocks currently on the wishlist, with target price and currency."""
-    return await asyncio.to_thread(db.list_wishlist)
+async def list_wishlist(limit: int = 50, cursor: str | None = None, fields: list[str] | None = None) -> dict:
+    """List stocks on the wishlist, with target price and currency, most recently added first.
+
+    Returns {"items": [...], "next_cursor"}; pass next_cursor back as `cursor` for the
+    next page (it is null on the last page).
+
+    Args:
+        limit: Max number of items per page (default 50, max 100).
+        cursor: next_cursor from a previous call, to continue where it left off.
+        fields: Optional subset of fields to return, e.g. ["ticker", "target_price"].
+            One or more of: id, ticker, target_price, currency, date_added. Defaults to all.
+    """
+    try:
+        return await db.list_wishlist(limit, cursor, fields)
+    except db.ValidationError as e:
+        return {"error": str(e)}
 
 
 @app.tool()
-async def list_reports(ticker: str | None = None, limit: int = 20) -> list[dict]:
-    """List existing reports (id, ticker, title, date) -- omits report body to stay compact.
+async def list_reports(
+    ticker: str | None = None,
+    limit: int = 20,
+    cursor: str | None = None,
+    fields: list[str] | None = None,
+) -> dict:
+    """List existing reports (id, ticker, title, date, short plain-text excerpt), newest first -- omits report body to stay compact.
 
     Use this to check what already exists before creating a new report, not to read full contents.
+    Returns {"items": [...], "next_cursor"}; pass next_cursor back as `cursor` for the next page.
 
     Args:
         ticker: Optional ticker symbol to filter by.
-        limit: Max number of reports to return (default 20, max 100).
+        limit: Max number of reports per page (default 20, max 100).
+        cursor: next_cursor from a previous call, to continue where it left off.
+        fields: Optional subset of fields to return, e.g. ["id", "title"]. One or more of:
+            id, ticker, title, date, date_created, excerpt. Defaults to all.
+    """
+    try:
+        return await db.list_reports(ticker, limit, cursor, fields)
+    except db.ValidationError as e:
+        return {"error": str(e)}
+
+
+@app.tool()
+async def search_reports(query: str, limit: int = 10) -> dict:
+    """Full-text search over report titles and notes, best matches first.
+
+    Returns {"results": [...]} with id, ticker, title, date, a snippet of the matching
+    notes and a relevance score per report; matched words are wrapped in **double
+    asterisks**. All words must match (stemmed, so "margins" finds "margin"); the last
+    word also matches as a prefix.
+
+    Args:
+        query: Words to search for, e.g. "free cash flow dilution".
+        limit: Max number of results (default 10, max 50).
+    """
+    try:
+        return await db.search_reports(query, limit)
+    except db.ValidationError as e:
+        return {"error": str(e)}
+
+
+@app.tool()
+async def oauth_sweep_stats() -> dict:
+    """Report the last cleanup of expired logins, auth codes and tokens. Read-only.
+
+    Returns {"interval_seconds", "last_sweep"}, where last_sweep holds the rows
+    deleted per table, duration_ms, finished_at (UTC, ISO 8601) and the rows left
+    per table -- or null if no sweep has finished since this server started.
+    """
+    return {"interval_seconds": SWEEP_INTERVAL_SECONDS, "last_sweep": _last_sweep}
+
+
+@app.tool()
+async def token_cache_stats() -> dict:
+    """Report this server process's cache of verified access tokens. Read-only.
+
+    Returns {"entries", "max_entries", "ttl", "epoch", "hits", "misses", "hit_rate",
+    "invalidations"}: hit_rate is null before the first lookup, and invalidations
+    counts how often a token revoked on another replica emptied the cache.
     """
-    return await asyncio.to_thread(db.list_reports, ticker, limit)
+    return oauth_provider.token_cache_stats()
 
 
 def _build_transport_security() -> TransportSecuritySettings:
@@ -184,7 +411,6 @@ def _build_transport_security() -> TransportSecuritySettings:
 
 
 def main():
-    db.init_oauth_tables()
     port = int(os.environ.get("PORT", 8000))
     host = os.environ.get("HOST", "0.0.0.0")
 
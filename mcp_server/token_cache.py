@@ -0,0 +1,106 @@
+"""In-process cache of verified access tokens, with a TTL, LRU eviction and a
+cross-replica invalidation epoch.
+
+Every MCP tool call is gated by load_access_token(); without this cache each one
+starts with a database round-trip. A cached token is served until the earliest
+of its own expires_at and `ttl` seconds after it was loaded.
+
+Revocation goes through db.delete_token(), which bumps a counter in the
+mcp_oauth_token_epoch table in the same transaction when it deletes an access
+token. Refresh tokens are never cached, so rotating one on every refresh leaves
+the other replicas' caches alone. The replica that deleted the token drops it
+from its own cache at once. Every replica re-reads the counter at most every
+`epoch_check_interval` seconds and empties its cache when the counter has moved,
+so a token revoked elsewhere stops working within that interval.
+
+The cache lives on the event loop thread and is never touched from another
+thread, so it needs no lock.
+"""
+
+import time
+from collections import OrderedDict
+
+
+class AccessTokenCache:
+    def __init__(self, ttl=300, max_entries=1000, epoch_check_interval=5):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.epoch_check_interval = epoch_check_interval
+        self._entries = OrderedDict()  # token -> (valid_until, AccessToken)
+        self._epoch = None
+        self._epoch_checked_at = float("-inf")
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, token):
+        """The cached AccessToken, or None if it isn't cached or is past its validity."""
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        valid_until, access_token = entry
+        if time.time() >= valid_until:
+            del self._entries[token]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return access_token
+
+    @property
+    def epoch(self):
+        return self._epoch
+
+    def put(self, access_token, epoch):
+        """Cache a token loaded while the cache was at `epoch`. If the epoch has
+        moved since, the token may have been revoked meanwhile and isn't cached."""
+        if epoch != self._epoch:
+            return
+        valid_until = time.time() + self.ttl
+        if access_token.expires_at:
+            valid_until = min(valid_until, access_token.expires_at)
+        self._entries[access_token.token] = (valid_until, access_token)
+        self._entries.move_to_end(access_token.token)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, token):
+        self._entries.pop(token, None)
+
+    def epoch_due(self):
+        """True when the shared epoch should be re-read. Claims the check, so
+        concurrent callers don't all query it at once."""
+        now = time.monotonic()
+        if now - self._epoch_checked_at < self.epoch_check_interval:
+            return False
+        self._epoch_checked_at = now
+        return True
+
+    def set_epoch(self, epoch, own_change=False):
+        """Record the shared epoch, emptying the cache if someone else moved it.
+
+        `own_change` marks an epoch this process just bumped itself with one
+        delete_token(); if that is the only change, the deleted token has already
+        been discarded and the rest of the cache is still valid.
+        """
+        if self._epoch is not None and epoch < self._epoch:
+            return  # a slower read of an epoch already superseded
+        expected = self._epoch + 1 if own_change and self._epoch is not None else self._epoch
+        if epoch != expected and self._epoch is not None:
+            self._entries.clear()
+            self.invalidations += 1
+        self._epoch = epoch
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "epoch": self._epoch,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "invalidations": self.invalidations,
+        }
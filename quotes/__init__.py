@@ -0,0 +1 @@
+# Market quotes package
@@ -0,0 +1,75 @@
+"""Target-price alert evaluation for the whole wishlist in one vectorized pass.
+
+Pure logic module with no Flask imports. app.py loads the wishlist rows and their
+quote snapshots, this module decides which rows are at or below their target, and
+app.py records the resulting alert events.
+
+Prices and targets may be in different currencies: the quote comes in whatever
+currency Yahoo lists the stock in, while the target is in the currency chosen on
+the wishlist. Both are converted to EUR with one factor per distinct currency
+(there are ~20, however many rows there are), then compared element-wise.
+"""
+
+import numpy as np
+
+from quotes.fx_rates import currency_code
+
+# Yahoo quotes some exchanges in a minor unit: London in pence ('GBp'),
+# Johannesburg in cents ('ZAc') and Tel Aviv in agorot ('ILA').
+SUBUNITS = {
+    'GBp': ('GBP', 0.01),
+    'GBX': ('GBP', 0.01),
+    'ZAc': ('ZAR', 0.01),
+    'ILA': ('ILS', 0.01),
+}
+
+
+def _eur_factor(code, rates):
+    """EUR per one unit of `code`, or NaN when the rate table can't tell."""
+    code, scale = SUBUNITS.get(code, (code, 1.0))
+    if code == 'EUR':
+        return scale
+    if not rates or code not in rates or 'EUR' not in rates:
+        return np.nan
+    return scale * rates['EUR'] / rates[code]
+
+
+def eur_factors(codes, rates):
+    """EUR conversion factor for every element of `codes`, computed once per
+    distinct currency and broadcast back to the full array."""
+    codes = np.asarray(codes, dtype=str)
+    if codes.size == 0:
+        return np.empty(0)
+    unique, inverse = np.unique(codes, return_inverse=True)
+    table = np.array([_eur_factor(code, rates) for code in unique], dtype=float)
+    return table[inverse]
+
+
+def evaluate_targets(prices, targets, quote_currencies, target_symbols, rates):
+    """Return a boolean array: True where the current price is at or below target.
+
+    Parameters:
+    - prices: current prices (NaN where no quote is stored)
+    - targets: wishlist target prices
+    - quote_currencies: ISO codes the prices are quoted in (None if unknown)
+    - target_symbols: wishlist currency symbols, e.g. '$' or '€'
+    - rates: OpenExchangeRates table ({code: units per USD}), may be None
+
+    Rows without a price or a usable exchange rate never trigger.
+    """
+    prices = np.asarray(prices, dtype=float)
+    targets = np.asarray(targets, dtype=float)
+    target_codes = np.array([currency_code(symbol) for symbol in target_symbols], dtype=object)
+    quote_codes = np.asarray(quote_currencies, dtype=object)
+
+    # A quote with no reported currency is assumed to be in the wishlist currency,
+    # which is also what the wishlist page assumes when it displays it.
+    quote_codes = np.where(np.equal(quote_codes, None), target_codes, quote_codes)
+
+    # Same currency on both sides needs no rate table at all.
+    same = quote_codes == target_codes
+    price_eur = prices * np.where(same, 1.0, eur_factors(quote_codes, rates))
+    target_eur = targets * np.where(same, 1.0, eur_factors(target_codes, rates))
+
+    with np.errstate(invalid="ignore"):
+        return price_eur <= target_eur
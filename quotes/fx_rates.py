@@ -0,0 +1,145 @@
+"""EUR conversion backed by a cached OpenExchangeRates rate table.
+
+Pure logic module with no Flask imports. The whole `latest.json` table is fetched
+at most once per refresh interval and every conversion is done from that one
+in-memory copy, so a 30-row wishlist costs one API call per interval instead of 30.
+
+The last good table is also written to a small JSON file. Another gunicorn worker
+(or this one after a restart) picks it up instead of calling the API again, and if
+the API is unreachable the persisted table is used and flagged as stale.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+LATEST_URL = "https://openexchangerates.org/api/latest.json?app_id={api_key}"
+
+REQUEST_TIMEOUT = 5
+
+# After a failed fetch, wait this long before trying the API again, so an outage
+# doesn't turn every page load into a 5 second timeout.
+RETRY_AFTER_FAILURE = 300
+
+# Mapping from the currency symbols stored on wishlist rows to currency codes
+CURRENCY_CODES = {
+    '$': 'USD',
+    '€': 'EUR',
+    '£': 'GBP',
+    '¥': 'JPY',
+    '₹': 'INR',
+    'C$': 'CAD',
+    'A$': 'AUD',
+    'CHF': 'CHF',
+    'CNY': 'CNY',
+    'SEK': 'SEK',
+    'NZD': 'NZD',
+    'MXN': 'MXN',
+    'SGD': 'SGD',
+    'HKD': 'HKD',
+    'NOK': 'NOK',
+    'KRW': 'KRW',
+    'TRY': 'TRY',
+    'RUB': 'RUB',
+    'BRL': 'BRL',
+    'ZAR': 'ZAR',
+    'SAR': 'SAR'
+}
+
+
+def currency_code(currency_symbol):
+    """Currency code for a stored symbol. Unknown symbols are treated as USD."""
+    return CURRENCY_CODES.get(currency_symbol, 'USD')
+
+
+def convert_to_eur(amount, currency_symbol, table):
+    """Convert an amount using a rate table from RateTable.get(). None if unavailable."""
+    code = currency_code(currency_symbol)
+
+    # If already in EUR, return the amount
+    if code == 'EUR':
+        return amount
+    if not table:
+        return None
+
+    # OpenExchange uses USD as base, so we need to convert:
+    # 1. From currency code to USD
+    # 2. From USD to EUR
+    rates = table["rates"]
+    if code in rates and 'EUR' in rates:
+        usd_amount = amount / rates[code]
+        return round(usd_amount * rates['EUR'], 2)
+    return None
+
+
+class RateTable:
+    def __init__(self, api_key, cache_path, refresh_interval=3600):
+        self.api_key = api_key
+        self.cache_path = cache_path
+        self.refresh_interval = refresh_interval
+        self._table = None  # {"rates": {...}, "fetched_at": epoch seconds}
+        self._last_failure_at = 0.0
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, table):
+        return table is not None and time.time() - table["fetched_at"] < self.refresh_interval
+
+    def _read_persisted(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as handle:
+                table = json.load(handle)
+            if isinstance(table.get("rates"), dict) and table.get("fetched_at"):
+                return table
+        except (OSError, ValueError, AttributeError):
+            pass
+        return None
+
+    def _write_persisted(self, table):
+        # Write-then-rename so a worker reading concurrently never sees half a file.
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(table, handle)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning("Could not persist FX rates to %s: %s", self.cache_path, e)
+
+    def _fetch(self):
+        response = requests.get(LATEST_URL.format(api_key=self.api_key), timeout=REQUEST_TIMEOUT)
+        if response.status_code != 200:
+            raise ValueError(f"OpenExchangeRates returned HTTP {response.status_code}")
+        rates = response.json().get("rates") or {}
+        if not rates:
+            raise ValueError("OpenExchangeRates returned no rates")
+        return {"rates": rates, "fetched_at": time.time()}
+
+    def get(self):
+        """The current rate table as {"rates", "fetched_at", "stale"}, or None if
+        no key is configured or no table has ever been fetched."""
+        if not self.api_key:
+            return None
+
+        with self._lock:
+            if not self._is_fresh(self._table):
+                persisted = self._read_persisted()
+                if persisted and (self._table is None or persisted["fetched_at"] > self._table["fetched_at"]):
+                    self._table = persisted
+
+            if not self._is_fresh(self._table) and time.time() - self._last_failure_at >= RETRY_AFTER_FAILURE:
+                try:
+                    self._table = self._fetch()
+                    self._write_persisted(self._table)
+                except (requests.RequestException, ValueError) as e:
+                    self._last_failure_at = time.time()
+                    logger.warning("Error fetching FX rates, using last known rates: %s", e)
+
+            if self._table is None:
+                return None
+            return {**self._table, "stale": not self._is_fresh(self._table)}
@@ -0,0 +1,153 @@
+"""In-process quote cache with a TTL, LRU eviction and stale-while-revalidate.
+
+Pure logic module with no Flask imports. Wraps quote_client so a DCF calculation
+or wishlist reload inside the TTL makes no network call at all.
+
+Freshness works in two windows:
+
+  * younger than `ttl`          -> served as-is (a hit)
+  * older, but within `max_stale` -> served immediately (a stale hit) while a
+                                    background thread refreshes it
+  * older than `max_stale`      -> treated as a miss and fetched synchronously
+
+Only answers from Yahoo are cached. A ticker Yahoo says it doesn't know is
+remembered for the much shorter `negative_ttl` and never served stale; a lookup
+that failed (network error, batch timeout) isn't cached at all, so one blip
+doesn't make a valid ticker look invalid.
+
+The cache lives in process memory, so each gunicorn worker keeps its own copy.
+There is no shared store (Redis etc.) in this deployment; at a one-user scale a
+handful of duplicate lookups per TTL is cheaper than running one.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from quotes import quote_client
+
+logger = logging.getLogger(__name__)
+
+
+class QuoteCache:
+    def __init__(self, ttl=300, max_stale=3600, max_entries=1000, refresh_workers=4, negative_ttl=60):
+        self.ttl = ttl
+        self.max_stale = max(max_stale, ttl)
+        self.negative_ttl = min(negative_ttl, ttl)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # ticker -> (fetched_at, quote or None)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=refresh_workers,
+                                             thread_name_prefix="quote-refresh")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    # -- internals --------------------------------------------------------
+
+    def _store(self, ticker, quote):
+        with self._lock:
+            self._entries[ticker] = (time.time(), quote)
+            self._entries.move_to_end(ticker)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _refresh(self, ticker):
+        try:
+            quote = quote_client.lookup_quote(ticker)
+            # Keep serving the old value rather than overwrite it with a failure.
+            if quote is not None:
+                self._store(ticker, quote)
+        except quote_client.QuoteUnavailable:
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(ticker)
+
+    def _lookup(self, ticker):
+        """Return (quote, found) from memory, scheduling a refresh if stale.
+        Must be called with the lock held."""
+        entry = self._entries.get(ticker)
+        if entry is None:
+            self.misses += 1
+            return None, False
+
+        fetched_at, quote = entry
+        age = time.time() - fetched_at
+        if quote is None:
+            # A not-found answer: short-lived, and never worth serving stale
+            if age < self.negative_ttl:
+                self.hits += 1
+                self._entries.move_to_end(ticker)
+                return None, True
+            self.misses += 1
+            return None, False
+        if age < self.ttl:
+            self.hits += 1
+        elif age < self.max_stale:
+            self.stale_hits += 1
+            if ticker not in self._refreshing:
+                self._refreshing.add(ticker)
+                self._refresher.submit(self._refresh, ticker)
+        else:
+            self.misses += 1
+            return None, False
+
+        self._entries.move_to_end(ticker)
+        return quote, True
+
+    # -- public API ---------------------------------------------------------
+
+    def get(self, ticker):
+        """Quote dict for one ticker, or None if Yahoo doesn't know it."""
+        with self._lock:
+            quote, found = self._lookup(ticker)
+        if found:
+            return quote
+
+        try:
+            quote = quote_client.lookup_quote(ticker)
+        except quote_client.QuoteUnavailable:
+            return None
+        self._store(ticker, quote)
+        return quote
+
+    def get_many(self, tickers):
+        """{ticker: quote dict or None}. Misses are fetched in one concurrent batch."""
+        quotes = {}
+        missing = []
+        with self._lock:
+            for ticker in dict.fromkeys(t for t in tickers if t):
+                quote, found = self._lookup(ticker)
+                if found:
+                    quotes[ticker] = quote
+                else:
+                    missing.append(ticker)
+
+        if missing:
+            fetched, failed = quote_client.lookup_quotes(missing)
+            failed = set(failed)
+            for ticker, quote in fetched.items():
+                if ticker not in failed:
+                    self._store(ticker, quote)
+            quotes.update(fetched)
+        return quotes
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "max_stale": self.max_stale,
+                "negative_ttl": self.negative_ttl,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else None,
+                "refreshing": len(self._refreshing),
+            }
@@ -0,0 +1,110 @@
+"""Fetch current stock quotes from Yahoo Finance, many tickers at a time.
+
+Pure logic module with no Flask imports -- imported by app.py the same way
+sec/sec_client.py is.
+
+yfinance has no cheap multi-symbol quote call that returns the same fields as
+Ticker.info (yf.download returns OHLC bars without currency or name), so tickers
+are fetched individually but concurrently on a bounded thread pool. Each lookup is
+almost entirely network wait, so a page's latency is bounded by its slowest quote
+rather than the sum of all of them.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+
+import yfinance as yf
+
+logger = logging.getLogger(__name__)
+
+# Yahoo starts throttling well before this, and a wishlist is rarely larger.
+MAX_WORKERS = 16
+
+# Upper bound on how long a whole batch may take. Quotes that haven't resolved by
+# then are reported as unavailable rather than holding up the page.
+BATCH_TIMEOUT = 20
+
+
+def _price_from_info(info):
+    """Pick the best available price. Outside market hours regularMarketPrice is
+    sometimes missing, so fall back to currentPrice and then the last close."""
+    return info.get("regularMarketPrice") or info.get("currentPrice") or info.get("previousClose")
+
+
+class QuoteUnavailable(Exception):
+    """Yahoo couldn't be reached or didn't answer in time. Says nothing about
+    whether the ticker exists, so callers must not remember it as unknown."""
+
+
+def lookup_quote(ticker):
+    """Look up one ticker. Returns a quote dict, or None if Yahoo doesn't know it.
+    Raises QuoteUnavailable when the lookup itself failed."""
+    try:
+        info = yf.Ticker(ticker).info
+    except Exception as e:
+        logger.warning("Error fetching quote for %s: %s", ticker, e)
+        raise QuoteUnavailable(str(e)) from e
+
+    # A valid ticker comes back with at least a symbol or a name; an unknown one
+    # yields an (almost) empty dict rather than an error.
+    if not info or not (info.get("symbol") or info.get("shortName")):
+        return None
+
+    return {
+        "ticker": ticker,
+        "price": _price_from_info(info),
+        "currency": info.get("currency"),
+        "name": info.get("shortName") or info.get("longName"),
+    }
+
+
+def iter_lookups(tickers, max_workers=MAX_WORKERS, timeout=BATCH_TIMEOUT):
+    """Look up many tickers concurrently, yielding (ticker, quote dict or None, ok)
+    in the order they resolve. `ok` is False when the lookup failed or was still
+    unresolved at the timeout; the quote is then None but the ticker may be valid."""
+    tickers = list(dict.fromkeys(t for t in tickers if t))
+    if not tickers:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(tickers)))
+    futures = {executor.submit(lookup_quote, ticker): ticker for ticker in tickers}
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            try:
+                yield futures[future], future.result(), True
+            except QuoteUnavailable:
+                yield futures[future], None, False
+    except FuturesTimeout:
+        pending = [futures[f] for f in futures if not f.done()]
+        logger.warning("Quote batch timed out after %ss; %d unresolved: %s",
+                       timeout, len(pending), ", ".join(pending))
+        for ticker in pending:
+            yield ticker, None, False
+    finally:
+        # Don't wait for stragglers -- their results are simply discarded.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_quotes(tickers, max_workers=MAX_WORKERS, timeout=BATCH_TIMEOUT):
+    """Look up many tickers concurrently, yielding (ticker, quote dict or None) in
+    the order they resolve. Failed and timed-out lookups yield None."""
+    for ticker, quote, _ in iter_lookups(tickers, max_workers=max_workers, timeout=timeout):
+        yield ticker, quote
+
+
+def fetch_quotes(tickers, max_workers=MAX_WORKERS, timeout=BATCH_TIMEOUT):
+    """Look up many tickers concurrently. Returns {ticker: quote dict or None}."""
+    return dict(iter_quotes(tickers, max_workers=max_workers, timeout=timeout))
+
+
+def lookup_quotes(tickers, max_workers=MAX_WORKERS, timeout=BATCH_TIMEOUT):
+    """Like fetch_quotes, but returns ({ticker: quote dict or None}, failed), where
+    `failed` lists the tickers whose lookup failed or timed out -- their None is
+    not an answer about the ticker."""
+    quotes = {}
+    failed = []
+    for ticker, quote, ok in iter_lookups(tickers, max_workers=max_workers, timeout=timeout):
+        quotes[ticker] = quote
+        if not ok:
+            failed.append(ticker)
+    return quotes, failed
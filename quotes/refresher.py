@@ -0,0 +1,120 @@
+"""Background thread that keeps stored quote snapshots up to date.
+
+Pure logic module with no Flask imports: app.py supplies the callbacks that read
+the tickers to refresh and write the results, so this module never touches the
+database itself. Pages then read prices from the snapshot table and never wait
+on Yahoo.
+
+A ticker that comes back without a price (unknown, delisted, or Yahoo failing)
+is left alone for `failure_backoff` seconds, so it isn't re-fetched every cycle
+and pages asking for it don't keep waking the thread.
+"""
+
+import logging
+import threading
+import time
+
+from quotes import quote_client
+
+logger = logging.getLogger(__name__)
+
+
+class QuoteRefresher:
+    def __init__(self, load_tickers, save_quotes, interval=300, batch_size=25, after_cycle=None,
+                 failure_backoff=1800):
+        """
+        Parameters:
+        - load_tickers: callable returning the tickers due for a refresh
+        - save_quotes: callable taking {ticker: quote dict} for one fetched batch
+        - interval: seconds between cycles
+        - batch_size: tickers fetched (concurrently) and saved per batch
+        - after_cycle: optional callable run once the cycle's quotes are saved
+        - failure_backoff: seconds a ticker is skipped after a lookup without a price
+        """
+        self.load_tickers = load_tickers
+        self.save_quotes = save_quotes
+        self.after_cycle = after_cycle
+        self.interval = interval
+        self.batch_size = max(1, batch_size)
+        self.failure_backoff = failure_backoff
+        self._failed = {}  # ticker -> time.monotonic() of its last failed lookup
+        self._failed_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def backing_off(self, ticker):
+        """True if the ticker's last lookup failed within failure_backoff seconds."""
+        with self._failed_lock:
+            failed_at = self._failed.get(ticker)
+        return failed_at is not None and time.monotonic() - failed_at < self.failure_backoff
+
+    def record_failures(self, tickers):
+        """Note lookups that returned no price, so the tickers back off."""
+        now = time.monotonic()
+        with self._failed_lock:
+            for ticker in tickers:
+                self._failed[ticker] = now
+
+    def wake_for(self, tickers):
+        """Wake the thread if any of these unpriced tickers is worth trying now."""
+        if any(not self.backing_off(ticker) for ticker in tickers):
+            self.wake()
+
+    def _forget_old_failures(self):
+        cutoff = time.monotonic() - self.failure_backoff
+        with self._failed_lock:
+            self._failed = {ticker: at for ticker, at in self._failed.items() if at >= cutoff}
+
+    def run_cycle(self):
+        """Refresh every due ticker once. Returns a summary of the cycle."""
+        started = time.perf_counter()
+        self._forget_old_failures()
+        due = list(self.load_tickers())
+        tickers = [ticker for ticker in due if not self.backing_off(ticker)]
+        resolved = 0
+
+        for start in range(0, len(tickers), self.batch_size):
+            batch = tickers[start:start + self.batch_size]
+            quotes = quote_client.fetch_quotes(batch)
+            found = {ticker: quote for ticker, quote in quotes.items() if quote and quote.get("price")}
+            if found:
+                self.save_quotes(found)
+            with self._failed_lock:
+                for ticker in found:
+                    self._failed.pop(ticker, None)
+            self.record_failures(ticker for ticker in batch if ticker not in found)
+            resolved += len(found)
+
+        elapsed = time.perf_counter() - started
+        logger.info("Quote refresh cycle: %d/%d tickers refreshed in %.2fs (%d backing off)",
+                    resolved, len(tickers), elapsed, len(due) - len(tickers))
+
+        if self.after_cycle:
+            self.after_cycle()
+        return {"tickers": len(tickers), "refreshed": resolved, "backing_off": len(due) - len(tickers),
+                "seconds": elapsed}
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_cycle()
+            except Exception as e:
+                # A bad cycle (database blip, Yahoo outage) must not kill the thread.
+                logger.error("Quote refresh cycle failed: %s", e)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self):
+        """Start the thread; later calls do nothing."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="quote-refresher", daemon=True)
+            self._thread.start()
+
+    def wake(self):
+        """Run the next cycle now rather than at the end of the interval."""
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
@@ -0,0 +1 @@
+# Full-text search package
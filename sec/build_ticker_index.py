@@ -0,0 +1,67 @@
+"""Regenerate sec/tickers.csv -- the local registry of US-listed tickers.
+
+Not imported by the app. Run it by hand every few months to pick up new listings;
+a stale registry only means a brand-new ticker is validated over the network (see
+sec/tickers.py) until the next run.
+
+SEC publishes company_tickers.json, mapping every ticker it knows to the company's
+CIK and name. It is a single ~800KB JSON object keyed by row number:
+
+    {"0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."}, ...}
+
+Usage:
+    python sec/build_ticker_index.py [url-or-local-json-path]
+
+Without an argument the current file is downloaded from SEC_TICKERS_URL, which
+needs SEC_USER_AGENT set like every other SEC request.
+"""
+
+import csv
+import json
+import os
+import sys
+import urllib.request
+
+SEC_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+OUTPUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tickers.csv")
+USER_AGENT = os.environ.get("SEC_USER_AGENT", "")
+
+
+def load_json(source):
+    if source.startswith("http"):
+        if not USER_AGENT:
+            sys.exit("Set SEC_USER_AGENT before downloading from SEC.")
+        print(f"Downloading {source} ...")
+        request = urllib.request.Request(source, headers={"User-Agent": USER_AGENT})
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return json.load(response)
+    with open(source, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit(__doc__)
+
+    data = load_json(sys.argv[1] if len(sys.argv) == 2 else SEC_TICKERS_URL)
+
+    # A company can list several share classes; each ticker is its own row. The
+    # same ticker never maps to two CIKs, but keep the first if it ever does.
+    tickers = {}
+    for row in data.values():
+        ticker = str(row["ticker"]).upper().strip()
+        if ticker and ticker not in tickers:
+            tickers[ticker] = (str(row["cik_str"]), row["title"].strip())
+
+    with open(OUTPUT_PATH, "w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["ticker", "cik", "name"])
+        for ticker, (cik, name) in sorted(tickers.items()):
+            writer.writerow([ticker, cik, name])
+
+    size_kb = os.path.getsize(OUTPUT_PATH) / 1024
+    print(f"Wrote {len(tickers):,} tickers to {OUTPUT_PATH} ({size_kb:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Pre-fill DCF inputs from SEC XBRL company facts.
+
+Pure logic module with no Flask imports. data.sec.gov's companyfacts endpoint
+returns every XBRL fact a company has ever reported -- several MB of JSON for a
+large issuer -- while the DCF form needs four concepts from it. The response is
+parsed as a stream with ijson: only those concepts are built into Python objects,
+everything else is skipped token by token.
+
+The extracted facts (a few KB) are cached on disk, one file per CIK, together
+with the response's ETag and Last-Modified headers. Within CACHE_MAX_AGE the
+cached file is used as is; after that a conditional request revalidates it, and
+an unchanged document comes back as a bodyless 304.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date
+
+import ijson
+
+from sec.sec_client import SecClientError, _sec_get
+
+logger = logging.getLogger(__name__)
+
+COMPANY_FACTS_URL = "https://data.sec.gov/api/xbrl/companyfacts/CIK{cik:010d}.json"
+
+# Companies file annual reports once a year, so a day-old cache is rarely stale.
+CACHE_MAX_AGE = 24 * 3600
+
+# Concepts read for each input, most preferred first. Filers switch concepts over
+# the years, so for any fiscal year the first concept that reports it wins.
+CONCEPTS = {
+    "operating_cash_flow": (
+        ("us-gaap", "NetCashProvidedByUsedInOperatingActivities"),
+        ("us-gaap", "NetCashProvidedByUsedInOperatingActivitiesContinuingOperations"),
+    ),
+    "capex": (
+        ("us-gaap", "PaymentsToAcquirePropertyPlantAndEquipment"),
+        ("us-gaap", "PaymentsToAcquireProductiveAssets"),
+    ),
+    "diluted_shares": (
+        ("us-gaap", "WeightedAverageNumberOfDilutedSharesOutstanding"),
+    ),
+    "shares_outstanding": (
+        ("dei", "EntityCommonStockSharesOutstanding"),
+    ),
+}
+
+# Only facts from annual reports are kept
+ANNUAL_FORMS = ("10-K", "20-F", "40-F")
+
+# A fiscal year reported for 52/53 weeks, or slightly off calendar year-end
+FISCAL_YEAR_DAYS = (350, 380)
+
+# Share-count change is the compound annual rate over at most this many years
+SHARE_CHANGE_YEARS = 5
+
+HISTORY_YEARS = 5
+
+# Money and share counts are returned in millions, the unit the DCF form suggests
+SCALE = 1_000_000
+
+
+def _extract_concepts(stream):
+    """Stream-parse a companyfacts document, building only the wanted concepts.
+
+    Returns (entity_name, {"taxonomy/Concept": {unit: [annual-report facts]}}).
+    """
+    targets = {
+        f"facts.{taxonomy}.{concept}.units": f"{taxonomy}/{concept}"
+        for options in CONCEPTS.values()
+        for taxonomy, concept in options
+    }
+    entity_name = None
+    found = {}
+    active = None
+    builder = None
+
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if active is not None:
+            builder.event(event, value)
+            if prefix == active and event == "end_map":
+                found[targets[active]] = {
+                    unit: [
+                        {key: fact.get(key) for key in ("start", "end", "val", "fp", "form", "filed")}
+                        for fact in facts
+                        if str(fact.get("form", "")).startswith(ANNUAL_FORMS)
+                    ]
+                    for unit, facts in builder.value.items()
+                }
+                active = None
+        elif event == "start_map" and prefix in targets:
+            active = prefix
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+        elif prefix == "entityName" and event == "string":
+            entity_name = value
+
+    return entity_name, found
+
+
+def _cache_path(cache_dir, cik):
+    return os.path.join(cache_dir, f"CIK{cik:010d}.json")
+
+
+def _read_cache(path):
+    try:
+        with open(path, encoding="utf-8") as handle:
+            cached = json.load(handle)
+        if isinstance(cached.get("facts"), dict) and "checked_at" in cached:
+            return cached
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+
+def _write_cache(path, cached):
+    # Write-then-rename so a concurrent reader never sees half a file.
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(cached, handle)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not cache SEC company facts to %s: %s", path, e)
+
+
+def get_company_facts(cik, user_agent, cache_dir):
+    """The DCF-relevant company facts for a CIK, from the disk cache when fresh.
+
+    Returns {"cik", "entity_name", "facts", "etag", "last_modified", "checked_at"}.
+    If SEC can't be reached, an expired cache entry is returned rather than failing.
+    Raises SecClientError when there is neither a response nor a cached copy.
+    """
+    cik = int(cik)
+    path = _cache_path(cache_dir, cik)
+    cached = _read_cache(path)
+    if cached and time.time() - cached["checked_at"] < CACHE_MAX_AGE:
+        return cached
+
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    try:
+        response = _sec_get(COMPANY_FACTS_URL.format(cik=cik), user_agent, headers=headers, stream=True)
+    except SecClientError as e:
+        if cached:
+            logger.warning("Using cached company facts for CIK %s: %s", cik, e)
+            return cached
+        raise
+
+    try:
+        if response.status_code == 304:
+            cached["checked_at"] = time.time()
+        else:
+            # Stream the (decompressed) body straight into the parser
+            response.raw.decode_content = True
+            try:
+                entity_name, facts = _extract_concepts(response.raw)
+            except ijson.JSONError as e:
+                raise SecClientError(f"Could not parse SEC company facts: {e}")
+            cached = {
+                "cik": cik,
+                "entity_name": entity_name,
+                "facts": facts,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "checked_at": time.time(),
+            }
+    finally:
+        response.close()
+
+    _write_cache(path, cached)
+    return cached
+
+
+def _is_fiscal_year(fact):
+    """True for a full-year duration fact, or an instant fact from an annual report."""
+    if fact.get("fp") != "FY" or fact.get("val") is None or not fact.get("end"):
+        return False
+    if not fact.get("start"):
+        return True
+    days = (date.fromisoformat(fact["end"]) - date.fromisoformat(fact["start"])).days
+    return FISCAL_YEAR_DAYS[0] <= days <= FISCAL_YEAR_DAYS[1]
+
+
+def _annual_series(facts, name, preferred_unit):
+    """{period end: value} for one input, merging its concepts in preference order.
+
+    Within a concept, the latest filing for a period wins, so restated figures
+    replace the originally reported ones.
+    """
+    series = {}
+    unit = None
+    for taxonomy, concept in CONCEPTS[name]:
+        units = facts.get(f"{taxonomy}/{concept}") or {}
+        if not units:
+            continue
+        concept_unit = preferred_unit if preferred_unit in units else next(iter(units))
+        if unit is not None and concept_unit != unit:
+            continue
+        unit = concept_unit
+
+        latest = {}
+        for fact in units[concept_unit]:
+            if _is_fiscal_year(fact):
+                previous = latest.get(fact["end"])
+                if previous is None or (fact.get("filed") or "") >= (previous.get("filed") or ""):
+                    latest[fact["end"]] = fact
+        for end, fact in latest.items():
+            series.setdefault(end, fact["val"])
+    return unit, series
+
+
+def _annual_change_rate(series, years=SHARE_CHANGE_YEARS):
+    """Compound annual change, in percent, over the last `years` fiscal years."""
+    ends = sorted(series)[-(years + 1):]
+    if len(ends) < 2 or series[ends[0]] <= 0 or series[ends[-1]] <= 0:
+        return None
+    span = (date.fromisoformat(ends[-1]) - date.fromisoformat(ends[0])).days / 365.25
+    return ((series[ends[-1]] / series[ends[0]]) ** (1 / span) - 1) * 100
+
+
+def _scaled(value):
+    return None if value is None else round(value / SCALE, 2)
+
+
+def dcf_prefill(company_facts):
+    """DCF form values from get_company_facts() output.
+
+    Returns {"entity_name", "currency", "fiscal_year_end", "free_cash_flow",
+    "shares_outstanding", "share_dilution", "history"}. Free cash flow is operating
+    cash flow minus capital expenditure for the latest fiscal year that reports
+    both; shares are that year's diluted weighted average (falling back to the
+    cover-page share count); share dilution is the compound annual change in
+    diluted shares. Money and shares are in millions; any value the filings don't
+    support is None.
+    """
+    facts = company_facts["facts"]
+    currency, operating = _annual_series(facts, "operating_cash_flow", "USD")
+    _, capex = _annual_series(facts, "capex", currency or "USD")
+    _, diluted = _annual_series(facts, "diluted_shares", "shares")
+    _, outstanding = _annual_series(facts, "shares_outstanding", "shares")
+
+    years = sorted(set(operating) & set(capex))
+    fiscal_year_end = years[-1] if years else None
+    free_cash_flow = operating[fiscal_year_end] - capex[fiscal_year_end] if fiscal_year_end else None
+
+    if diluted:
+        shares = diluted[max(diluted)]
+    elif outstanding:
+        shares = outstanding[max(outstanding)]
+    else:
+        shares = None
+
+    share_change = _annual_change_rate(diluted)
+
+    history = [
+        {
+            "fiscal_year_end": end,
+            "operating_cash_flow": _scaled(operating[end]),
+            "capex": _scaled(capex[end]),
+            "free_cash_flow": _scaled(operating[end] - capex[end]),
+            "diluted_shares": _scaled(diluted.get(end)),
+        }
+        for end in years[-HISTORY_YEARS:]
+    ]
+
+    return {
+        "entity_name": company_facts.get("entity_name"),
+        "currency": currency,
+        "fiscal_year_end": fiscal_year_end,
+        "free_cash_flow": _scaled(free_cash_flow),
+        "shares_outstanding": _scaled(shares),
+        "share_dilution": None if share_change is None else round(share_change, 2),
+        "history": history,
+    }
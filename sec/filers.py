@@ -15,6 +15,8 @@ hand-maintained list.
 import csv
 import os
 
+from sec.tickers import normalize_name
+
 FILERS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "filers.csv")
 
 MAX_RESULTS = 25
@@ -74,6 +76,21 @@ def search(query, limit=MAX_RESULTS):
     return [{"cik": cik, "name": name} for _, _, cik, name in matches[:limit]]
 
 
+def find_by_name(name):
+    """{"cik", "name"} for the filer with exactly this name, or None.
+
+    Names are compared after tickers.normalize_name(), so punctuation, case and
+    legal-form words like "Inc" or "LLC" don't matter.
+    """
+    key = normalize_name(name)
+    if not key:
+        return None
+    for cik, filer_name, _ in _load():
+        if normalize_name(filer_name) == key:
+            return {"cik": cik, "name": filer_name}
+    return None
+
+
 def count():
     """How many filers are in the index."""
     return len(_load())
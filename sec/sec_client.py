@@ -58,8 +58,13 @@ def _throttle():
     _last_sec_request_at = time.time()
 
 
-def _sec_get(url, user_agent):
-    """GET a SEC URL with the required User-Agent. Returns the raw response."""
+def _sec_get(url, user_agent, headers=None, stream=False):
+    """GET a SEC URL with the required User-Agent. Returns the raw response.
+
+    Extra `headers` (e.g. If-None-Match) are sent as given; a 304 Not Modified
+    reply to such a conditional request is returned rather than raised. With
+    stream=True the body is left unread for the caller to consume incrementally.
+    """
     if not user_agent:
         raise SecClientError(
             "SEC_USER_AGENT is not set. SEC requires a User-Agent identifying you "
@@ -70,8 +75,9 @@ def _sec_get(url, user_agent):
     try:
         response = requests.get(
             url,
-            headers={"User-Agent": user_agent, "Accept-Encoding": "gzip, deflate"},
+            headers={"User-Agent": user_agent, "Accept-Encoding": "gzip, deflate", **(headers or {})},
             timeout=REQUEST_TIMEOUT,
+            stream=stream,
         )
     except requests.Timeout:
         raise SecClientError(f"SEC request timed out after {REQUEST_TIMEOUT}s.")
@@ -83,6 +89,8 @@ def _sec_get(url, user_agent):
             "SEC rejected the request (403). This usually means SEC_USER_AGENT is "
             "missing or too generic -- it should contain a real name and email."
         )
+    if response.status_code == 304:
+        return response
     if response.status_code == 404:
         raise SecClientError("SEC returned 404 -- check the CIK is correct.")
     if response.status_code != 200:
@@ -0,0 +1,102 @@
+"""Local registry of US-listed tickers: validation, ticker -> CIK and ticker -> name.
+
+Backed by tickers.csv, a bundled index of ~10,000 tickers generated by
+build_ticker_index.py from SEC's company_tickers.json. It is loaded into a dict on
+first use, so checking whether a ticker exists is a hash lookup rather than a
+round trip to Yahoo Finance.
+
+The registry only covers companies that file with SEC. Foreign listings such as
+ASML.AS or 7203.T are not in it, so callers fall back to a network lookup for
+anything the registry doesn't know.
+
+find_by_name() matches a company name against the registry's names instead, for
+a ticker missing from a stale index (a new share class, a renamed ticker) whose
+company is still in it under another symbol.
+"""
+
+import csv
+import os
+import re
+
+TICKERS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tickers.csv")
+
+# Legal-form words dropped before comparing names, so Yahoo's "Apple Inc" matches
+# SEC's "Apple Inc." and "MICROSOFT CORP" matches "Microsoft Corporation".
+NAME_SUFFIXES = {
+    "the", "inc", "incorporated", "corp", "corporation", "co", "company",
+    "ltd", "limited", "plc", "llc", "lp", "sa", "nv", "ag",
+}
+
+_tickers = None
+_names = None
+
+
+def _load():
+    """Read the index on first use. Returns {ticker: (cik, name)}."""
+    global _tickers
+    if _tickers is None:
+        tickers = {}
+        try:
+            with open(TICKERS_PATH, encoding="utf-8", newline="") as handle:
+                for row in csv.DictReader(handle):
+                    tickers[row["ticker"]] = (row["cik"], row["name"])
+        except OSError:
+            # Without the index every ticker takes the network fallback, which is
+            # slower but still correct.
+            tickers = {}
+        _tickers = tickers
+    return _tickers
+
+
+def lookup(ticker):
+    """{"ticker", "cik", "name"} for a registered ticker, or None."""
+    ticker = (ticker or "").upper().strip()
+    entry = _load().get(ticker)
+    if entry is None:
+        return None
+    cik, name = entry
+    return {"ticker": ticker, "cik": cik, "name": name}
+
+
+def is_registered(ticker):
+    """True if the ticker is in the registry."""
+    return (ticker or "").upper().strip() in _load()
+
+
+def get_cik(ticker):
+    """CIK for a registered ticker, or None."""
+    entry = lookup(ticker)
+    return entry["cik"] if entry else None
+
+
+def get_name(ticker):
+    """Company name for a registered ticker, or None."""
+    entry = lookup(ticker)
+    return entry["name"] if entry else None
+
+
+def normalize_name(name):
+    """Lower-cased name without punctuation or legal-form words, for matching."""
+    words = re.sub(r"[^a-z0-9]+", " ", (name or "").lower()).split()
+    return " ".join(word for word in words if word not in NAME_SUFFIXES)
+
+
+def find_by_name(name):
+    """{"ticker", "cik", "name"} for the registered company with this name, or None.
+
+    Names are compared after normalize_name(). When one company lists several
+    tickers, the first in alphabetical order is returned.
+    """
+    global _names
+    if _names is None:
+        names = {}
+        for ticker, (cik, company) in sorted(_load().items()):
+            names.setdefault(normalize_name(company), ticker)
+        _names = names
+    key = normalize_name(name)
+    return lookup(_names[key]) if key and key in _names else None
+
+
+def count():
+    """How many tickers are in the registry."""
+    return len(_load())
@@ -67,6 +67,59 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // Pre-fill FCF, shares and share change from the company's SEC filings
+    const prefillBtn = document.getElementById('prefillBtn');
+    if (prefillBtn) {
+        prefillBtn.addEventListener('click', async function() {
+            const ticker = document.getElementById('ticker').value.toUpperCase().trim();
+            const prefillInfo = document.getElementById('prefillInfo');
+
+            if (!ticker) {
+                prefillInfo.innerHTML = '<div class="alert alert-warning">Please enter a ticker symbol</div>';
+                return;
+            }
+
+            prefillInfo.innerHTML = '<div class="loading"><i class="fas fa-spinner fa-spin"></i> Reading SEC filings...</div>';
+
+            try {
+                const response = await fetch(`/api/dcf/prefill/${encodeURIComponent(ticker)}`);
+                const data = await response.json();
+
+                if (data.error) {
+                    prefillInfo.innerHTML = `<div class="alert alert-danger">${data.error}</div>`;
+                    return;
+                }
+
+                const filled = [];
+                if (data.free_cash_flow !== null) {
+                    document.getElementById('free_cash_flow').value = data.free_cash_flow;
+                    filled.push('free cash flow');
+                }
+                if (data.shares_outstanding !== null) {
+                    document.getElementById('shares_outstanding').value = data.shares_outstanding;
+                    filled.push('shares');
+                }
+                if (data.share_dilution !== null) {
+                    document.getElementById('share_dilution').value = data.share_dilution;
+                    filled.push('share change');
+                }
+                const currencySelect = document.getElementById('currency');
+                if (data.currency_symbol && [...currencySelect.options].some(o => o.value === data.currency_symbol)) {
+                    currencySelect.value = data.currency_symbol;
+                }
+
+                prefillInfo.innerHTML = `
+                    <div class="alert alert-success">
+                        <i class="fas fa-check-circle"></i> Filled ${filled.join(', ')} for ${data.name}
+                        from the fiscal year ending ${data.fiscal_year_end || 'n/a'} (in millions of ${data.currency || 'shares'}).
+                    </div>
+                `;
+            } catch (error) {
+                prefillInfo.innerHTML = '<div class="alert alert-danger">Error reading SEC filings</div>';
+            }
+        });
+    }
+    
     // Reset form
     if (resetBtn) {
         resetBtn.addEventListener('click', function() {
@@ -113,3 +166,294 @@ function loadAnalysis(index) {
         </div>
     `;
 }
+
+// Sensitivity grid: values centred on the current inputs, one API call per grid
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('sensitivityForm');
+    if (!form) return;
+
+    const inputs = JSON.parse(form.dataset.inputs);
+    const currentPrice = parseFloat(form.dataset.currentPrice);
+    const currency = form.dataset.currency;
+    const resultEl = document.getElementById('sensitivityResult');
+
+    function centredAxis(field, step, points) {
+        const half = Math.floor(points / 2);
+        const centre = parseFloat(inputs[field]);
+        return {
+            field: field,
+            start: centre - half * step,
+            stop: centre + half * step,
+            steps: points
+        };
+    }
+
+    function axisLabel(selectId) {
+        const select = document.getElementById(selectId);
+        return select.options[select.selectedIndex].text.replace(' (%)', '');
+    }
+
+    function formatRate(value) {
+        return `${Math.round(value * 100) / 100}%`;
+    }
+
+    function renderGrid(data) {
+        let html = '<table class="analyses-table sensitivity-table"><thead><tr>';
+        html += `<th>${axisLabel('sensitivity_y')} ↓ / ${axisLabel('sensitivity_x')} →</th>`;
+        data.x.values.forEach(x => { html += `<th>${formatRate(x)}</th>`; });
+        html += '</tr></thead><tbody>';
+
+        data.values.forEach((row, i) => {
+            html += `<tr><th>${formatRate(data.y.values[i])}</th>`;
+            row.forEach(value => {
+                if (value === null) {
+                    html += '<td class="sensitivity-masked" title="Discount rate must exceed terminal growth">–</td>';
+                    return;
+                }
+                let cls = '';
+                if (!isNaN(currentPrice)) {
+                    cls = value >= currentPrice ? 'sensitivity-above' : 'sensitivity-below';
+                }
+                html += `<td class="${cls}">${currency}${value.toFixed(2)}</td>`;
+            });
+            html += '</tr>';
+        });
+        html += '</tbody></table>';
+        html += `<p class="sensitivity-note">Computed in ${data.elapsed_ms} ms.</p>`;
+        resultEl.innerHTML = html;
+    }
+
+    form.addEventListener('submit', async function(event) {
+        event.preventDefault();
+        const xField = document.getElementById('sensitivity_x').value;
+        const yField = document.getElementById('sensitivity_y').value;
+        if (xField === yField) {
+            resultEl.innerHTML = '<div class="alert alert-warning">Pick two different inputs for rows and columns.</div>';
+            return;
+        }
+        const points = parseInt(document.getElementById('sensitivity_points').value, 10);
+        const payload = {
+            inputs: inputs,
+            x: centredAxis(xField, parseFloat(document.getElementById('sensitivity_x_step').value), points),
+            y: centredAxis(yField, parseFloat(document.getElementById('sensitivity_y_step').value), points)
+        };
+
+        resultEl.innerHTML = '<div class="loading"><i class="fas fa-spinner fa-spin"></i> Building grid...</div>';
+        try {
+            const response = await fetch('/api/dcf/sensitivity', {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify(payload)
+            });
+            const data = await response.json();
+            if (data.error) {
+                resultEl.innerHTML = `<div class="alert alert-danger">${data.error}</div>`;
+            } else {
+                renderGrid(data);
+            }
+        } catch (error) {
+            resultEl.innerHTML = '<div class="alert alert-danger">Error building sensitivity grid</div>';
+        }
+    });
+});
+
+// Monte Carlo simulation: each input gets a distribution centred on its current value
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('simulationForm');
+    const sensitivityForm = document.getElementById('sensitivityForm');
+    if (!form || !sensitivityForm) return;
+
+    const inputs = JSON.parse(sensitivityForm.dataset.inputs);
+    const currentPrice = parseFloat(sensitivityForm.dataset.currentPrice);
+    const currency = sensitivityForm.dataset.currency;
+    const resultEl = document.getElementById('simulationResult');
+
+    function distributionFor(select) {
+        const field = select.dataset.field;
+        const centre = parseFloat(inputs[field]);
+        const spread = parseFloat(document.getElementById(`${select.id}_spread`).value) || 0;
+        switch (select.value) {
+            case 'normal':
+                return {dist: 'normal', mean: centre, std: spread};
+            case 'uniform':
+                return {dist: 'uniform', low: centre - spread, high: centre + spread};
+            case 'triangular':
+                return {dist: 'triangular', low: centre - spread, mode: centre, high: centre + spread};
+            default:
+                return null;
+        }
+    }
+
+    function renderSimulation(data) {
+        if (!data.percentiles) {
+            resultEl.innerHTML = '<div class="alert alert-warning">No valid scenarios -- every draw had a discount rate at or below terminal growth.</div>';
+            return;
+        }
+
+        let html = '<div class="summary-grid mc-summary">';
+        Object.entries(data.percentiles).forEach(([label, value]) => {
+            html += `<div class="summary-item"><span class="label">${label.toUpperCase()}:</span>` +
+                    `<span class="value">${currency}${value.toFixed(2)}</span></div>`;
+        });
+        if (data.probability_above_price !== null) {
+            html += `<div class="summary-item"><span class="label">P(value &gt; price):</span>` +
+                    `<span class="value">${(data.probability_above_price * 100).toFixed(1)}%</span></div>`;
+        }
+        html += '</div>';
+
+        const maxCount = Math.max(...data.histogram.counts);
+        html += '<div class="mc-histogram">';
+        data.histogram.counts.forEach((count, i) => {
+            const low = data.histogram.edges[i];
+            const high = data.histogram.edges[i + 1];
+            const aboveCls = !isNaN(currentPrice) && low >= currentPrice ? ' mc-bar-above' : '';
+            html += `<div class="mc-bar${aboveCls}" style="height: ${(count / maxCount * 100).toFixed(1)}%;" ` +
+                    `title="${currency}${low.toFixed(2)} – ${currency}${high.toFixed(2)}: ${count.toLocaleString()} draws"></div>`;
+        });
+        html += '</div>';
+        html += `<p class="sensitivity-note">${data.valid_draws.toLocaleString()} valid draws` +
+                (data.invalid_draws ? ` (${data.invalid_draws.toLocaleString()} dropped: discount rate ≤ terminal growth)` : '') +
+                ` in ${data.elapsed_ms} ms.</p>`;
+        resultEl.innerHTML = html;
+    }
+
+    form.addEventListener('submit', async function(event) {
+        event.preventDefault();
+        const distributions = {};
+        form.querySelectorAll('select[data-field]').forEach(select => {
+            const spec = distributionFor(select);
+            if (spec) distributions[select.dataset.field] = spec;
+        });
+
+        resultEl.innerHTML = '<div class="loading"><i class="fas fa-spinner fa-spin"></i> Simulating...</div>';
+        try {
+            const response = await fetch('/api/dcf/simulate', {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({
+                    inputs: inputs,
+                    distributions: distributions,
+                    draws: parseInt(document.getElementById('mc_draws').value, 10),
+                    current_price: isNaN(currentPrice) ? null : currentPrice
+                })
+            });
+            const data = await response.json();
+            if (data.error) {
+                resultEl.innerHTML = `<div class="alert alert-danger">${data.error}</div>`;
+            } else {
+                renderSimulation(data);
+            }
+        } catch (error) {
+            resultEl.innerHTML = '<div class="alert alert-danger">Error running simulation</div>';
+        }
+    });
+});
+
+// Valuation history: intrinsic value of every saved analysis against the price at save time
+document.addEventListener('DOMContentLoaded', function() {
+    const container = document.getElementById('valuationHistory');
+    if (!container) return;
+
+    const ticker = container.dataset.ticker;
+    const currency = container.dataset.currency;
+    const chartEl = document.getElementById('historyChart');
+    const monthly = document.getElementById('historyMonthly');
+    const width = 640, height = 220, pad = 40;
+
+    function polyline(points, key, x, y, cls) {
+        const coords = points
+            .filter(p => p[key] !== null)
+            .map(p => `${x(p).toFixed(1)},${y(p[key]).toFixed(1)}`);
+        return coords.length ? `<polyline class="${cls}" points="${coords.join(' ')}" />` : '';
+    }
+
+    function renderChart(data) {
+        const points = data.points;
+        if (!points.length) {
+            chartEl.innerHTML = '<p class="sensitivity-note">No saved analyses for this ticker yet.</p>';
+            return;
+        }
+
+        const times = points.map(p => Date.parse(p.date));
+        const values = points.flatMap(p => [p.intrinsic_value, p.market_price]).filter(v => v !== null);
+        const tMin = Math.min(...times), tMax = Math.max(...times);
+        const vMin = Math.min(...values), vMax = Math.max(...values);
+        const x = p => pad + (tMax > tMin ? (Date.parse(p.date) - tMin) / (tMax - tMin) : 0.5) * (width - 2 * pad);
+        const y = v => height - pad + (vMax > vMin ? -(v - vMin) / (vMax - vMin) : -0.5) * (height - 2 * pad);
+
+        let svg = `<svg class="history-chart" viewBox="0 0 ${width} ${height}" preserveAspectRatio="none">`;
+        svg += `<line class="history-axis" x1="${pad}" y1="${height - pad}" x2="${width - pad}" y2="${height - pad}" />`;
+        svg += `<text x="4" y="${pad}">${currency}${vMax.toFixed(2)}</text>`;
+        svg += `<text x="4" y="${height - pad}">${currency}${vMin.toFixed(2)}</text>`;
+        svg += `<text x="${pad}" y="${height - 12}">${points[0].date}</text>`;
+        svg += `<text x="${width - pad}" y="${height - 12}" text-anchor="end">${points[points.length - 1].date}</text>`;
+        svg += polyline(points, 'market_price', x, y, 'history-price');
+        svg += polyline(points, 'intrinsic_value', x, y, 'history-value');
+        points.forEach(p => {
+            svg += `<circle class="history-point" cx="${x(p).toFixed(1)}" cy="${y(p.intrinsic_value).toFixed(1)}" r="3">` +
+                   `<title>${p.date}: ${currency}${p.intrinsic_value.toFixed(2)}` +
+                   (p.market_price !== null ? ` (price ${p.market_price.toFixed(2)})` : '') + '</title></circle>';
+        });
+        svg += '</svg>';
+
+        chartEl.innerHTML = svg +
+            '<p class="sensitivity-note"><span class="history-legend-value">■</span> Intrinsic value ' +
+            '<span class="history-legend-price">■</span> Price at save time · ' +
+            `${points.length} point${points.length === 1 ? '' : 's'}, queried in ${data.elapsed_ms} ms.</p>`;
+    }
+
+    async function loadHistory() {
+        chartEl.innerHTML = '<div class="loading"><i class="fas fa-spinner fa-spin"></i> Loading history...</div>';
+        const query = monthly.checked ? '?downsample=monthly' : '';
+        try {
+            const response = await fetch(`/api/dcf/history/${encodeURIComponent(ticker)}${query}`);
+            const data = await response.json();
+            if (data.error) {
+                chartEl.innerHTML = `<div class="alert alert-danger">${data.error}</div>`;
+            } else {
+                renderChart(data);
+            }
+        } catch (error) {
+            chartEl.innerHTML = '<div class="alert alert-danger">Error loading valuation history</div>';
+        }
+    }
+
+    monthly.addEventListener('change', loadHistory);
+    loadHistory();
+});
+
+// Saved analyses table: fetched a page at a time, newest first
+document.addEventListener('DOMContentLoaded', function() {
+    const section = document.getElementById('savedAnalyses');
+    if (!section) return;
+
+    const body = document.getElementById('savedAnalysesBody');
+    const loadMore = document.getElementById('loadMoreAnalyses');
+    let nextCursor = null;
+
+    async function loadPage() {
+        loadMore.disabled = true;
+        const query = nextCursor ? `?cursor=${encodeURIComponent(nextCursor)}` : '';
+        try {
+            const response = await fetch(section.dataset.url + query);
+            const data = await response.json();
+            if (data.error) throw new Error(data.error);
+
+            body.insertAdjacentHTML('beforeend', data.html);
+            nextCursor = data.next_cursor;
+            section.hidden = !body.children.length;
+            document.getElementById('savedAnalysesEmpty').hidden = body.children.length > 0;
+            loadMore.hidden = !nextCursor;
+        } catch (error) {
+            section.hidden = false;
+            loadMore.hidden = true;
+            body.insertAdjacentHTML('beforeend',
+                '<tr><td colspan="11"><div class="alert alert-danger">Error loading saved analyses</div></td></tr>');
+        } finally {
+            loadMore.disabled = false;
+        }
+    }
+
+    loadMore.addEventListener('click', loadPage);
+    loadPage();
+});
@@ -0,0 +1,54 @@
+// Wishlist Page JavaScript
+
+// The table is rendered without prices. Stored prices are loaded from
+// /api/wishlist/prices straight away, then /api/wishlist/prices/stream pushes a
+// fresh quote for each out-of-date ticker as soon as it resolves.
+document.addEventListener('DOMContentLoaded', function() {
+    const rows = document.querySelectorAll('.wishlist-table tr[data-ticker]');
+    if (!rows.length) return;
+
+    const rowsByTicker = {};
+    rows.forEach(row => { rowsByTicker[row.dataset.ticker] = row; });
+
+    const notAvailable = '<span style="opacity: 0.6;">Not Available</span>';
+
+    function updateRow(entry) {
+        const row = rowsByTicker[entry.ticker];
+        if (!row) return;
+
+        const eurCell = row.querySelector('[data-field="target_price_eur"]');
+        eurCell.innerHTML = entry.target_price_eur
+            ? `€${entry.target_price_eur.toFixed(2)}`
+            : notAvailable;
+
+        const priceCell = row.querySelector('[data-field="current_price"]');
+        if (entry.current_price) {
+            priceCell.textContent = `${entry.currency}${entry.current_price.toFixed(2)}`;
+            if (entry.fetched_at) priceCell.title = `As of ${entry.fetched_at} UTC`;
+        } else {
+            priceCell.innerHTML = notAvailable;
+        }
+    }
+
+    function streamUpdates() {
+        if (!window.EventSource) return;
+        const source = new EventSource('/api/wishlist/prices/stream');
+        source.addEventListener('price', event => updateRow(JSON.parse(event.data)));
+        // Close explicitly: EventSource otherwise reconnects when the stream ends.
+        source.addEventListener('done', () => source.close());
+        source.onerror = () => source.close();
+    }
+
+    fetch('/api/wishlist/prices')
+        .then(response => response.json())
+        .then(data => {
+            data.items.forEach(updateRow);
+            document.getElementById('fxStale').hidden = !data.fx_stale;
+        })
+        .catch(() => {
+            rows.forEach(row => {
+                row.querySelectorAll('[data-field]').forEach(cell => { cell.innerHTML = notAvailable; });
+            });
+        })
+        .finally(streamUpdates);
+});
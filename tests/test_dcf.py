@@ -0,0 +1,94 @@
+"""The closed-form DCF, its batch version and the MCP server's copies must agree
+with the original year-by-year loop, and fail the same way on invalid inputs."""
+
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from dcf.benchmark_dcf import REL_TOL, check_equivalence, load_mcp_copy
+from dcf.dcf_batch import dcf_valuation_batch
+from dcf.dcf_default import dcf_valuation_advanced, dcf_valuation_iterative
+
+MCP = load_mcp_copy()
+
+SCALAR_FUNCTIONS = {
+    "closed form": dcf_valuation_advanced,
+    "mcp copy": MCP.dcf_valuation_advanced,
+}
+BATCH_FUNCTIONS = {
+    "batch": dcf_valuation_batch,
+    "mcp batch copy": MCP.dcf_valuation_batch,
+}
+
+# (fcf, growth 1-5, growth 6-10, discount, terminal, shares, share change)
+GRID = list(itertools.product(
+    [-500.0, 0.0, 1_000.0],
+    [-20.0, 0.0, 15.0],
+    [0.0, 8.0],
+    [8.0, 12.0],
+    [0.0, 2.5],
+    [1.0, 500.0],
+    [-3.0, 0.0, 2.0],
+))
+
+EDGE_CASES = {
+    # (1 + g) / ((1 + dilution) * (1 + r)) == 1 in both stages
+    "q == 1": (1_000.0, 10.0, 10.0, 10.0, 2.0, 100.0, 0.0),
+    "q == 1 with dilution": (1_000.0, 32.0, 32.0, 10.0, 2.0, 100.0, 20.0),
+    "discount a hair above terminal": (1_000.0, 12.0, 6.0, 3.000001, 3.0, 100.0, 0.0),
+    "buybacks": (1_000.0, 12.0, 6.0, 9.0, 2.5, 100.0, -5.0),
+    "zero growth": (1_000.0, 0.0, 0.0, 9.0, 0.0, 100.0, 0.0),
+    "negative terminal growth": (1_000.0, 5.0, 2.0, 9.0, -1.0, 100.0, 1.0),
+}
+
+ERROR_CASES = {
+    "discount equal to terminal": ((1_000.0, 10.0, 5.0, 3.0, 3.0, 100.0, 0.0), ValueError),
+    "discount below terminal": ((1_000.0, 10.0, 5.0, 2.0, 3.0, 100.0, 0.0), ValueError),
+    "zero shares": ((1_000.0, 10.0, 5.0, 9.0, 2.5, 0.0, 0.0), ValueError),
+    "negative shares": ((1_000.0, 10.0, 5.0, 9.0, 2.5, -5.0, 0.0), ValueError),
+    "no shares left": ((1_000.0, 10.0, 5.0, 9.0, 2.5, 100.0, -100.0), ZeroDivisionError),
+}
+
+
+def assert_matches_loop(cases):
+    expected = [dcf_valuation_iterative(*args) for args in cases]
+    for name, function in SCALAR_FUNCTIONS.items():
+        for args, reference in zip(cases, expected):
+            assert math.isclose(function(*args), reference, rel_tol=REL_TOL, abs_tol=1e-9), (name, args)
+    for name, function in BATCH_FUNCTIONS.items():
+        values = function(*np.array(cases).T)
+        np.testing.assert_allclose(values, expected, rtol=REL_TOL, atol=1e-9, err_msg=name)
+
+
+def test_grid_matches_loop():
+    assert_matches_loop(GRID)
+
+
+@pytest.mark.parametrize("args", EDGE_CASES.values(), ids=EDGE_CASES.keys())
+def test_edge_case_matches_loop(args):
+    assert_matches_loop([args])
+
+
+@pytest.mark.parametrize("args, error", ERROR_CASES.values(), ids=ERROR_CASES.keys())
+def test_error_cases_fail_everywhere(args, error):
+    with pytest.raises(error):
+        dcf_valuation_iterative(*args)
+    for function in SCALAR_FUNCTIONS.values():
+        with pytest.raises(error):
+            function(*args)
+    for function in BATCH_FUNCTIONS.values():
+        assert np.isnan(function(*args))
+
+
+def test_batch_flags_only_invalid_rows():
+    valid = EDGE_CASES["buybacks"]
+    invalid = ERROR_CASES["zero shares"][0]
+    values = dcf_valuation_batch(*np.array([valid, invalid, valid]).T)
+    assert not np.isnan(values[0]) and np.isnan(values[1]) and values[0] == values[2]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_random_cases_match_loop(seed):
+    assert check_equivalence(2_000, seed)